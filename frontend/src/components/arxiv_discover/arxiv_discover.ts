@@ -25,7 +25,10 @@ import { customElement, state } from "lit/decorators.js";
 import { classMap } from "lit/directives/class-map.js";
 
 import { core } from "../../core/core";
-import { BackendApiService } from "../../services/backend_api.service";
+import {
+  ArxivSearchHighlights,
+  BackendApiService,
+} from "../../services/backend_api.service";
 import { getArxivPaperUrl } from "../../services/router.service";
 import { HistoryService } from "../../services/history.service";
 import { SettingsService } from "../../services/settings.service";
@@ -56,6 +59,10 @@ export class ArxivDiscover extends MobxLitElement {
   @state() private papers: ArxivMetadata[] = [];
   @state() private total = 0;
   @state() private page = 1;
+  // Keyset cursor for the next page of recent papers.
+  @state() private nextCursor: string | null = null;
+  // Search-result highlights by paperId.
+  @state() private highlights = new Map<string, ArxivSearchHighlights>();
 
   private loadingStatusMap = new ObservableMap<string, LoadingStatus>();
   @observable.shallow private pendingJobs = new ObservableMap<string, string>();
@@ -96,15 +103,29 @@ export class ArxivDiscover extends MobxLitElement {
               this.searchQuery,
               nextPage,
               this.pageSize,
-              categories
+              categories,
+              /* compact= */ true
             )
           : await this.backendApiService.listArxivRecent(
               nextPage,
               this.pageSize,
-              categories
+              categories,
+              reset ? null : this.nextCursor
             );
+      const highlights = reset
+        ? new Map<string, ArxivSearchHighlights>()
+        : new Map(this.highlights);
       const items = resp.papers
-        .map((paper) => paper.metadata)
+        .map((paper) => {
+          if (!paper.highlights) {
+            return paper.metadata;
+          }
+          highlights.set(paper.metadata.paperId, paper.highlights);
+          return {
+            ...paper.metadata,
+            summary: paper.metadata.summary ?? paper.highlights.snippet,
+          };
+        })
         .filter((paper) => {
           if (!categories || categories.length === 0) {
             return true;
@@ -113,8 +134,10 @@ export class ArxivDiscover extends MobxLitElement {
           return categories.some((cat) => paperCategories.includes(cat));
         });
       this.papers = reset ? items : [...this.papers, ...items];
+      this.highlights = highlights;
       this.total = resp.total;
       this.page = resp.page;
+      this.nextCursor = resp.next_cursor ?? null;
     } catch (error) {
       this.errorMessage = (error as Error).message;
     } finally {
@@ -183,6 +206,9 @@ export class ArxivDiscover extends MobxLitElement {
   }
 
   private get hasMore() {
+    if (this.mode === "recent" && !this.nextCursor) {
+      return false;
+    }
     return this.papers.length < this.total;
   }
 
@@ -291,6 +317,7 @@ export class ArxivDiscover extends MobxLitElement {
             <div class="result-card">
               <paper-card
                 .metadata=${paper}
+                .highlights=${this.highlights.get(paper.paperId) ?? null}
                 .image=${{
                   image_storage_path: this.getCoverImagePath(paper.categories),
                 }}
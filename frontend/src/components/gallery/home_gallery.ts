@@ -36,7 +36,11 @@ import {
   getLumiPaperUrl,
 } from "../../services/router.service";
 import { SnackbarService } from "../../services/snackbar.service";
-import { BackendApiService } from "../../services/backend_api.service";
+import {
+  ArxivSearchHighlights,
+  BackendApiService,
+  TextSpan,
+} from "../../services/backend_api.service";
 
 import {
   LumiDoc,
@@ -494,6 +498,19 @@ export class HomeGallery extends MobxLitElement {
   }
 }
 
+/** Wraps each span of `text` in <mark>. */
+function renderMarked(text: string, spans: TextSpan[]) {
+  const parts = [];
+  let position = 0;
+  for (const [start, end] of spans) {
+    parts.push(text.slice(position, start));
+    parts.push(html`<mark>${text.slice(start, end)}</mark>`);
+    position = end;
+  }
+  parts.push(text.slice(position));
+  return parts;
+}
+
 /** Paper preview card */
 @customElement("paper-card")
 export class PaperCard extends MobxLitElement {
@@ -501,6 +518,8 @@ export class PaperCard extends MobxLitElement {
 
   @property({ type: Object }) metadata: ArxivMetadata | null = null;
   @property({ type: Object }) image: { image_storage_path: string } | null = null;
+  // Search matches; the snippet replaces the summary when set.
+  @property({ type: Object }) highlights: ArxivSearchHighlights | null = null;
   @property({ type: Boolean }) disabled = false;
   @property({ type: Number }) summaryMaxCharacters = 250;
   @property({ type: String }) status = "";
@@ -530,10 +549,14 @@ export class PaperCard extends MobxLitElement {
     const classes = { "preview-item": true, disabled: this.disabled };
 
     // If summary is over max characters, abbreviate
-    const summary =
-      this.metadata.summary.length <= this.summaryMaxCharacters
-        ? this.metadata.summary
-        : `${this.metadata.summary.slice(0, this.summaryMaxCharacters)}...`;
+    const summary = this.highlights
+      ? renderMarked(this.highlights.snippet, this.highlights.snippet_matches)
+      : this.metadata.summary.length <= this.summaryMaxCharacters
+      ? this.metadata.summary
+      : `${this.metadata.summary.slice(0, this.summaryMaxCharacters)}...`;
+    const title = this.highlights
+      ? renderMarked(this.metadata.title, this.highlights.title)
+      : this.metadata.title;
 
     const authors = this.metadata.authors.join(", ");
     return html`
@@ -543,7 +566,7 @@ export class PaperCard extends MobxLitElement {
         </div>
         ${this.renderImage()}
         <div class="preview-content">
-          <div class="preview-title">${this.metadata.title}</div>
+          <div class="preview-title">${title}</div>
           <div class="preview-metadata">
             <div class="preview-authors" .title=${authors}>${authors}</div>
             <div class="preview-id">(${this.metadata.paperId})</div>
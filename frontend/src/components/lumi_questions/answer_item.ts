@@ -190,6 +190,11 @@ export class AnswerItem extends LightMobxLitElement {
   }
 
   private renderAnswer() {
+    if (this.isLoading && this.answer.streamingText) {
+      // Raw markdown until the final parsed answer replaces it.
+      return html`<div class="answer streaming" lang="en">${this.answer
+        .streamingText}</div>`;
+    }
     if (this.isLoading) {
       return html`
         <div class="spinner">
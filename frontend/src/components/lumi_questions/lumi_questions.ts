@@ -139,10 +139,15 @@ export class LumiQuestions extends LightMobxLitElement {
     const queryToClear = this.query;
 
     try {
-      const response = await this.backendApiService.getLumiResponse(
+      const response = await this.backendApiService.streamLumiResponse(
         lumiDoc.metadata.paperId,
         lumiDoc.metadata.version,
-        request
+        request,
+        (markdown) =>
+          this.historyService.updateTemporaryAnswerText(
+            tempAnswer.id,
+            markdown
+          )
       );
       this.historyService.addAnswer(docId, response);
       this.query = "";
@@ -59,6 +59,7 @@ import {
   SelectionInfo,
 } from "../../shared/selection_utils";
 import { createTemporaryAnswer } from "../../shared/answer_utils";
+import { collectImagePaths } from "../../shared/lumi_doc_utils";
 import { classMap } from "lit/directives/class-map.js";
 import {
   AnalyticsAction,
@@ -226,9 +227,11 @@ export class LumiReader extends LightMobxLitElement {
 
   private async tryLoadDoc(metadata: ArxivMetadata): Promise<boolean> {
     try {
+      // Fetch the index and the first batch of sections in one round trip.
       const resp = await this.backendApiService.getLumiDocIndex(
         this.documentId,
-        metadata.version
+        metadata.version,
+        this.sectionBatchSize
       );
       const lumiDoc = resp.doc as LumiDoc;
       lumiDoc.summaries = resp.summaries;
@@ -238,12 +241,18 @@ export class LumiReader extends LightMobxLitElement {
       }
       this.sectionOrder = outline.map((section) => section.id);
       lumiDoc.sections = [];
-      const initialSections = await this.fetchSections(
-        metadata.version,
-        this.sectionOrder.slice(0, this.sectionBatchSize)
-      );
+      const initialIds = this.sectionOrder.slice(0, this.sectionBatchSize);
+      const initialSections =
+        (resp.initial_sections as LumiSection[] | null | undefined) ??
+        (await this.fetchSections(metadata.version, initialIds));
       lumiDoc.sections = initialSections;
-      this.loadedSectionCount = initialSections.length;
+      // Started before rendering so figure lookups join this batch.
+      this.prefetchImageUrls([
+        lumiDoc.metadata,
+        lumiDoc.abstract,
+        initialSections,
+      ]);
+      this.loadedSectionCount = initialIds.length;
       this.isLoadingMoreSections = false;
       this.hasMoreSections =
         this.loadedSectionCount < this.sectionOrder.length;
@@ -279,6 +288,17 @@ export class LumiReader extends LightMobxLitElement {
     }
   }
 
+  /** Signs every figure under `value` in one batched request. */
+  private prefetchImageUrls(value: unknown) {
+    const paths = collectImagePaths(value);
+    if (!paths.length) {
+      return;
+    }
+    this.backendApiService.signUrls(paths, "get").catch((e) => {
+      console.error("Error signing image URLs:", e);
+    });
+  }
+
   private async fetchSections(
     version: string,
     sectionIds: string[]
@@ -286,16 +306,12 @@ export class LumiReader extends LightMobxLitElement {
     if (!sectionIds.length) {
       return [];
     }
-    const responses = await Promise.all(
-      sectionIds.map((sectionId) =>
-        this.backendApiService.getLumiDocSection(
-          this.documentId,
-          version,
-          sectionId
-        )
-      )
+    const resp = await this.backendApiService.getLumiDocSections(
+      this.documentId,
+      version,
+      sectionIds
     );
-    return responses.map((resp) => resp.section as LumiSection);
+    return resp.sections as LumiSection[];
   }
 
   private readonly loadMoreSections = async () => {
@@ -317,8 +333,10 @@ export class LumiReader extends LightMobxLitElement {
         this.metadata.version,
         nextIds
       );
+      this.prefetchImageUrls(sections);
       this.documentStateService.appendSections(sections);
-      this.loadedSectionCount += sections.length;
+      // Advance past ids the server reported missing as well.
+      this.loadedSectionCount += nextIds.length;
       this.hasMoreSections =
         this.loadedSectionCount < this.sectionOrder.length;
     } catch (e) {
@@ -450,10 +468,15 @@ export class LumiReader extends LightMobxLitElement {
       if (!doc?.metadata?.paperId || !doc.metadata.version) {
         throw new Error("Document metadata unavailable");
       }
-      const response = await this.backendApiService.getLumiResponse(
+      const response = await this.backendApiService.streamLumiResponse(
         doc.metadata.paperId,
         doc.metadata.version,
-        request
+        request,
+        (markdown) =>
+          this.historyService.updateTemporaryAnswerText(
+            tempAnswer.id,
+            markdown
+          )
       );
       this.historyService.addAnswer(this.documentId, response);
     } catch (e) {
@@ -490,10 +513,15 @@ export class LumiReader extends LightMobxLitElement {
     this.historyService.addTemporaryAnswer(tempAnswer);
 
     try {
-      const response = await this.backendApiService.getLumiResponse(
+      const response = await this.backendApiService.streamLumiResponse(
         currentDoc.metadata.paperId,
         currentDoc.metadata.version,
-        request
+        request,
+        (markdown) =>
+          this.historyService.updateTemporaryAnswerText(
+            tempAnswer.id,
+            markdown
+          )
       );
       this.historyService.addAnswer(this.documentId, response);
     } catch (e) {
@@ -40,6 +40,9 @@ export interface LumiDocResponse {
   version: string;
   doc: any;
   summaries: any;
+  signed_urls?: Record<string, string> | null;
+  signed_urls_expire_at?: number | null;
+  initial_sections?: any[] | null;
 }
 
 export interface LumiDocSectionResponse {
@@ -48,6 +51,13 @@ export interface LumiDocSectionResponse {
   section: any;
 }
 
+export interface LumiDocSectionsResponse {
+  arxiv_id: string;
+  version: string;
+  sections: any[];
+  missing: string[];
+}
+
 export interface LumiAnswerResponse {
   arxiv_id: string;
   version: string;
@@ -58,9 +68,19 @@ export interface ListPapersResponse {
   papers: { arxiv_id: string; version: string; metadata?: any }[];
 }
 
+/** [start, end) UTF-16 offsets of query matches, as `String.slice` takes. */
+export type TextSpan = [number, number];
+
+export interface ArxivSearchHighlights {
+  title: TextSpan[];
+  snippet: string;
+  snippet_matches: TextSpan[];
+}
+
 export interface ArxivSearchPaper {
   metadata: any;
   score?: number | null;
+  highlights?: ArxivSearchHighlights | null;
 }
 
 export interface ArxivSearchResponse {
@@ -68,10 +88,13 @@ export interface ArxivSearchResponse {
   total: number;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 type HttpMethod = "GET" | "POST";
 
+const SIGNED_URL_REFRESH_MARGIN_MS = 60 * 1000;
+
 export class BackendApiService extends Service {
   constructor() {
     super();
@@ -79,6 +102,8 @@ export class BackendApiService extends Service {
   }
 
   private readonly signUrlCache = new Map<string, { url: string; expiresAt: number }>();
+  // Paths being signed by an in-flight signUrls batch.
+  private readonly pendingSigns = new Map<string, Promise<string | undefined>>();
 
   override initialize(): void {
     this.setInitialized();
@@ -145,11 +170,26 @@ export class BackendApiService extends Service {
     return this.request(`/api/lumi-doc/${arxivId}/${version}`, "GET");
   }
 
+  /**
+   * Loads the doc index; with `includeSections` > 0 the first N sections
+   * come back in the same response as `initial_sections`.
+   */
   async getLumiDocIndex(
     arxivId: string,
-    version: string
+    version: string,
+    includeSections = 0
   ): Promise<LumiDocResponse> {
-    return this.request(`/api/lumi-doc-index/${arxivId}/${version}`, "GET");
+    // Unsigned so the response stays cacheable; figures are signed in
+    // batches through signUrls as their sections load.
+    const params = new URLSearchParams();
+    if (includeSections > 0) {
+      params.set("include_sections", String(includeSections));
+    }
+    const query = params.toString();
+    return this.request<LumiDocResponse>(
+      `/api/lumi-doc-index/${arxivId}/${version}${query ? `?${query}` : ""}`,
+      "GET"
+    );
   }
 
   async getLumiDocSection(
@@ -163,6 +203,18 @@ export class BackendApiService extends Service {
     );
   }
 
+  async getLumiDocSections(
+    arxivId: string,
+    version: string,
+    sectionIds: string[]
+  ): Promise<LumiDocSectionsResponse> {
+    const ids = encodeURIComponent(sectionIds.join(","));
+    return this.request(
+      `/api/lumi-doc-sections/${arxivId}/${version}?ids=${ids}`,
+      "GET"
+    );
+  }
+
   async getLumiResponse(
     arxivId: string,
     version: string,
@@ -180,6 +232,63 @@ export class BackendApiService extends Service {
     return response.answer;
   }
 
+  /**
+   * Streams an answer over server-sent events. `onText` receives the raw
+   * markdown accumulated so far; the promise resolves to the parsed answer.
+   */
+  async streamLumiResponse(
+    arxivId: string,
+    version: string,
+    request: LumiAnswerRequest,
+    onText: (markdown: string) => void
+  ): Promise<LumiAnswer> {
+    const resp = await fetch(this.url("/api/get_lumi_response_stream"), {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        Accept: "text/event-stream",
+      },
+      body: JSON.stringify({ arxiv_id: arxivId, version, ...request }),
+    });
+    if (!resp.ok || !resp.body) {
+      const text = await resp.text();
+      throw new Error(`HTTP ${resp.status}: ${text || resp.statusText}`);
+    }
+
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let markdown = "";
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary = buffer.indexOf("\n\n");
+      while (boundary !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf("\n\n");
+
+        let event = "message";
+        let data = "";
+        for (const line of block.split("\n")) {
+          if (line.startsWith("event: ")) event = line.slice(7);
+          else if (line.startsWith("data: ")) data += line.slice(6);
+        }
+        const payload = data ? JSON.parse(data) : {};
+        if (event === "chunk") {
+          markdown += payload.text ?? "";
+          onText(markdown);
+        } else if (event === "answer") {
+          return (payload as LumiAnswerResponse).answer;
+        } else if (event === "error") {
+          throw new Error(payload.detail || "Answer stream failed");
+        }
+      }
+    }
+    throw new Error("Answer stream ended without a final answer");
+  }
+
   async getPersonalSummary(
     arxivId: string,
     version: string,
@@ -199,7 +308,8 @@ export class BackendApiService extends Service {
   async listArxivRecent(
     page: number,
     pageSize: number,
-    categories?: string[]
+    categories?: string[],
+    cursor?: string | null
   ): Promise<ArxivSearchResponse> {
     const params = new URLSearchParams({
       page: String(page),
@@ -208,6 +318,9 @@ export class BackendApiService extends Service {
     if (categories && categories.length > 0) {
       params.set("categories", categories.join(","));
     }
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
     return this.request(`/api/arxiv-sanity/recent?${params.toString()}`, "GET");
   }
 
@@ -215,7 +328,8 @@ export class BackendApiService extends Service {
     query: string,
     page: number,
     pageSize: number,
-    categories?: string[]
+    categories?: string[],
+    compact = false
   ): Promise<ArxivSearchResponse> {
     const params = new URLSearchParams({
       query,
@@ -225,6 +339,10 @@ export class BackendApiService extends Service {
     if (categories && categories.length > 0) {
       params.set("categories", categories.join(","));
     }
+    if (compact) {
+      // Summaries are replaced by highlights.snippet.
+      params.set("compact", "true");
+    }
     return this.request(`/api/arxiv-sanity/search?${params.toString()}`, "GET");
   }
 
@@ -235,6 +353,67 @@ export class BackendApiService extends Service {
     });
   }
 
+  private signedUrlExpiry(expiresAtSeconds?: number | null) {
+    // The server may hand out reused URLs, so honor its expiry when given.
+    // Otherwise presigned URLs default to 1 hour. Refresh a bit early.
+    if (expiresAtSeconds) {
+      return expiresAtSeconds * 1000 - SIGNED_URL_REFRESH_MARGIN_MS;
+    }
+    return Date.now() + 55 * 60 * 1000;
+  }
+
+  private cacheSignedUrls(
+    urls: Record<string, string>,
+    op: "get" | "put",
+    expiresAtSeconds?: number | null
+  ) {
+    const expiresAt = this.signedUrlExpiry(expiresAtSeconds);
+    for (const [path, url] of Object.entries(urls)) {
+      this.signUrlCache.set(`${op}:${path}`, { url, expiresAt });
+    }
+  }
+
+  async signUrls(
+    paths: string[],
+    op: "get" | "put" = "get"
+  ): Promise<Record<string, string>> {
+    const now = Date.now();
+    const result: Record<string, string> = {};
+    const missing: string[] = [];
+    for (const path of paths) {
+      const cached = this.signUrlCache.get(`${op}:${path}`);
+      if (cached && cached.expiresAt > now) {
+        result[path] = cached.url;
+      } else {
+        missing.push(path);
+      }
+    }
+    if (missing.length) {
+      const request = this.request<{
+        urls: Record<string, string>;
+        expires_at: number;
+      }>("/api/sign-urls", "POST", { paths: missing, op }).then((data) => {
+        this.cacheSignedUrls(data.urls, op, data.expires_at);
+        return data.urls;
+      });
+      for (const path of missing) {
+        const key = `${op}:${path}`;
+        const pending = request.then(
+          (urls) => urls[path],
+          () => undefined
+        );
+        this.pendingSigns.set(key, pending);
+        pending.finally(() => {
+          if (this.pendingSigns.get(key) === pending) {
+            this.pendingSigns.delete(key);
+          }
+        });
+      }
+      Object.assign(result, await request);
+    }
+    return result;
+  }
+
   async signUrl(path: string, op: "get" | "put" = "get"): Promise<string> {
     const cacheKey = `${op}:${path}`;
     const cached = this.signUrlCache.get(cacheKey);
@@ -242,6 +421,11 @@ export class BackendApiService extends Service {
     if (cached && cached.expiresAt > now) {
       return cached.url;
     }
+    // Reuse a batch already signing this path; fall back if it failed.
+    const pendingUrl = await this.pendingSigns.get(cacheKey);
+    if (pendingUrl) {
+      return pendingUrl;
+    }
 
     const resp = await fetch(
       this.url(`/api/sign-url?path=${encodeURIComponent(path)}&op=${op}`),
@@ -253,11 +437,10 @@ export class BackendApiService extends Service {
       const text = await resp.text();
       throw new Error(`HTTP ${resp.status}: ${text || resp.statusText}`);
     }
-    const data = (await resp.json()) as { url: string };
-    // Presigned URLs default to 1 hour; refresh a bit early.
+    const data = (await resp.json()) as { url: string; expires_at?: number };
     this.signUrlCache.set(cacheKey, {
       url: data.url,
-      expiresAt: now + 55 * 60 * 1000,
+      expiresAt: this.signedUrlExpiry(data.expires_at),
     });
     return data.url;
   }
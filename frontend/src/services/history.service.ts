@@ -63,6 +63,7 @@ export class HistoryService extends Service {
       addAnswer: action,
       addTemporaryAnswer: action,
       removeTemporaryAnswer: action,
+      updateTemporaryAnswerText: action,
       clearTemporaryAnswers: action,
       addPaper: action,
       addPersonalSummary: action,
@@ -211,6 +212,24 @@ export class HistoryService extends Service {
     }
   }
 
+  /**
+   * Sets the partial markdown shown while a temporary answer streams in.
+   * @param answerId The ID of the temporary LumiAnswer object to update.
+   * @param streamingText The markdown received so far.
+   */
+  updateTemporaryAnswerText(answerId: string, streamingText: string) {
+    const answerIndex = this.temporaryAnswers.findIndex(
+      (answer) => answer.id === answerId
+    );
+    if (answerIndex > -1) {
+      // Replace the entry so the shallow observable array notifies renderers.
+      this.temporaryAnswers[answerIndex] = {
+        ...this.temporaryAnswers[answerIndex],
+        streamingText,
+      };
+    }
+  }
+
   /**
    * Retrieves the temporary answer history for a given document ID.
    * @param docId The ID of the document.
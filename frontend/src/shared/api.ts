@@ -38,6 +38,8 @@ export interface LumiAnswer {
   responseContent: LumiContent[];
   timestamp: number;
   isLoading?: boolean;
+  // Raw markdown received so far while an answer is streaming.
+  streamingText?: string;
 }
 
 // Kept in sync with: functions/shared/api.py
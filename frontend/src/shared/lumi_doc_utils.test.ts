@@ -17,6 +17,7 @@
 
 import { expect } from "@esm-bundle/chai";
 import {
+  collectImagePaths,
   getAllContents,
   getAllSpansFromContents,
   getReferencedSpanIdsFromContent,
@@ -370,3 +371,29 @@ describe("getAllSpansFromContents", () => {
     ]);
   });
 });
+
+describe("collectImagePaths", () => {
+  it("finds figure and featured image paths once, in order", () => {
+    const value = [
+      { featuredImage: { imageStoragePath: "p/v1/cover.png" } },
+      {
+        contents: [
+          { imageContent: { storagePath: "p/v1/fig1.png" } },
+          {
+            figureContent: {
+              images: [
+                { storagePath: "p/v1/fig2.png" },
+                { storagePath: "p/v1/fig1.png" },
+              ],
+            },
+          },
+        ],
+      },
+    ];
+    expect(collectImagePaths(value)).to.deep.equal([
+      "p/v1/cover.png",
+      "p/v1/fig1.png",
+      "p/v1/fig2.png",
+    ]);
+  });
+});
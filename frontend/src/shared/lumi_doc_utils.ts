@@ -141,3 +141,36 @@ export function getAllSpansFromContents(contents: LumiContent[]): LumiSpan[] {
 
   return allSpans;
 }
+
+/**
+ * Collects every image storage path (`storagePath` or `imageStoragePath`)
+ * under `value`, in document order and without duplicates. Mirrors
+ * `collect_image_paths` in functions/backend/doc_chunks.py.
+ *
+ * @param value Any part of a LumiDoc: sections, metadata, contents.
+ * @returns The unique image storage paths found.
+ */
+export function collectImagePaths(value: unknown): string[] {
+  const paths = new Set<string>();
+
+  function walk(node: unknown) {
+    if (Array.isArray(node)) {
+      node.forEach(walk);
+      return;
+    }
+    if (node === null || typeof node !== "object") {
+      return;
+    }
+    const record = node as Record<string, unknown>;
+    for (const key of ["storagePath", "imageStoragePath"]) {
+      const path = record[key];
+      if (typeof path === "string" && path) {
+        paths.add(path);
+      }
+    }
+    Object.values(record).forEach(walk);
+  }
+
+  walk(value);
+  return [...paths];
+}
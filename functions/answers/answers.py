@@ -15,7 +15,7 @@
 """Generates answers to user queries based on document context."""
 
 import time
-from typing import List
+from typing import Iterator, List
 
 from shared.lumi_doc import LumiDoc, LumiSpan, LumiContent, TextContent
 from shared import prompt_utils
@@ -26,10 +26,18 @@ from import_pipeline import convert_html_to_lumi, markdown_utils, image_utils
 from shared.utils import get_unique_id
 
 
+def build_spans_string(doc: LumiDoc) -> str:
+    """Formats every span in the document for use as prompt context."""
+    all_spans = prompt_utils.get_all_spans_from_doc(doc)
+    formatted_spans = prompt_utils.get_formatted_spans_list(all_spans)
+    return "\n".join(formatted_spans)
+
+
 def generate_lumi_answer(
     doc: LumiDoc,
     request: LumiAnswerRequest,
-    api_key: str|None
+    api_key: str|None,
+    spans_string: str|None = None,
 ) -> LumiAnswer:
     """
     Generates a LumiAnswer by calling the Gemini API.
@@ -37,14 +45,73 @@ def generate_lumi_answer(
     This function selects the appropriate prompt based on the user's request
     (query, highlight, or both), calls the Gemini model to get a markdown
     response with inline citations, and then formats it into a LumiAnswer object.
+    Callers that cache parsed documents can pass the output of
+    `build_spans_string` to skip walking the document again.
     """
-    query = request.query
-    highlight = request.highlight
+    prompt = _build_answer_prompt(doc, request, spans_string)
     image_info = request.image
 
-    all_spans = prompt_utils.get_all_spans_from_doc(doc)
-    formatted_spans = prompt_utils.get_formatted_spans_list(all_spans)
-    spans_string = "\n".join(formatted_spans)
+    if image_info:
+        image_bytes = image_utils.download_image_from_storage(
+            image_info.image_storage_path
+        )
+        markdown_response = gemini.call_predict_with_image(
+            prompt=prompt, image_bytes=image_bytes, api_key=api_key
+        )
+    else:
+        markdown_response = gemini.call_predict(prompt, api_key=api_key)
+
+    return build_lumi_answer(request, markdown_response)
+
+
+def stream_lumi_answer_markdown(
+    doc: LumiDoc,
+    request: LumiAnswerRequest,
+    api_key: str|None,
+    spans_string: str|None = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of generate_lumi_answer.
+
+    Yields raw markdown chunks as Gemini produces them. Pass the joined
+    chunks to `build_lumi_answer` to get the parsed LumiAnswer.
+    """
+    prompt = _build_answer_prompt(doc, request, spans_string)
+    image_bytes = None
+    if request.image:
+        image_bytes = image_utils.download_image_from_storage(
+            request.image.image_storage_path
+        )
+    yield from gemini.call_predict_stream(
+        prompt, api_key=api_key, image_bytes=image_bytes
+    )
+
+
+def select_prompt_template(request: LumiAnswerRequest) -> tuple[str, str]:
+    """Returns the (name, template) of the prompt used to answer the request."""
+    if request.image:
+        if request.query:
+            return "answer_image", prompts.LUMI_PROMPT_ANSWER_IMAGE
+        return "define_image", prompts.LUMI_PROMPT_DEFINE_IMAGE
+    if request.query and request.highlight:
+        return "answer_with_context", prompts.LUMI_PROMPT_ANSWER_WITH_CONTEXT
+    if request.query:
+        return "answer", prompts.LUMI_PROMPT_ANSWER
+    if request.highlight:
+        return "define", prompts.LUMI_PROMPT_DEFINE
+    # Should not happen with proper request validation
+    raise ValueError("Request must include at least a query or a highlight.")
+
+
+def _build_answer_prompt(
+    doc: LumiDoc,
+    request: LumiAnswerRequest,
+    spans_string: str|None,
+) -> str:
+    _, template = select_prompt_template(request)
+
+    if spans_string is None:
+        spans_string = build_spans_string(doc)
 
     metadata_string = ""
     if doc.metadata:
@@ -60,55 +127,18 @@ Published: {metadata.published_timestamp}
 Last Updated: {metadata.updated_timestamp}
 """
 
-    if image_info:
-        caption = image_info.caption or ""
-        if query:
-            prompt = prompts.LUMI_PROMPT_ANSWER_IMAGE.format(
-                spans_string=spans_string,
-                query=query,
-                caption=caption,
-                metadata_string=metadata_string,
-            )
-        else:
-            prompt = prompts.LUMI_PROMPT_DEFINE_IMAGE.format(
-                spans_string=spans_string,
-                caption=caption,
-                metadata_string=metadata_string,
-            )
-    else:
-        if query and highlight:
-            prompt = prompts.LUMI_PROMPT_ANSWER_WITH_CONTEXT.format(
-                spans_string=spans_string,
-                highlight=highlight,
-                query=query,
-                metadata_string=metadata_string,
-            )
-        elif query:
-            prompt = prompts.LUMI_PROMPT_ANSWER.format(
-                spans_string=spans_string,
-                query=query,
-                metadata_string=metadata_string,
-            )
-        elif highlight:
-            prompt = prompts.LUMI_PROMPT_DEFINE.format(
-                spans_string=spans_string,
-                highlight=highlight,
-                metadata_string=metadata_string,
-            )
-        else:
-            # Should not happen with proper request validation
-            raise ValueError("Request must include at least a query or a highlight.")
+    # Each template uses a subset of these fields; unused ones are ignored.
+    return template.format(
+        spans_string=spans_string,
+        query=request.query,
+        highlight=request.highlight,
+        caption=(request.image.caption if request.image else None) or "",
+        metadata_string=metadata_string,
+    )
 
-    if image_info:
-        image_bytes = image_utils.download_image_from_storage(
-            image_info.image_storage_path
-        )
-        markdown_response = gemini.call_predict_with_image(
-            prompt=prompt, image_bytes=image_bytes, api_key=api_key
-        )
-    else:
-        markdown_response = gemini.call_predict(prompt, api_key=api_key)
 
+def build_lumi_answer(request: LumiAnswerRequest, markdown_response: str) -> LumiAnswer:
+    """Parses a markdown model response (with citations) into a LumiAnswer."""
     # Extract equations before markdown conversion to prevent misinterpretation.
     markdown_response, equation_map = markdown_utils.extract_equations_to_placeholders(markdown_response)
     html_response = markdown_utils.markdown_to_html(markdown_response)
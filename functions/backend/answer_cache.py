@@ -0,0 +1,210 @@
+"""
+Cache of generated answers, keyed on everything that shapes the prompt.
+
+Repeated questions about the same paper (the same highlight defined by many
+readers, or a canned question asked twice) are served from here instead of
+calling Gemini again. The key covers the document revision, the prompt
+template, the normalized query and highlight, the highlighted span ids and
+the image path. Only the answer body is stored; every hit is returned with
+fresh ids and a new timestamp, so it reads as a new answer on the client.
+
+Two stores are provided: an in-process LRU for single-instance runs and
+tests, and Redis for deployments with several API replicas.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Optional, Protocol
+
+import redis
+from redis import exceptions as redis_exceptions
+
+from answers.answers import select_prompt_template
+from backend.cache import MISSING, CacheStats, LruCache
+from backend.responses import dumps_json
+from shared.api import LumiAnswerRequest
+from shared.json_utils import convert_keys
+from shared.utils import get_unique_id
+
+logger = logging.getLogger(__name__)
+
+# Bump to drop every cached answer after changing how answers are parsed.
+ANSWER_CACHE_VERSION = 1
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = "?.!"
+
+
+class AnswerStore(Protocol):
+    """Byte store behind AnswerCache."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        ...
+
+
+class InMemoryAnswerStore:
+    """Process-local store; entries expire after the cache TTL."""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self._cache = LruCache(max_bytes, ttl_seconds=ttl_seconds)
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self._cache.get(key)
+        return None if value is MISSING else value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._cache.set(key, value, len(value))
+
+
+class RedisAnswerStore:
+    """Shared store; Redis expires entries with SETEX."""
+
+    def __init__(self, url: str, key_prefix: str = "lumi:answers:"):
+        self.url = url
+        self.key_prefix = key_prefix
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(self.key_prefix + key)
+        except redis_exceptions.RedisError:
+            # Any Redis failure (dropped connection, timeout, OOM, a replica
+            # in read-only mode) is a miss; reconnect for next time.
+            logger.warning("Answer cache read failed; reconnecting to Redis")
+            self.client = redis.Redis.from_url(self.url)
+            return None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        try:
+            self.client.setex(
+                self.key_prefix + key, max(1, int(ttl_seconds)), value
+            )
+        except redis_exceptions.RedisError:
+            logger.warning("Answer cache write failed; reconnecting to Redis")
+            self.client = redis.Redis.from_url(self.url)
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Casefold, collapse whitespace and drop trailing ?/./! from user text."""
+    if not value:
+        return ""
+    value = _WHITESPACE.sub(" ", value).strip().casefold()
+    return value.rstrip(_TRAILING_PUNCTUATION).rstrip()
+
+
+def answer_cache_key(
+    arxiv_id: str,
+    version: str,
+    doc_updated_at: float,
+    request: LumiAnswerRequest,
+) -> str:
+    """Stable key for an answer request against one revision of a document."""
+    template_name, template = select_prompt_template(request)
+    span_ids = sorted(
+        {selection.span_id for selection in request.highlighted_spans or []}
+    )
+    parts = {
+        "v": ANSWER_CACHE_VERSION,
+        "arxiv_id": arxiv_id,
+        "version": version,
+        "doc_updated_at": doc_updated_at,
+        "template": template_name,
+        "template_sha": hashlib.sha256(template.encode("utf-8")).hexdigest(),
+        "query": normalize_text(request.query),
+        "highlight": normalize_text(request.highlight),
+        "span_ids": span_ids,
+        "image": request.image.image_storage_path if request.image else None,
+    }
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _with_fresh_ids(value: Any) -> Any:
+    """
+    Copy a camelCase content tree, giving every content and span a new id.
+
+    Tag metadata is copied as-is: ids there point at the paper (citations,
+    references), not at the answer.
+    """
+    if isinstance(value, list):
+        return [_with_fresh_ids(item) for item in value]
+    if isinstance(value, dict):
+        copied = {}
+        for key, item in value.items():
+            if key == "id":
+                copied[key] = get_unique_id()
+            elif key == "metadata":
+                copied[key] = item
+            else:
+                copied[key] = _with_fresh_ids(item)
+        return copied
+    return value
+
+
+def refresh_answer(answer_json: dict, request: LumiAnswerRequest) -> dict:
+    """Copy of a camelCase LumiAnswer for `request`, with new ids and timestamp."""
+    return {
+        "id": get_unique_id(),
+        "request": convert_keys(asdict(request), "snake_to_camel"),
+        "responseContent": _with_fresh_ids(answer_json["responseContent"]),
+        "timestamp": int(time.time()),
+    }
+
+
+class AnswerCache:
+    def __init__(self, store: AnswerStore, ttl_seconds: float):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self._stats = CacheStats()
+        self._bypasses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, request: LumiAnswerRequest) -> Optional[dict]:
+        """Return a camelCase LumiAnswer built from the cached body, if any."""
+        cached = self.store.get(key)
+        with self._lock:
+            if cached is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+        if cached is None:
+            return None
+        return refresh_answer({"responseContent": json.loads(cached)}, request)
+
+    def peek(self, key: str, request: LumiAnswerRequest) -> Optional[dict]:
+        """Like get(), without counting a hit or miss."""
+        cached = self.store.get(key)
+        if cached is None:
+            return None
+        return refresh_answer({"responseContent": json.loads(cached)}, request)
+
+    def set(self, key: str, answer_json: dict) -> None:
+        """Store the response content of a camelCase LumiAnswer."""
+        self.store.set(
+            key, dumps_json(answer_json["responseContent"]), self.ttl_seconds
+        )
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._bypasses += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self._stats.hits, self._stats.misses
+            bypasses = self._bypasses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "bypasses": bypasses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
@@ -4,16 +4,41 @@ FastAPI application entry point for the refactored backend.
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from backend.compression import CompressionMiddleware
 from backend.config import get_settings
+from backend.dependencies import get_arxiv_sanity_store
+from backend.metrics import MetricsMiddleware, get_metrics_registry
 from backend.routes import router
+from backend.upload_limit import MULTIPART_OVERHEAD_BYTES, BodySizeLimitMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if get_settings().arxiv_sanity_snapshot:
+        # Starts the background snapshot load before the first request.
+        get_arxiv_sanity_store()
+    yield
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
-    app = FastAPI(title="Lumi Backend (FastAPI)", version="0.1.0")
+    app = FastAPI(
+        title="Lumi Backend (FastAPI)", version="0.1.0", lifespan=lifespan
+    )
+    app.add_middleware(
+        BodySizeLimitMiddleware,
+        limits={
+            f"{settings.api_prefix}/request_local_pdf_import": (
+                settings.local_pdf_max_bytes + MULTIPART_OVERHEAD_BYTES
+            ),
+        },
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -21,6 +46,26 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_level=settings.compression_brotli_level,
+        cache_max_bytes=settings.compression_cache_max_bytes,
+    )
+    if settings.metrics_enabled:
+        # Outermost, so sizes are measured after compression.
+        app.add_middleware(
+            MetricsMiddleware, server_timing=settings.server_timing_header
+        )
+
+        @app.get("/metrics", include_in_schema=False)
+        def metrics():
+            return PlainTextResponse(
+                get_metrics_registry().render(),
+                media_type="text/plain; version=0.0.4",
+            )
+
     app.include_router(router, prefix=settings.api_prefix)
     return app
 
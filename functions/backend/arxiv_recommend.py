@@ -0,0 +1,160 @@
+"""
+Library-based recommendations for the arxiv-sanity store.
+
+Like arxiv-sanity-lite's SVM recommendations: the papers imported into Lumi
+are positives, other papers are negatives, and a linear SVM (L2-regularized
+squared hinge, as `LinearSVC` with balanced class weights) is trained over
+the TF-IDF vectors of the similarity index. Every paper is then scored with
+one pass over the index's CSR arrays.
+
+Training uses a random sample of negatives, so its cost is bounded by
+`max_negatives` rather than the corpus size. The optimizer is a truncated
+Newton method (conjugate gradient on the generalized Hessian), which is
+what liblinear uses for this loss; it needs only sparse products with the
+sampled rows.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from backend.arxiv_similarity import SimilarityIndex
+
+# arxiv-sanity-lite trains LinearSVC(C=0.01, class_weight="balanced").
+RANKER_C = 0.01
+MAX_NEGATIVES = 20_000
+_MAX_NEWTON_STEPS = 20
+_MAX_CG_STEPS = 50
+_SCORE_CHUNK_ROWS = 100_000
+
+
+class _SampledRows:
+    """Selected CSR rows plus a constant bias column, for X @ w and X.T @ u."""
+
+    def __init__(self, index: SimilarityIndex, rows: np.ndarray):
+        starts = index.csr_indptr[rows]
+        lengths = index.csr_indptr[rows + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        positions = (
+            np.arange(int(lengths.sum()), dtype=np.int64)
+            - np.repeat(offsets, lengths)
+            + np.repeat(starts, lengths)
+        )
+        self.n_rows = len(rows)
+        self.n_terms = len(index.csc_indptr) - 1
+        self.owner = np.repeat(np.arange(len(rows), dtype=np.int32), lengths)
+        self.indices = np.asarray(index.csr_indices[positions])
+        self.data = np.asarray(index.csr_data[positions], dtype=np.float64)
+
+    def dot(self, w: np.ndarray) -> np.ndarray:
+        products = self.data * w[self.indices]
+        return np.bincount(self.owner, weights=products, minlength=self.n_rows) + w[-1]
+
+    def tdot(self, u: np.ndarray) -> np.ndarray:
+        out = np.empty(self.n_terms + 1)
+        out[:-1] = np.bincount(
+            self.indices, weights=self.data * u[self.owner], minlength=self.n_terms
+        )
+        out[-1] = u.sum()
+        return out
+
+
+def train_ranker(
+    index: SimilarityIndex,
+    positive_rows: Sequence[int],
+    *,
+    c: float = RANKER_C,
+    max_negatives: int = MAX_NEGATIVES,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Term weights (with the bias last) separating `positive_rows` from the
+    other rows of `index`. Larger `x @ w` means more like the positives.
+    """
+    positives = np.unique(np.asarray(positive_rows, dtype=np.int64))
+    n_papers = len(index.paper_ids)
+    others = np.setdiff1d(np.arange(n_papers, dtype=np.int64), positives)
+    if len(others) > max_negatives:
+        others = np.random.default_rng(seed).choice(
+            others, max_negatives, replace=False
+        )
+    rows = np.concatenate([positives, others])
+    X = _SampledRows(index, rows)
+    y = np.concatenate([np.ones(len(positives)), -np.ones(len(others))])
+    # Balanced: each class carries half the total weight.
+    cost = c * np.where(
+        y > 0, len(rows) / (2 * len(positives)), len(rows) / (2 * max(1, len(others)))
+    )
+
+    def objective(w: np.ndarray) -> tuple[float, np.ndarray]:
+        margin = 1 - y * X.dot(w)
+        hinge = np.maximum(margin, 0)
+        return 0.5 * w @ w + cost @ hinge**2, hinge
+
+    w = np.zeros(X.n_terms + 1)
+    value, hinge = objective(w)
+    initial_norm = None
+    for _ in range(_MAX_NEWTON_STEPS):
+        grad = w - 2 * X.tdot(cost * y * hinge)
+        norm = np.linalg.norm(grad)
+        if initial_norm is None:
+            initial_norm = norm
+        if norm <= 1e-3 * initial_norm:
+            break
+        curvature = 2 * cost * (hinge > 0)
+        step = _conjugate_gradient(
+            lambda v: v + X.tdot(curvature * X.dot(v)), -grad, 0.1 * norm
+        )
+        # Backtracking keeps each step a descent step (the loss is only
+        # piecewise quadratic).
+        size, slope = 1.0, grad @ step
+        while True:
+            candidate = w + size * step
+            new_value, new_hinge = objective(candidate)
+            if new_value <= value + 0.01 * size * slope or size < 1e-4:
+                break
+            size /= 2
+        w, value, hinge = candidate, new_value, new_hinge
+    return w
+
+
+def _conjugate_gradient(hessian_dot, rhs: np.ndarray, tolerance: float) -> np.ndarray:
+    x = np.zeros_like(rhs)
+    residual = rhs.copy()
+    direction = residual.copy()
+    residual_sq = residual @ residual
+    for _ in range(_MAX_CG_STEPS):
+        h_direction = hessian_dot(direction)
+        alpha = residual_sq / (direction @ h_direction)
+        x += alpha * direction
+        residual -= alpha * h_direction
+        new_residual_sq = residual @ residual
+        if np.sqrt(new_residual_sq) <= tolerance:
+            break
+        direction = residual + (new_residual_sq / residual_sq) * direction
+        residual_sq = new_residual_sq
+    return x
+
+
+def score_rows(
+    index: SimilarityIndex, weights: np.ndarray, rows: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """`x @ weights` for every row of `index` (or just `rows`)."""
+    if rows is not None:
+        return _SampledRows(index, np.asarray(rows, dtype=np.int64)).dot(weights)
+    n_papers = len(index.paper_ids)
+    scores = np.empty(n_papers)
+    # In chunks, so the per-posting temporaries stay small.
+    for start in range(0, n_papers, _SCORE_CHUNK_ROWS):
+        end = min(n_papers, start + _SCORE_CHUNK_ROWS)
+        lo, hi = index.csr_indptr[start], index.csr_indptr[end]
+        products = index.csr_data[lo:hi] * weights[index.csr_indices[lo:hi]]
+        owner = np.repeat(
+            np.arange(end - start), np.diff(index.csr_indptr[start : end + 1])
+        )
+        scores[start:end] = np.bincount(
+            owner, weights=products, minlength=end - start
+        )
+    return scores + weights[-1]
@@ -4,21 +4,94 @@ Lightweight arXiv ingestion + search store inspired by arxiv-sanity-lite.
 
 from __future__ import annotations
 
+import base64
+import binascii
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 import json
+import logging
 import os
+import re
 import sqlite3
+import threading
 import time
 import urllib.request
-from typing import Iterable, Sequence
+from typing import Callable, Iterable, Optional, Sequence
 
 import feedparser
+import numpy as np
+
+from backend.arxiv_recommend import score_rows, train_ranker
+from backend.arxiv_similarity import SimilarityIndexLoader, build_similarity_index
+from backend.arxiv_snapshot import ArxivSnapshot, fold_text
+from backend.arxiv_suggest import SUGGEST_MAX_PAPERS, TitleSuggester
+from backend.cache import MISSING, LruCache
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_QUERY = (
     "cat:cs.CV+OR+cat:cs.LG+OR+cat:cs.CL+OR+cat:cs.AI+OR+cat:cs.NE+OR+cat:cs.RO"
 )
 DEFAULT_PAGE_SIZE = 25
 
+ARXIV_API_URL = "http://export.arxiv.org/api/query?"
+ARXIV_API_PAGE_SIZE = 100
+# arXiv's API terms ask for no more than one request every three seconds.
+ARXIV_API_MIN_INTERVAL_SECONDS = 3.0
+# How far back the first run for a query (no high-water mark yet) reaches.
+DEFAULT_LOOKBACK_DAYS = 2
+
+# bm25 column weights for (title, summary, authors), mirroring the original
+# scoring: a title hit counted 20, an author hit 10 and a summary hit 1.
+SEARCH_FIELD_WEIGHTS = (20.0, 1.0, 10.0)
+_SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+# Upper bound for "starts with" ranges over TEXT keys.
+_MAX_CHAR = "\U0010ffff"
+# Totals are approximate for this long; local upserts clear them at once.
+COUNT_CACHE_TTL_SECONDS = 60.0
+# Recommendations are drawn from papers updated this recently, best first.
+RECOMMEND_WINDOW_DAYS = 30.0
+RECOMMEND_KEEP = 1000
+# How long a writer waits for the daemon's (short) write transaction.
+BUSY_TIMEOUT_SECONDS = 10.0
+# After a failed snapshot build, serve from SQLite this long before retrying.
+SNAPSHOT_RETRY_SECONDS = 60.0
+# New-style (2401.01234) or old-style (hep-th/9901001) id prefixes, with an
+# optional "arXiv:" label and version suffix.
+_ARXIV_ID_PREFIX = re.compile(
+    r"(?:arxiv:)?(\d{2,4}(?:\.\d{0,5})?|[a-z][a-z.-]*/\d{0,7})(?:v\d*)?",
+    re.IGNORECASE,
+)
+
+_UPSERT_PAPER = """
+INSERT INTO papers (
+    paper_id,
+    version,
+    title,
+    summary,
+    authors_json,
+    updated_timestamp,
+    published_timestamp,
+    updated_time,
+    published_time,
+    categories_json,
+    updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(paper_id) DO UPDATE SET
+    version = excluded.version,
+    title = excluded.title,
+    summary = excluded.summary,
+    authors_json = excluded.authors_json,
+    updated_timestamp = excluded.updated_timestamp,
+    published_timestamp = excluded.published_timestamp,
+    updated_time = excluded.updated_time,
+    published_time = excluded.published_time,
+    categories_json = excluded.categories_json,
+    updated_at = excluded.updated_at
+WHERE excluded.updated_time > papers.updated_time
+"""
+
 
 @dataclass(frozen=True)
 class ArxivPaper:
@@ -33,13 +106,13 @@ class ArxivPaper:
     published_time: float
     categories: list[str]
 
-    def to_metadata(self) -> dict:
+    def to_metadata(self, *, include_summary: bool = True) -> dict:
         return {
             "paperId": self.paper_id,
             "version": self.version,
             "authors": self.authors,
             "title": self.title,
-            "summary": self.summary,
+            "summary": self.summary if include_summary else None,
             "updatedTimestamp": self.updated_timestamp,
             "publishedTimestamp": self.published_timestamp,
             "categories": self.categories,
@@ -65,14 +138,7 @@ def _encode_feedparser_dict(value):
     return value
 
 
-def _fetch_arxiv_batch(search_query: str, start_index: int = 0) -> Sequence[ArxivPaper]:
-    base_url = "http://export.arxiv.org/api/query?"
-    add_url = (
-        "search_query=%s&sortBy=lastUpdatedDate&start=%d&max_results=100"
-        % (search_query, start_index)
-    )
-    with urllib.request.urlopen(base_url + add_url, timeout=30) as url:
-        response = url.read()
+def _parse_arxiv_feed(response: bytes) -> list[ArxivPaper]:
     parse = feedparser.parse(response)
     papers: list[ArxivPaper] = []
     for entry in parse.entries:
@@ -101,19 +167,147 @@ def _fetch_arxiv_batch(search_query: str, start_index: int = 0) -> Sequence[Arxi
     return papers
 
 
+def _http_get(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read()
+
+
+class RateLimiter:
+    """Spaces calls at least `min_interval` seconds apart across threads."""
+
+    def __init__(
+        self,
+        min_interval: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        # Sleeping under the lock queues the other threads behind this one.
+        with self._lock:
+            now = self._clock()
+            if self._next_at > now:
+                self._sleep(self._next_at - now)
+                now = self._next_at
+            self._next_at = now + self.min_interval
+
+
+class ArxivExportClient:
+    """
+    Pages through the arXiv export API, oldest update first.
+
+    Every request, from any thread, goes through one rate limiter. `get` is
+    the HTTP call, replaceable so tests can serve recorded responses.
+    """
+
+    def __init__(
+        self,
+        *,
+        get: Callable[[str], bytes] = _http_get,
+        min_interval: float = ARXIV_API_MIN_INTERVAL_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._get = get
+        self._limiter = RateLimiter(min_interval, sleep=sleep)
+
+    def fetch(
+        self,
+        search_query: str,
+        *,
+        start: int = 0,
+        max_results: int = ARXIV_API_PAGE_SIZE,
+    ) -> list[ArxivPaper]:
+        url = ARXIV_API_URL + (
+            "search_query=%s&sortBy=lastUpdatedDate&sortOrder=ascending"
+            "&start=%d&max_results=%d" % (search_query, start, max_results)
+        )
+        self._limiter.wait()
+        return _parse_arxiv_feed(self._get(url))
+
+
+def parse_arxiv_timestamp(value: str) -> datetime:
+    """arXiv's `updated`/`published` value (e.g. 2024-05-01T12:00:00Z)."""
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(
+        tzinfo=timezone.utc
+    )
+
+
+def date_window_query(query: str, since: datetime, until: datetime) -> str:
+    """Restrict `query` to papers last updated in [since, until] (minutes)."""
+    fmt = "%Y%m%d%H%M"
+    since_utc = since.astimezone(timezone.utc).strftime(fmt)
+    until_utc = until.astimezone(timezone.utc).strftime(fmt)
+    return f"%28{query}%29+AND+lastUpdatedDate:[{since_utc}+TO+{until_utc}]"
+
+
 class ArxivSanityStore:
-    def __init__(self, data_dir: str):
+    def __init__(
+        self,
+        data_dir: str,
+        *,
+        snapshot: bool = False,
+        suggest_max_papers: int = SUGGEST_MAX_PAPERS,
+    ):
+        """
+        With `snapshot`, `list_recent` and `search` are served from an
+        in-memory `ArxivSnapshot` once it has loaded (in the background)
+        and as long as it matches the DB's generation; SQLite otherwise.
+
+        `suggest` indexes the titles of the newest `suggest_max_papers`.
+        """
         os.makedirs(data_dir, exist_ok=True)
         self.db_path = os.path.join(data_dir, "arxiv_sanity.db")
+        self.similarity_dir = os.path.join(data_dir, "similarity")
+        self._similarity = SimilarityIndexLoader(self.similarity_dir)
+        self._count_cache = LruCache(1024, ttl_seconds=COUNT_CACHE_TTL_SECONDS)
+        self._local = threading.local()
         self._ensure_schema()
+        self._snapshot_enabled = snapshot
+        self._snapshot: ArxivSnapshot | None = None
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_thread: threading.Thread | None = None
+        self._snapshot_failed_at = 0.0
+        if snapshot:
+            self._refresh_snapshot()
+        self._suggester = TitleSuggester(suggest_max_papers)
+        self._suggest_lock = threading.Lock()
+        self._suggest_thread: threading.Thread | None = None
+        self._suggest_failed_at = 0.0
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """
+        This thread's connection, opened on first use and reused after.
+
+        `with conn:` still scopes a transaction; it does not close it.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SECONDS)
+            conn.row_factory = sqlite3.Row
+            # WAL keeps commits durable across crashes with NORMAL; only a
+            # power loss can drop the last transactions.
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
         return conn
 
+    def close(self) -> None:
+        """Close this thread's connection (others close when collected)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
     def _ensure_schema(self) -> None:
-        with self._connect() as conn:
+        conn = self._connect()
+        # Readers see the last committed snapshot while the daemon writes.
+        conn.execute("PRAGMA journal_mode = WAL")
+        with conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS papers (
@@ -131,62 +325,197 @@ class ArxivSanityStore:
                 )
                 """
             )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_papers_updated_time ON papers(updated_time DESC)"
+            self._migrate(conn)
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Apply schema steps newer than the DB's `PRAGMA user_version`."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, step in enumerate(_MIGRATIONS, start=1):
+            if version < target:
+                step(conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+
+    def generation(self) -> int:
+        """Bumped by triggers on every write to papers, from any process."""
+        return self._connect().execute(
+            "SELECT generation FROM papers_generation"
+        ).fetchone()[0]
+
+    def load_snapshot(self) -> ArxivSnapshot:
+        """Build a snapshot of the papers table and swap it in."""
+        conn = self._connect()
+        # Read first: writes during the scan leave the snapshot behind the
+        # DB, so the next request starts another build.
+        generation = self.generation()
+        rows = conn.execute(
+            "SELECT * FROM papers ORDER BY updated_time DESC, paper_id DESC"
+        )
+        snapshot = ArxivSnapshot.build(
+            generation,
+            (self._row_to_paper(row) for row in rows),
+            SEARCH_FIELD_WEIGHTS,
+        )
+        self._snapshot = snapshot
+        logger.info(
+            "Loaded arxiv snapshot: generation %d, %d papers in %.1fs",
+            generation,
+            len(snapshot),
+            snapshot.build_seconds,
+        )
+        return snapshot
+
+    def wait_for_snapshot(self, timeout: float | None = None) -> None:
+        thread = self._snapshot_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def snapshot_stats(self) -> dict:
+        snapshot = self._snapshot
+        stats = snapshot.stats() if snapshot is not None else {}
+        stats["loading"] = int(self._snapshot_thread is not None)
+        return stats
+
+    def _live_snapshot(self) -> ArxivSnapshot | None:
+        """The snapshot if it is current; otherwise start a rebuild."""
+        if not self._snapshot_enabled:
+            return None
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.generation == self.generation():
+            return snapshot
+        self._refresh_snapshot()
+        return None
+
+    def _refresh_snapshot(self) -> None:
+        with self._snapshot_lock:
+            if self._snapshot_thread is not None:
+                return
+            if time.monotonic() - self._snapshot_failed_at < SNAPSHOT_RETRY_SECONDS:
+                return
+            self._snapshot_thread = threading.Thread(
+                target=self._load_snapshot_in_background,
+                name="arxiv-snapshot",
+                daemon=True,
+            )
+            self._snapshot_thread.start()
+
+    def _load_snapshot_in_background(self) -> None:
+        try:
+            self.load_snapshot()
+        except Exception:
+            logger.exception("Building the arxiv snapshot failed")
+            self._snapshot_failed_at = time.monotonic()
+        finally:
+            self.close()
+            with self._snapshot_lock:
+                self._snapshot_thread = None
+
+    def refresh_suggester(self) -> None:
+        """Bring the title typeahead index up to the DB's generation."""
+        self._suggester.refresh(self._connect(), self.generation())
+
+    def wait_for_suggester(self, timeout: float | None = None) -> None:
+        thread = self._suggest_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def suggest_stats(self) -> dict:
+        stats = self._suggester.stats()
+        stats["loading"] = int(self._suggest_thread is not None)
+        return stats
+
+    def _start_suggester_refresh(self) -> None:
+        with self._suggest_lock:
+            if self._suggest_thread is not None:
+                return
+            if time.monotonic() - self._suggest_failed_at < SNAPSHOT_RETRY_SECONDS:
+                return
+            self._suggest_thread = threading.Thread(
+                target=self._refresh_suggester_in_background,
+                name="arxiv-suggest",
+                daemon=True,
             )
+            self._suggest_thread.start()
 
-    def upsert_papers(self, papers: Iterable[ArxivPaper]) -> int:
-        updated = 0
+    def _refresh_suggester_in_background(self) -> None:
+        try:
+            self.refresh_suggester()
+        except Exception:
+            logger.exception("Refreshing the arxiv suggest index failed")
+            self._suggest_failed_at = time.monotonic()
+        finally:
+            self.close()
+            with self._suggest_lock:
+                self._suggest_thread = None
+
+    def upsert_papers(
+        self, papers: Iterable[ArxivPaper], *, mark_query: str | None = None
+    ) -> int:
+        """
+        Insert new papers and replace ones whose `updated_time` advanced.
+
+        One `executemany` in one transaction; returns the rows written. With
+        `mark_query`, that query's high-water mark moves up to the newest
+        `updated_timestamp` in the same transaction.
+        """
+        now = time.time()
+        papers = list(papers)
+        rows = [
+            (
+                paper.paper_id,
+                paper.version,
+                paper.title,
+                paper.summary,
+                json.dumps(paper.authors),
+                paper.updated_timestamp,
+                paper.published_timestamp,
+                paper.updated_time,
+                paper.published_time,
+                json.dumps(paper.categories),
+                now,
+            )
+            for paper in papers
+        ]
+        if not rows:
+            return 0
         with self._connect() as conn:
-            for paper in papers:
-                row = conn.execute(
-                    "SELECT updated_time FROM papers WHERE paper_id = ?",
-                    (paper.paper_id,),
-                ).fetchone()
-                if row and paper.updated_time <= row["updated_time"]:
-                    continue
+            # rowcount sums sqlite3_changes(), which skips trigger writes and
+            # upserts whose WHERE rejected the update.
+            updated = conn.executemany(_UPSERT_PAPER, rows).rowcount
+            if updated:
+                # Written rows carry this batch's updated_at.
+                written = {
+                    row["paper_id"]
+                    for row in conn.execute(
+                        "SELECT paper_id FROM papers WHERE updated_at = ?"
+                        " AND paper_id IN (SELECT value FROM json_each(?))",
+                        (now, json.dumps([paper.paper_id for paper in papers])),
+                    )
+                }
+                _index_authors(
+                    conn,
+                    [
+                        (paper.paper_id, paper.authors, paper.updated_time)
+                        for paper in papers
+                        if paper.paper_id in written
+                    ],
+                )
+            # Row index 5 is updated_timestamp; ISO strings sort by time.
+            newest = max((row[5] for row in rows if row[5]), default=None)
+            if mark_query is not None and newest:
                 conn.execute(
                     """
-                    INSERT INTO papers (
-                        paper_id,
-                        version,
-                        title,
-                        summary,
-                        authors_json,
-                        updated_timestamp,
-                        published_timestamp,
-                        updated_time,
-                        published_time,
-                        categories_json,
-                        updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(paper_id) DO UPDATE SET
-                        version = excluded.version,
-                        title = excluded.title,
-                        summary = excluded.summary,
-                        authors_json = excluded.authors_json,
-                        updated_timestamp = excluded.updated_timestamp,
-                        published_timestamp = excluded.published_timestamp,
-                        updated_time = excluded.updated_time,
-                        published_time = excluded.published_time,
-                        categories_json = excluded.categories_json,
+                    INSERT INTO ingest_state (query, high_water_timestamp, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(query) DO UPDATE SET
+                        high_water_timestamp = max(
+                            high_water_timestamp, excluded.high_water_timestamp
+                        ),
                         updated_at = excluded.updated_at
                     """,
-                    (
-                        paper.paper_id,
-                        paper.version,
-                        paper.title,
-                        paper.summary,
-                        json.dumps(paper.authors),
-                        paper.updated_timestamp,
-                        paper.published_timestamp,
-                        paper.updated_time,
-                        paper.published_time,
-                        json.dumps(paper.categories),
-                        time.time(),
-                    ),
+                    (mark_query, newest, now),
                 )
-                updated += 1
+        if updated:
+            self._count_cache.clear()
         return updated
 
     def list_recent(
@@ -195,24 +524,78 @@ class ArxivSanityStore:
         limit: int,
         offset: int = 0,
         categories: list[str] | None = None,
+        cursor: str | None = None,
     ) -> tuple[list[ArxivPaper], int]:
+        """
+        Newest papers first. Pass the `recent_cursor` of the last paper of a
+        page as `cursor` to continue after it without an OFFSET scan.
+        Raises ValueError for a malformed cursor.
+        """
+        after = decode_recent_cursor(cursor) if cursor else None
+        wanted = sorted({c.strip() for c in categories or [] if c.strip()})
+        snapshot = self._live_snapshot()
+        if snapshot is not None:
+            return snapshot.list_recent(
+                limit=limit, offset=offset, categories=wanted, after=after
+            )
+        keyset = "(updated_time, paper_id) < (?, ?)" if after else ""
+        keyset_params = list(after) if after else []
         with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT * FROM papers
-                ORDER BY updated_time DESC
-                """
-            ).fetchall()
-        papers = [self._row_to_paper(row) for row in rows]
+            if wanted:
+                # Walk each category's (updated_time, paper_id) index for at
+                # most one page, merge, and keep the newest page overall.
+                per_category = " UNION ".join(
+                    f"""
+                    SELECT * FROM (
+                        SELECT paper_id, updated_time FROM paper_categories
+                        WHERE category = ?{" AND " + keyset if keyset else ""}
+                        ORDER BY updated_time DESC, paper_id DESC
+                        LIMIT ?
+                    )
+                    """
+                    for _ in wanted
+                )
+                params: list = []
+                for category in wanted:
+                    params.extend([category, *keyset_params, limit + offset])
+                rows = conn.execute(
+                    f"""
+                    SELECT p.* FROM ({per_category}) AS recent
+                    JOIN papers p ON p.paper_id = recent.paper_id
+                    ORDER BY recent.updated_time DESC, recent.paper_id DESC
+                    LIMIT ? OFFSET ?
+                    """,
+                    (*params, limit, offset),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    f"""
+                    SELECT * FROM papers
+                    {"WHERE " + keyset if keyset else ""}
+                    ORDER BY updated_time DESC, paper_id DESC
+                    LIMIT ? OFFSET ?
+                    """,
+                    (*keyset_params, limit, offset),
+                ).fetchall()
+            total = self._count_papers(conn, wanted)
+        return [self._row_to_paper(row) for row in rows], total
+
+    def _count_papers(self, conn: sqlite3.Connection, categories: list[str]) -> int:
+        key = tuple(categories)
+        total = self._count_cache.get(key)
+        if total is not MISSING:
+            return total
         if categories:
-            wanted = {c.strip() for c in categories if c.strip()}
-            papers = [
-                paper
-                for paper in papers
-                if wanted.intersection(paper.categories)
-            ]
-        total = len(papers)
-        return papers[offset : offset + limit], total
+            placeholders = ", ".join("?" for _ in categories)
+            total = conn.execute(
+                "SELECT COUNT(DISTINCT paper_id) FROM paper_categories"
+                f" WHERE category IN ({placeholders})",
+                categories,
+            ).fetchone()[0]
+        else:
+            total = conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+        self._count_cache.set(key, total, 1)
+        return total
 
     def search(
         self,
@@ -222,60 +605,396 @@ class ArxivSanityStore:
         offset: int = 0,
         categories: list[str] | None = None,
     ) -> tuple[list[tuple[ArxivPaper, float]], int]:
-        if not query.strip():
+        match = _fts_match_expression(query)
+        if not match:
             return [], 0
-        qs = query.lower().strip().split()
-        wanted = {c.strip() for c in categories} if categories else set()
-
-        def score_row(row: sqlite3.Row) -> float:
-            title = row["title"].lower()
-            summary = row["summary"].lower()
-            authors = " ".join(json.loads(row["authors_json"])).lower()
-            match = lambda s: sum(min(3, s.count(q)) for q in qs)
-            matchu = lambda s: sum(int(s.count(q) > 0) for q in qs)
-            score = 0.0
-            score += 10.0 * matchu(authors)
-            score += 20.0 * matchu(title)
-            score += 1.0 * match(summary)
-            return score
+        wanted = sorted({c.strip() for c in categories or [] if c.strip()})
+        snapshot = self._live_snapshot()
+        if snapshot is not None:
+            return snapshot.search(
+                query, limit=limit, offset=offset, categories=wanted
+            )
+        weights = ", ".join(str(weight) for weight in SEARCH_FIELD_WEIGHTS)
+        with self._connect() as conn:
+            if wanted:
+                placeholders = ", ".join("?" for _ in wanted)
+                where = (
+                    "papers_fts MATCH ? AND EXISTS (SELECT 1 FROM"
+                    " paper_categories c WHERE c.paper_id = p.paper_id"
+                    f" AND c.category IN ({placeholders}))"
+                )
+                params = [match, *wanted]
+                rows = conn.execute(
+                    f"""
+                    SELECT p.*, bm25(papers_fts, {weights}) AS rank
+                    FROM papers_fts JOIN papers p ON p.rowid = papers_fts.rowid
+                    WHERE {where}
+                    ORDER BY rank
+                    LIMIT ? OFFSET ?
+                    """,
+                    (*params, limit, offset),
+                ).fetchall()
+                total = conn.execute(
+                    "SELECT COUNT(*) FROM papers_fts"
+                    " JOIN papers p ON p.rowid = papers_fts.rowid"
+                    f" WHERE {where}",
+                    params,
+                ).fetchone()[0]
+            else:
+                # Rank and page inside the FTS table, then join only the page.
+                rows = conn.execute(
+                    f"""
+                    SELECT p.*, hits.rank AS rank
+                    FROM (
+                        SELECT rowid, bm25(papers_fts, {weights}) AS rank
+                        FROM papers_fts
+                        WHERE papers_fts MATCH ?
+                        ORDER BY rank
+                        LIMIT ? OFFSET ?
+                    ) AS hits
+                    JOIN papers p ON p.rowid = hits.rowid
+                    ORDER BY hits.rank
+                    """,
+                    (match, limit, offset),
+                ).fetchall()
+                total = conn.execute(
+                    "SELECT COUNT(*) FROM papers_fts WHERE papers_fts MATCH ?",
+                    (match,),
+                ).fetchone()[0]
+        # bm25 is lower-is-better; flip it so larger scores rank higher.
+        return [(self._row_to_paper(row), -row["rank"]) for row in rows], total
+
+    def suggest(self, query: str, *, limit: int) -> list[dict]:
+        """
+        Typeahead: papers whose id starts with `query`, then papers with a
+        title word starting with each query word, newest first.
+
+        Titles come from the in-memory index, which catches up with ingests
+        in the background; until its first build, from a title-only FTS
+        query.
+        """
+        query = query.strip()
+        conn = self._connect()
+        rows = []
+        id_match = _ARXIV_ID_PREFIX.fullmatch(query)
+        if id_match:
+            rows = conn.execute(
+                """
+                SELECT paper_id, title FROM papers
+                WHERE paper_id >= ?1 AND paper_id < ?1 || ?2
+                ORDER BY paper_id DESC LIMIT ?3
+                """,
+                (id_match.group(1).lower(), _MAX_CHAR, limit),
+            ).fetchall()
+        if len(rows) < limit:
+            # `limit` title hits leave enough after dropping id hits.
+            seen = {row["paper_id"] for row in rows}
+            rows += [
+                row
+                for row in self._suggest_titles(conn, query, limit)
+                if row["paper_id"] not in seen
+            ][: limit - len(rows)]
+        return [
+            {"paper_id": row["paper_id"], "title": row["title"]} for row in rows
+        ]
+
+    def _suggest_titles(
+        self, conn: sqlite3.Connection, query: str, limit: int
+    ) -> list[sqlite3.Row]:
+        if self._suggester.generation != self.generation():
+            self._start_suggester_refresh()
+        rowids = self._suggester.suggest(query, limit)
+        if rowids is None:
+            terms = _SEARCH_TOKEN.findall(query.lower())
+            if not terms:
+                return []
+            match = " AND ".join(f'title : "{term}"*' for term in terms)
+            return conn.execute(
+                """
+                SELECT p.paper_id, p.title FROM papers_fts
+                JOIN papers p ON p.rowid = papers_fts.rowid
+                WHERE papers_fts MATCH ?
+                ORDER BY p.updated_time DESC LIMIT ?
+                """,
+                (match, limit),
+            ).fetchall()
+        if not rowids:
+            return []
+        placeholders = ", ".join("?" for _ in rowids)
+        rows = conn.execute(
+            "SELECT rowid, paper_id, title FROM papers"
+            f" WHERE rowid IN ({placeholders})",
+            rowids,
+        ).fetchall()
+        by_rowid = {row["rowid"]: row for row in rows}
+        return [by_rowid[rowid] for rowid in rowids if rowid in by_rowid]
+
+    def build_similarity_index(self) -> str | None:
+        """Rebuild the TF-IDF index for `similar`; run offline (daemon)."""
+        os.makedirs(self.similarity_dir, exist_ok=True)
+        return build_similarity_index(self.db_path, self.similarity_dir)
+
+    def similar(
+        self, paper_id: str, *, limit: int
+    ) -> list[tuple[ArxivPaper, float]] | None:
+        """
+        Papers most similar to `paper_id` by TF-IDF cosine, best first.
 
+        Returns None when there is no index or the paper is not in it yet.
+        """
+        index = self._similarity.get()
+        hits = index.similar(paper_id, limit) if index is not None else None
+        if not hits:
+            return hits
+        ids = [hit_id for hit_id, _ in hits]
+        placeholders = ", ".join("?" for _ in ids)
         with self._connect() as conn:
-            rows = conn.execute("SELECT * FROM papers").fetchall()
-        scored: list[tuple[float, ArxivPaper]] = []
-        for row in rows:
-            paper = self._row_to_paper(row)
-            if wanted and not wanted.intersection(paper.categories):
-                continue
-            score = score_row(row)
-            if score > 0:
-                scored.append((score, paper))
-        scored.sort(key=lambda item: item[0], reverse=True)
-        total = len(scored)
-        page = scored[offset : offset + limit]
-        return [(paper, score) for score, paper in page], total
+            rows = conn.execute(
+                f"SELECT * FROM papers WHERE paper_id IN ({placeholders})", ids
+            ).fetchall()
+        papers = {row["paper_id"]: self._row_to_paper(row) for row in rows}
+        return [
+            (papers[hit_id], score) for hit_id, score in hits if hit_id in papers
+        ]
+
+    def build_recommendations(
+        self,
+        library_ids: Sequence[str],
+        *,
+        window_days: float | None = RECOMMEND_WINDOW_DAYS,
+        keep: int = RECOMMEND_KEEP,
+        now: datetime | None = None,
+    ) -> int:
+        """
+        Rank recent papers for a Lumi library and store the top `keep`; run
+        offline (daemon) after the similarity index is rebuilt.
+
+        Trains `train_ranker` with the library's papers as positives and
+        replaces the `recommendations` table in one transaction. Returns the
+        papers stored (0 when the index or the library is empty).
+        """
+        index = SimilarityIndexLoader(self.similarity_dir).get()
+        positives = index.rows_of(list(library_ids)) if index is not None else []
+        conn = self._connect()
+        if not len(positives):
+            with conn:
+                conn.execute("DELETE FROM recommendations")
+            return 0
+
+        start = time.time()
+        weights = train_ranker(index, positives)
+        if window_days is None:
+            recent_ids = conn.execute("SELECT paper_id FROM papers").fetchall()
+        else:
+            now = now or datetime.now(timezone.utc)
+            cutoff = (now - timedelta(days=window_days)).timestamp()
+            recent_ids = conn.execute(
+                "SELECT paper_id FROM papers WHERE updated_time >= ?", (cutoff,)
+            ).fetchall()
+        candidates = np.setdiff1d(
+            index.rows_of([row[0] for row in recent_ids]), positives
+        )
+        scores = score_rows(index, weights, candidates)
+        if len(candidates) > keep:
+            top = np.argpartition(-scores, keep - 1)[:keep]
+            candidates, scores = candidates[top], scores[top]
+        with conn:
+            conn.execute("DELETE FROM recommendations")
+            conn.executemany(
+                "INSERT INTO recommendations (paper_id, score) VALUES (?, ?)",
+                [
+                    (str(index.paper_ids[row]), float(score))
+                    for row, score in zip(candidates, scores)
+                ],
+            )
+        logger.info(
+            "Ranked %d recommendations from %d library papers in %.1fs",
+            len(candidates),
+            len(positives),
+            time.time() - start,
+        )
+        return len(candidates)
+
+    def list_recommended(
+        self, *, limit: int, offset: int = 0
+    ) -> tuple[list[tuple[ArxivPaper, float]], int]:
+        """The stored recommendations, best first."""
+        conn = self._connect()
+        rows = conn.execute(
+            """
+            SELECT p.*, r.score AS recommendation_score FROM recommendations r
+            JOIN papers p ON p.paper_id = r.paper_id
+            ORDER BY r.score DESC, r.paper_id
+            LIMIT ? OFFSET ?
+            """,
+            (limit, offset),
+        ).fetchall()
+        total = conn.execute("SELECT COUNT(*) FROM recommendations").fetchone()[0]
+        return [
+            (self._row_to_paper(row), row["recommendation_score"]) for row in rows
+        ], total
+
+    def list_authors(self, prefix: str, *, limit: int) -> list[dict]:
+        """
+        Authors whose full name or surname-first name starts with `prefix`
+        (normalized like `author_key`), most papers first.
+        """
+        key = author_key(prefix)
+        if not key:
+            return []
+        # Each side is an index range; only `limit` keys are read from each.
+        rows = self._connect().execute(
+            """
+            SELECT author_key, name, paper_count FROM (
+                SELECT * FROM (
+                    SELECT * FROM authors
+                    WHERE author_key >= ?1 AND author_key < ?1 || ?2
+                    ORDER BY author_key LIMIT ?3
+                )
+                UNION
+                SELECT * FROM (
+                    SELECT * FROM authors
+                    WHERE surname_key >= ?1 AND surname_key < ?1 || ?2
+                    ORDER BY surname_key LIMIT ?3
+                )
+            )
+            ORDER BY paper_count DESC, author_key
+            LIMIT ?3
+            """,
+            (key, _MAX_CHAR, limit),
+        ).fetchall()
+        return [
+            {
+                "key": row["author_key"],
+                "name": row["name"],
+                "paper_count": row["paper_count"],
+            }
+            for row in rows
+        ]
+
+    def list_author_papers(
+        self,
+        key: str,
+        *,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> tuple[list[ArxivPaper], int] | None:
+        """
+        An author's papers, newest first (cursor as in `list_recent`), or
+        None for an unknown key. Raises ValueError for a malformed cursor.
+        """
+        after = decode_recent_cursor(cursor) if cursor else None
+        conn = self._connect()
+        author = conn.execute(
+            "SELECT paper_count FROM authors WHERE author_key = ?", (key,)
+        ).fetchone()
+        if author is None:
+            return None
+        keyset = " AND (a.updated_time, a.paper_id) < (?, ?)" if after else ""
+        rows = conn.execute(
+            f"""
+            SELECT p.* FROM paper_authors a
+            JOIN papers p ON p.paper_id = a.paper_id
+            WHERE a.author_key = ?{keyset}
+            ORDER BY a.updated_time DESC, a.paper_id DESC
+            LIMIT ? OFFSET ?
+            """,
+            (key, *(after or ()), limit, offset),
+        ).fetchall()
+        return [self._row_to_paper(row) for row in rows], author["paper_count"]
+
+    def get_high_water_mark(self, query: str) -> str | None:
+        """Newest `updated_timestamp` ingested for `query`, if any."""
+        row = self._connect().execute(
+            "SELECT high_water_timestamp FROM ingest_state WHERE query = ?",
+            (query,),
+        ).fetchone()
+        return row["high_water_timestamp"] if row else None
 
     def ingest(
         self,
         *,
         query: str = DEFAULT_QUERY,
         num: int = 200,
-        start: int = 0,
-        break_after: int = 3,
+        lookback_days: float = DEFAULT_LOOKBACK_DAYS,
+        client: Optional[ArxivExportClient] = None,
+        now: Optional[datetime] = None,
     ) -> int:
-        total_updated = 0
-        zero_updates = 0
-        for k in range(start, start + num, 100):
-            papers = _fetch_arxiv_batch(query, start_index=k)
-            updated = self.upsert_papers(papers)
-            total_updated += updated
-            if updated == 0:
-                zero_updates += 1
-                if break_after and zero_updates >= break_after:
-                    break
-            else:
-                zero_updates = 0
-            time.sleep(1)
-        return total_updated
+        """
+        Fetch up to `num` papers updated since the query's high-water mark.
+
+        Pages run oldest first and the mark moves with each stored page, so
+        a run that stops early (error, or `num` reached) is resumed by the
+        next one. The first run for a query starts `lookback_days` back.
+        """
+        client = client or ArxivExportClient()
+        until = now or datetime.now(timezone.utc)
+        mark = self.get_high_water_mark(query)
+        since = (
+            parse_arxiv_timestamp(mark)
+            if mark
+            else until - timedelta(days=lookback_days)
+        )
+        return self._ingest_window(
+            client, query, since, until, limit=num, mark_query=query
+        )
+
+    def backfill(
+        self,
+        *,
+        query: str = DEFAULT_QUERY,
+        since: datetime,
+        until: datetime,
+        window_days: float = 7,
+        workers: int = 2,
+        client: Optional[ArxivExportClient] = None,
+    ) -> int:
+        """
+        Ingest everything updated in [since, until], one date window per task.
+
+        Windows are fetched concurrently, but all requests share the
+        client's rate limit, so workers only overlap the API's slow
+        responses. The high-water mark is left to `ingest`.
+        """
+        client = client or ArxivExportClient()
+        step = timedelta(days=window_days)
+        windows = []
+        start = since
+        while start < until:
+            end = min(start + step, until)
+            windows.append((start, end))
+            start = end
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            counts = pool.map(
+                lambda window: self._ingest_window(client, query, *window),
+                windows,
+            )
+            return sum(counts)
+
+    def _ingest_window(
+        self,
+        client: ArxivExportClient,
+        query: str,
+        since: datetime,
+        until: datetime,
+        *,
+        limit: int | None = None,
+        mark_query: str | None = None,
+    ) -> int:
+        search_query = date_window_query(query, since, until)
+        total = 0
+        offset = 0
+        while limit is None or offset < limit:
+            size = ARXIV_API_PAGE_SIZE
+            if limit is not None:
+                size = min(size, limit - offset)
+            papers = client.fetch(search_query, start=offset, max_results=size)
+            total += self.upsert_papers(papers, mark_query=mark_query)
+            offset += len(papers)
+            if len(papers) < size:
+                break
+        return total
 
     def _row_to_paper(self, row: sqlite3.Row) -> ArxivPaper:
         return ArxivPaper(
@@ -290,3 +1009,293 @@ class ArxivSanityStore:
             published_time=row["published_time"],
             categories=json.loads(row["categories_json"]),
         )
+
+
+def recent_cursor(paper: ArxivPaper) -> str:
+    """Opaque list_recent cursor pointing just after `paper`."""
+    raw = f"{paper.updated_time!r}:{paper.paper_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_recent_cursor(cursor: str) -> tuple[float, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        updated_time, paper_id = raw.split(":", 1)
+        return float(updated_time), paper_id
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ValueError(f"bad cursor: {cursor!r}") from exc
+
+
+def author_key(name: str) -> str:
+    """Normalized author name: folded words joined by spaces ("j muller")."""
+    return " ".join(_SEARCH_TOKEN.findall(fold_text(name)))
+
+
+def _surname_key(key: str) -> str:
+    # "yann lecun" -> "lecun yann", so typing a surname also matches.
+    first, _, last = key.rpartition(" ")
+    return f"{last} {first}" if first else last
+
+
+def _index_authors(
+    conn: sqlite3.Connection, papers: list[tuple[str, list[str], float]]
+) -> None:
+    """
+    Replace paper_authors rows for (paper_id, authors, updated_time) and
+    refresh the counts of every author who gained or lost a paper.
+    """
+    if not papers:
+        return
+    paper_ids = json.dumps([paper_id for paper_id, _, _ in papers])
+    touched = {
+        row[0]
+        for row in conn.execute(
+            "SELECT author_key FROM paper_authors"
+            " WHERE paper_id IN (SELECT value FROM json_each(?))",
+            (paper_ids,),
+        )
+    }
+    conn.execute(
+        "DELETE FROM paper_authors"
+        " WHERE paper_id IN (SELECT value FROM json_each(?))",
+        (paper_ids,),
+    )
+    rows = {}
+    for paper_id, authors, updated_time in papers:
+        for name in authors:
+            key = author_key(name)
+            if key:
+                rows[(key, paper_id)] = (key, paper_id, name, updated_time)
+    conn.executemany(
+        "INSERT INTO paper_authors (author_key, paper_id, name, updated_time)"
+        " VALUES (?, ?, ?, ?)",
+        rows.values(),
+    )
+    touched.update(key for key, _ in rows)
+    keys = json.dumps(sorted(touched))
+    conn.execute(
+        "DELETE FROM authors WHERE author_key IN (SELECT value FROM json_each(?))",
+        (keys,),
+    )
+    # The display name is the spelling on the author's newest paper.
+    counts = conn.execute(
+        """
+        SELECT author_key, COUNT(*), (
+            SELECT name FROM paper_authors latest
+            WHERE latest.author_key = a.author_key
+            ORDER BY updated_time DESC, paper_id DESC LIMIT 1
+        )
+        FROM paper_authors a
+        WHERE author_key IN (SELECT value FROM json_each(?))
+        GROUP BY author_key
+        """,
+        (keys,),
+    ).fetchall()
+    conn.executemany(
+        "INSERT INTO authors (author_key, surname_key, name, paper_count)"
+        " VALUES (?, ?, ?, ?)",
+        [(key, _surname_key(key), name, count) for key, count, name in counts],
+    )
+
+
+def _fts_match_expression(query: str) -> str:
+    """
+    Build an FTS5 query matching any term, as a prefix (so "transform"
+    still finds "transformers", like the old substring scoring).
+    """
+    terms = _SEARCH_TOKEN.findall(query.lower())
+    return " OR ".join(f'"{term}"*' for term in dict.fromkeys(terms))
+
+
+def _migrate_add_fts(conn: sqlite3.Connection) -> None:
+    # A standalone FTS5 table (not external-content) because authors are
+    # stored as JSON; triggers keep it in step with every write to papers.
+    conn.executescript(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+            title, summary, authors,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3 4'
+        );
+        CREATE TRIGGER IF NOT EXISTS papers_fts_insert AFTER INSERT ON papers
+        BEGIN
+            INSERT INTO papers_fts (rowid, title, summary, authors)
+            VALUES (
+                new.rowid, new.title, new.summary,
+                (SELECT group_concat(value, ' ') FROM json_each(new.authors_json))
+            );
+        END;
+        CREATE TRIGGER IF NOT EXISTS papers_fts_update AFTER UPDATE ON papers
+        BEGIN
+            UPDATE papers_fts SET
+                title = new.title,
+                summary = new.summary,
+                authors = (
+                    SELECT group_concat(value, ' ') FROM json_each(new.authors_json)
+                )
+            WHERE rowid = new.rowid;
+        END;
+        CREATE TRIGGER IF NOT EXISTS papers_fts_delete AFTER DELETE ON papers
+        BEGIN
+            DELETE FROM papers_fts WHERE rowid = old.rowid;
+        END;
+        DELETE FROM papers_fts;
+        INSERT INTO papers_fts (rowid, title, summary, authors)
+        SELECT
+            rowid, title, summary,
+            (SELECT group_concat(value, ' ') FROM json_each(authors_json))
+        FROM papers;
+        """
+    )
+
+
+def _migrate_add_paper_categories(conn: sqlite3.Connection) -> None:
+    # One row per (paper, category), with updated_time copied in so a
+    # category's newest papers are a single index range scan.
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS paper_categories (
+            paper_id TEXT NOT NULL,
+            category TEXT NOT NULL,
+            updated_time REAL NOT NULL,
+            PRIMARY KEY (paper_id, category)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_paper_categories_recent
+            ON paper_categories(category, updated_time DESC, paper_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_papers_recent
+            ON papers(updated_time DESC, paper_id DESC);
+        DROP INDEX IF EXISTS idx_papers_updated_time;
+        CREATE TRIGGER IF NOT EXISTS paper_categories_insert AFTER INSERT ON papers
+        BEGIN
+            INSERT OR IGNORE INTO paper_categories (paper_id, category, updated_time)
+            SELECT new.paper_id, value, new.updated_time
+            FROM json_each(new.categories_json);
+        END;
+        CREATE TRIGGER IF NOT EXISTS paper_categories_update AFTER UPDATE ON papers
+        BEGIN
+            DELETE FROM paper_categories WHERE paper_id = old.paper_id;
+            INSERT OR IGNORE INTO paper_categories (paper_id, category, updated_time)
+            SELECT new.paper_id, value, new.updated_time
+            FROM json_each(new.categories_json);
+        END;
+        CREATE TRIGGER IF NOT EXISTS paper_categories_delete AFTER DELETE ON papers
+        BEGIN
+            DELETE FROM paper_categories WHERE paper_id = old.paper_id;
+        END;
+        DELETE FROM paper_categories;
+        INSERT OR IGNORE INTO paper_categories (paper_id, category, updated_time)
+        SELECT papers.paper_id, json_each.value, papers.updated_time
+        FROM papers, json_each(papers.categories_json);
+        """
+    )
+
+
+def _migrate_add_ingest_state(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_state (
+            query TEXT PRIMARY KEY,
+            high_water_timestamp TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """
+    )
+
+
+def _migrate_add_generation(conn: sqlite3.Connection) -> None:
+    # A counter every write to papers bumps, whichever process makes it, so
+    # in-memory snapshots can tell they are stale. (The DB file's mtime
+    # does not move with WAL writes until a checkpoint.)
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS papers_generation (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            generation INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO papers_generation (id, generation) VALUES (0, 0);
+        CREATE TRIGGER IF NOT EXISTS papers_generation_insert AFTER INSERT ON papers
+        BEGIN
+            UPDATE papers_generation SET generation = generation + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS papers_generation_update AFTER UPDATE ON papers
+        BEGIN
+            UPDATE papers_generation SET generation = generation + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS papers_generation_delete AFTER DELETE ON papers
+        BEGIN
+            UPDATE papers_generation SET generation = generation + 1;
+        END;
+        """
+    )
+
+
+def _migrate_add_authors(conn: sqlite3.Connection) -> None:
+    # Kept in step by upsert_papers rather than triggers: keys need Python's
+    # Unicode folding, which a trigger could only reach through a function
+    # registered on every connection that writes.
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS paper_authors (
+            author_key TEXT NOT NULL,
+            paper_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            updated_time REAL NOT NULL,
+            PRIMARY KEY (author_key, paper_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_paper_authors_recent
+            ON paper_authors(author_key, updated_time DESC, paper_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_paper_authors_paper
+            ON paper_authors(paper_id);
+        CREATE TABLE IF NOT EXISTS authors (
+            author_key TEXT PRIMARY KEY,
+            surname_key TEXT NOT NULL,
+            name TEXT NOT NULL,
+            paper_count INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_authors_surname ON authors(surname_key);
+        """
+    )
+    papers = conn.execute(
+        "SELECT paper_id, authors_json, updated_time FROM papers"
+    ).fetchall()
+    _index_authors(
+        conn,
+        [
+            (paper_id, json.loads(authors_json), updated_time)
+            for paper_id, authors_json, updated_time in papers
+        ],
+    )
+
+
+def _migrate_add_updated_at_index(conn: sqlite3.Connection) -> None:
+    # Lets the suggest index read just the rows written since its last pass.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_papers_updated_at ON papers(updated_at)"
+    )
+
+
+def _migrate_add_recommendations(conn: sqlite3.Connection) -> None:
+    # Precomputed by build_recommendations; the API only reads it.
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS recommendations (
+            paper_id TEXT PRIMARY KEY,
+            score REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_recommendations_score
+            ON recommendations(score DESC, paper_id);
+        """
+    )
+
+
+# Schema steps, applied in order; the index is the DB's user_version - 1.
+_MIGRATIONS = (
+    _migrate_add_fts,
+    _migrate_add_paper_categories,
+    _migrate_add_ingest_state,
+    _migrate_add_generation,
+    _migrate_add_authors,
+    _migrate_add_updated_at_index,
+    _migrate_add_recommendations,
+)
@@ -0,0 +1,287 @@
+"""
+TF-IDF "similar papers" index for the arxiv-sanity store.
+
+Like arxiv-sanity-lite, each paper is a sublinear, l2-normalized TF-IDF
+vector over its title and abstract, and similarity is the dot product.
+The ingest daemon builds the index offline (`build_similarity_index`) into
+NumPy arrays next to arxiv_sanity.db:
+
+    similarity/
+        CURRENT                 name of the live build, swapped atomically
+        <build>/paper_ids.npy   row -> paper id, sorted for searchsorted
+        <build>/csr_*.npy       row-major vectors (one paper's terms)
+        <build>/csc_*.npy       column-major postings (one term's papers)
+
+The API memory-maps the live build and re-opens it when CURRENT changes.
+A query takes the paper's terms from the CSR arrays and sums each term's
+posting list from the CSC arrays with one `np.bincount`. Only terms
+shared with the query paper are touched, and common terms are pruned at
+build time.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+# Terms in fewer papers than this carry no signal; terms in more than this
+# fraction of papers are near-stopwords (arxiv-sanity-lite uses the same).
+MIN_DF = 5
+MAX_DF_FRACTION = 0.1
+RELOAD_CHECK_SECONDS = 10.0
+_TOKEN = re.compile(r"[a-z][a-z0-9]+")
+_ARRAYS = (
+    "paper_ids",
+    "csr_indptr",
+    "csr_indices",
+    "csr_data",
+    "csc_indptr",
+    "csc_indices",
+    "csc_data",
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _iter_documents(db_path: str) -> Iterator[tuple[str, list[str]]]:
+    conn = sqlite3.connect(db_path)
+    try:
+        for paper_id, title, summary in conn.execute(
+            "SELECT paper_id, title, summary FROM papers ORDER BY paper_id"
+        ):
+            yield paper_id, tokenize(f"{title} {summary}")
+    finally:
+        conn.close()
+
+
+def build_similarity_index(
+    db_path: str,
+    out_dir: str,
+    *,
+    min_df: int = MIN_DF,
+    max_df_fraction: float = MAX_DF_FRACTION,
+) -> Optional[str]:
+    """
+    Build a new index from the papers table and make it the live build.
+
+    Returns the build name, or None if there are no papers. Two passes over
+    the table keep memory to the vocabulary plus the output arrays.
+    """
+    start = time.time()
+    df: Counter[str] = Counter()
+    n_docs = 0
+    for _, tokens in _iter_documents(db_path):
+        df.update(set(tokens))
+        n_docs += 1
+    if n_docs == 0:
+        return None
+
+    max_df = max(min_df, int(max_df_fraction * n_docs))
+    vocabulary: dict[str, int] = {}
+    idf_values = array("f")
+    for term, count in df.items():
+        if min_df <= count <= max_df:
+            vocabulary[term] = len(vocabulary)
+            # Smoothed idf, as in sklearn's TfidfVectorizer.
+            idf_values.append(math.log((1 + n_docs) / (1 + count)) + 1.0)
+    del df
+    idf = np.frombuffer(idf_values, dtype=np.float32)
+
+    paper_ids: list[str] = []
+    indptr = array("q", [0])
+    indices = array("i")
+    tf = array("f")
+    for paper_id, tokens in _iter_documents(db_path):
+        counts = Counter(
+            vocabulary[token] for token in tokens if token in vocabulary
+        )
+        for term in sorted(counts):
+            indices.append(term)
+            tf.append(counts[term])
+        indptr.append(len(indices))
+        paper_ids.append(paper_id)
+
+    csr_indptr = np.frombuffer(indptr, dtype=np.int64)
+    csr_indices = np.frombuffer(indices, dtype=np.int32)
+    tf_values = np.frombuffer(tf, dtype=np.float32)
+    csr_data = (1.0 + np.log(tf_values)) * idf[csr_indices]
+    # l2-normalize each row so dot products are cosine similarities.
+    row_lengths = np.diff(csr_indptr)
+    rows = np.repeat(np.arange(len(paper_ids), dtype=np.int32), row_lengths)
+    norms = np.sqrt(
+        np.bincount(rows, weights=csr_data**2, minlength=len(paper_ids))
+    )
+    norms[norms == 0] = 1.0
+    csr_data = (csr_data / norms[rows]).astype(np.float32)
+
+    order = np.argsort(csr_indices, kind="stable")
+    csc_indices = rows[order]
+    csc_data = csr_data[order]
+    csc_indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    term_counts = np.bincount(csr_indices, minlength=len(vocabulary))
+    np.cumsum(term_counts, out=csc_indptr[1:])
+
+    build = f"build-{time.time_ns()}"
+    build_dir = os.path.join(out_dir, build)
+    os.makedirs(build_dir, exist_ok=True)
+    arrays = {
+        "paper_ids": np.array(paper_ids, dtype=str),
+        "csr_indptr": csr_indptr,
+        "csr_indices": csr_indices,
+        "csr_data": csr_data,
+        "csc_indptr": csc_indptr,
+        "csc_indices": csc_indices,
+        "csc_data": csc_data,
+    }
+    for name, values in arrays.items():
+        np.save(os.path.join(build_dir, f"{name}.npy"), values)
+    with open(os.path.join(build_dir, "manifest.json"), "w") as f:
+        manifest = {
+            "papers": len(paper_ids),
+            "terms": len(vocabulary),
+            "built_at": time.time(),
+        }
+        json.dump(manifest, f)
+
+    current_tmp = os.path.join(out_dir, f"{CURRENT_FILE}.tmp")
+    with open(current_tmp, "w") as f:
+        f.write(build)
+    os.replace(current_tmp, os.path.join(out_dir, CURRENT_FILE))
+    _remove_old_builds(out_dir, keep=build)
+    logger.info(
+        "Built similarity index %s: %d papers, %d terms in %.1fs",
+        build,
+        len(paper_ids),
+        len(vocabulary),
+        time.time() - start,
+    )
+    return build
+
+
+def _remove_old_builds(out_dir: str, keep: str) -> None:
+    # Readers that still map an old build keep their (unlinked) files.
+    for name in os.listdir(out_dir):
+        path = os.path.join(out_dir, name)
+        if name.startswith("build-") and name != keep and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+@dataclass(frozen=True)
+class SimilarityIndex:
+    build: str
+    paper_ids: np.ndarray
+    csr_indptr: np.ndarray
+    csr_indices: np.ndarray
+    csr_data: np.ndarray
+    csc_indptr: np.ndarray
+    csc_indices: np.ndarray
+    csc_data: np.ndarray
+
+    @classmethod
+    def load(cls, build_dir: str) -> "SimilarityIndex":
+        arrays = {
+            name: np.load(os.path.join(build_dir, f"{name}.npy"), mmap_mode="r")
+            for name in _ARRAYS
+        }
+        return cls(build=os.path.basename(build_dir), **arrays)
+
+    def row_of(self, paper_id: str) -> Optional[int]:
+        row = int(np.searchsorted(self.paper_ids, paper_id))
+        if row < len(self.paper_ids) and self.paper_ids[row] == paper_id:
+            return row
+        return None
+
+    def rows_of(self, paper_ids: list[str]) -> np.ndarray:
+        """Rows of the given papers that are in the index."""
+        if not paper_ids or not len(self.paper_ids):
+            return np.zeros(0, dtype=np.int64)
+        wanted = np.array(paper_ids, dtype=str)
+        rows = np.searchsorted(self.paper_ids, wanted)
+        rows = np.minimum(rows, len(self.paper_ids) - 1)
+        return rows[self.paper_ids[rows] == wanted]
+
+    def similar(
+        self, paper_id: str, limit: int
+    ) -> Optional[list[tuple[str, float]]]:
+        """Top `limit` (paper_id, cosine) pairs, or None if not indexed."""
+        row = self.row_of(paper_id)
+        if row is None:
+            return None
+        start, end = self.csr_indptr[row], self.csr_indptr[row + 1]
+        terms = self.csr_indices[start:end]
+        if len(terms) == 0:
+            return []
+        weights = self.csr_data[start:end]
+        rows, values = [], []
+        for term, weight in zip(terms, weights):
+            lo, hi = self.csc_indptr[term], self.csc_indptr[term + 1]
+            rows.append(self.csc_indices[lo:hi])
+            values.append(self.csc_data[lo:hi] * weight)
+        scores = np.bincount(
+            np.concatenate(rows),
+            weights=np.concatenate(values),
+            minlength=len(self.paper_ids),
+        )
+        scores[row] = 0.0
+        k = min(limit, len(scores) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [
+            (str(self.paper_ids[idx]), float(scores[idx]))
+            for idx in top
+            if scores[idx] > 0
+        ]
+
+
+class SimilarityIndexLoader:
+    """Keeps the live build mapped, re-opening it when CURRENT changes."""
+
+    def __init__(
+        self, index_dir: str, check_seconds: float = RELOAD_CHECK_SECONDS
+    ):
+        self.index_dir = index_dir
+        self.check_seconds = check_seconds
+        self._index: Optional[SimilarityIndex] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[SimilarityIndex]:
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < self.check_seconds:
+            return self._index
+        with self._lock:
+            self._checked_at = now
+            try:
+                with open(os.path.join(self.index_dir, CURRENT_FILE)) as f:
+                    build = f.read().strip()
+            except FileNotFoundError:
+                self._index = None
+                return None
+            if self._index is None or self._index.build != build:
+                try:
+                    self._index = SimilarityIndex.load(
+                        os.path.join(self.index_dir, build)
+                    )
+                except (OSError, ValueError):
+                    logger.exception("Could not load similarity index %s", build)
+            return self._index
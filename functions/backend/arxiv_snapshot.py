@@ -0,0 +1,267 @@
+"""
+In-process, read-only snapshot of the arxiv-sanity corpus.
+
+`ArxivSanityStore` can serve `list_recent` and `search` from memory instead
+of SQLite. The snapshot holds:
+  - the decoded papers, newest first (so "recent" is a slice)
+  - their `updated_time` as a NumPy array, for keyset cursors
+  - a category bitset per paper (categories interned to bit positions)
+  - per-field (title, summary, authors) postings over folded, lowercased
+    tokens, with BM25-saturated weights precomputed per posting
+
+Queries are NumPy operations over those arrays, with no per-row Python
+work and no JSON decoding. A snapshot is never modified; the store builds
+a new one when the DB generation changes and swaps the reference.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import numpy as np
+
+from backend.cache import MISSING, LruCache
+
+if TYPE_CHECKING:
+    from backend.arxiv_sanity import ArxivPaper
+
+# Same tokens as the FTS5 unicode61 tokenizer with remove_diacritics.
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_BM25_K1 = 1.2
+_MASK_CACHE_SIZE = 64
+_FIELDS = ("title", "summary", "authors")
+
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip diacritics (most abstracts are already ASCII)."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _field_texts(paper: "ArxivPaper") -> tuple[str, str, str]:
+    return paper.title, paper.summary, " ".join(paper.authors)
+
+
+class _Postings:
+    """One field's postings in CSR form: term -> (doc rows, weights)."""
+
+    def __init__(self, indptr: np.ndarray, docs: np.ndarray, weights: np.ndarray):
+        self.indptr = indptr
+        self.docs = docs
+        self.weights = weights
+
+    def term_range(self, lo: int, hi: int) -> tuple[np.ndarray, np.ndarray]:
+        start, end = self.indptr[lo], self.indptr[hi]
+        return self.docs[start:end], self.weights[start:end]
+
+
+class ArxivSnapshot:
+    def __init__(
+        self,
+        *,
+        generation: int,
+        papers: list["ArxivPaper"],
+        updated_time: np.ndarray,
+        paper_ids: list[str],
+        categories: dict[str, int],
+        category_bits: np.ndarray,
+        terms: list[str],
+        postings: tuple[_Postings, ...],
+        build_seconds: float,
+    ):
+        self.generation = generation
+        self.papers = papers
+        self.updated_time = updated_time
+        # Ascending, for searchsorted on the newest-first order.
+        self._negated_time = -updated_time
+        self.paper_ids = paper_ids
+        self.categories = categories
+        self.category_bits = category_bits
+        self.terms = terms
+        self.postings = postings
+        self.build_seconds = build_seconds
+        self._masks = LruCache(_MASK_CACHE_SIZE)
+
+    @classmethod
+    def build(
+        cls,
+        generation: int,
+        papers: Iterable["ArxivPaper"],
+        field_weights: tuple[float, float, float],
+    ) -> "ArxivSnapshot":
+        """`papers` must be ordered by (updated_time, paper_id) descending."""
+        start = time.perf_counter()
+        paper_list: list["ArxivPaper"] = []
+        categories: dict[str, int] = {}
+        paper_categories: list[list[int]] = []
+        term_ids: dict[str, int] = {}
+        field_terms = [array("i") for _ in _FIELDS]
+        field_docs = [array("i") for _ in _FIELDS]
+        field_tf = [array("f") for _ in _FIELDS]
+        for doc, paper in enumerate(papers):
+            paper_list.append(paper)
+            paper_categories.append(
+                [categories.setdefault(c, len(categories)) for c in paper.categories]
+            )
+            for field, text in enumerate(_field_texts(paper)):
+                counts = Counter(_TOKEN.findall(fold_text(text)))
+                for token, count in counts.items():
+                    field_terms[field].append(
+                        term_ids.setdefault(token, len(term_ids))
+                    )
+                    field_docs[field].append(doc)
+                    field_tf[field].append(count)
+
+        n_docs = len(paper_list)
+        words = max(1, math.ceil(len(categories) / 64))
+        category_bits = np.zeros((n_docs, words), dtype=np.uint64)
+        for doc, bits in enumerate(paper_categories):
+            for bit in bits:
+                category_bits[doc, bit // 64] |= np.uint64(1 << (bit % 64))
+
+        # Renumber terms in sorted order so a prefix is a contiguous range.
+        terms = sorted(term_ids)
+        rank = np.empty(len(terms), dtype=np.int32)
+        rank[np.fromiter((term_ids[t] for t in terms), np.int32, len(terms))] = (
+            np.arange(len(terms), dtype=np.int32)
+        )
+        postings = []
+        for field, weight in enumerate(field_weights):
+            term = rank[np.frombuffer(field_terms[field], dtype=np.int32)]
+            # Stable, so each term's docs stay in recency order.
+            order = np.argsort(term, kind="stable")
+            term = term[order]
+            docs = np.frombuffer(field_docs[field], dtype=np.int32)[order]
+            tf = np.frombuffer(field_tf[field], dtype=np.float32)[order]
+            df = np.bincount(term, minlength=len(terms))
+            idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+            weights = weight * idf[term] * tf * (_BM25_K1 + 1) / (tf + _BM25_K1)
+            indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+            np.cumsum(df, out=indptr[1:])
+            postings.append(_Postings(indptr, docs, weights.astype(np.float32)))
+
+        return cls(
+            generation=generation,
+            papers=paper_list,
+            updated_time=np.array(
+                [paper.updated_time for paper in paper_list], dtype=np.float64
+            ),
+            paper_ids=[paper.paper_id for paper in paper_list],
+            categories=categories,
+            category_bits=category_bits,
+            terms=terms,
+            postings=tuple(postings),
+            build_seconds=time.perf_counter() - start,
+        )
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def stats(self) -> dict:
+        return {
+            "generation": self.generation,
+            "papers": len(self.papers),
+            "terms": len(self.terms),
+            "build_seconds": self.build_seconds,
+        }
+
+    def _category_mask(
+        self, categories: list[str]
+    ) -> Optional[tuple[np.ndarray, int]]:
+        """(rows in any of `categories`, their count); None means no filter."""
+        if not categories:
+            return None
+        key = tuple(categories)
+        cached = self._masks.get(key)
+        if cached is not MISSING:
+            return cached
+        wanted = np.zeros(self.category_bits.shape[1], dtype=np.uint64)
+        for category in categories:
+            bit = self.categories.get(category)
+            if bit is not None:
+                wanted[bit // 64] |= np.uint64(1 << (bit % 64))
+        mask = (self.category_bits & wanted).any(axis=1)
+        cached = (mask, int(mask.sum()))
+        self._masks.set(key, cached, 1)
+        return cached
+
+    def _position_after(self, after: tuple[float, str]) -> int:
+        """First row that sorts after the cursor (updated_time, paper_id)."""
+        updated_time, paper_id = after
+        lo = int(np.searchsorted(self._negated_time, -updated_time, side="left"))
+        hi = int(np.searchsorted(self._negated_time, -updated_time, side="right"))
+        # Rows with the same timestamp are ordered by paper_id descending.
+        while lo < hi and self.paper_ids[lo] >= paper_id:
+            lo += 1
+        return lo
+
+    def list_recent(
+        self,
+        *,
+        limit: int,
+        offset: int = 0,
+        categories: list[str] | None = None,
+        after: tuple[float, str] | None = None,
+    ) -> tuple[list["ArxivPaper"], int]:
+        start = self._position_after(after) if after else 0
+        selected = self._category_mask(categories or [])
+        if selected is None:
+            rows = range(start + offset, min(start + offset + limit, len(self)))
+            return [self.papers[row] for row in rows], len(self)
+        mask, total = selected
+        hits = np.flatnonzero(mask[start:])[offset : offset + limit] + start
+        return [self.papers[row] for row in hits], total
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int,
+        offset: int = 0,
+        categories: list[str] | None = None,
+    ) -> tuple[list[tuple["ArxivPaper", float]], int]:
+        """
+        Prefix-match each query token (like the FTS `"token"*` OR query) in
+        every field and rank by field-weighted BM25 without length norms.
+        """
+        docs, weights = [], []
+        for token in dict.fromkeys(_TOKEN.findall(fold_text(query))):
+            lo = bisect_left(self.terms, token)
+            hi = bisect_left(self.terms, token + "\U0010ffff", lo)
+            if lo == hi:
+                continue
+            for postings in self.postings:
+                field_docs, field_weights = postings.term_range(lo, hi)
+                docs.append(field_docs)
+                weights.append(field_weights)
+        if not docs:
+            return [], 0
+        scores = np.bincount(
+            np.concatenate(docs),
+            weights=np.concatenate(weights),
+            minlength=len(self),
+        )
+        matched = scores > 0
+        selected = self._category_mask(categories or [])
+        if selected is not None:
+            matched &= selected[0]
+        candidates = np.flatnonzero(matched)
+        total = len(candidates)
+        wanted = offset + limit
+        if total > wanted:
+            top = np.argpartition(-scores[candidates], wanted - 1)[:wanted]
+            candidates = candidates[top]
+        # Best score first; ties go to the more recent paper (lower row).
+        ordered = candidates[np.lexsort((candidates, -scores[candidates]))]
+        page = ordered[offset : offset + limit]
+        return [(self.papers[row], float(scores[row])) for row in page], total
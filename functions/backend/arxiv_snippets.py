@@ -0,0 +1,121 @@
+"""
+Search-result highlights for arxiv-sanity: title matches plus the abstract
+window that best covers the query.
+
+Matching mirrors the search itself: text is split into \\w+ words, folded
+(lowercase, no diacritics) and a word matches when it starts with a query
+token. Spans are [start, end) offsets into the original text, so the client
+can wrap them without re-scanning or escaping anything. They are computed in
+code points and sent as UTF-16 code units, which is what JavaScript string
+indices count (a character above U+FFFF, like 𝒪, is two of them).
+"""
+
+from __future__ import annotations
+
+import re
+from itertools import accumulate
+from typing import TYPE_CHECKING
+
+from backend.arxiv_snapshot import fold_text
+
+if TYPE_CHECKING:
+    from backend.arxiv_sanity import ArxivPaper
+
+SNIPPET_MAX_CHARS = 240
+# Context kept before the first match in the chosen window.
+SNIPPET_LEAD_CHARS = 40
+ELLIPSIS = "…"
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def query_terms(query: str) -> tuple[str, ...]:
+    return tuple(dict.fromkeys(_WORD.findall(fold_text(query))))
+
+
+def match_spans(text: str, terms: tuple[str, ...]) -> list[tuple[int, int, str]]:
+    """(start, end, term) for each word of `text` that a query term prefixes."""
+    if not terms:
+        return []
+    spans = []
+    for match in _WORD.finditer(text):
+        word = fold_text(match.group())
+        if word.startswith(terms):
+            term = next(term for term in terms if word.startswith(term))
+            spans.append((match.start(), match.end(), term))
+    return spans
+
+
+def _best_window(
+    spans: list[tuple[int, int, str]], max_chars: int
+) -> tuple[int, int]:
+    """
+    [i, j) range of spans that fits in `max_chars` with the most distinct
+    terms, then the most matches; the earliest such window wins ties.
+    """
+    best_key, best = (0, 0), (0, 0)
+    j = 0
+    for i in range(len(spans)):
+        j = max(j, i)
+        while j < len(spans) and spans[j][1] - spans[i][0] <= max_chars:
+            j += 1
+        key = (len({span[2] for span in spans[i:j]}), j - i)
+        if key > best_key:
+            best_key, best = key, (i, j)
+    return best
+
+
+def summary_snippet(
+    summary: str, terms: tuple[str, ...], max_chars: int = SNIPPET_MAX_CHARS
+) -> tuple[str, list[tuple[int, int]]]:
+    """At most `max_chars` of `summary` (plus ellipses) and its match spans."""
+    spans = match_spans(summary, terms)
+    if len(summary) <= max_chars:
+        return summary, [(start, end) for start, end, _ in spans]
+
+    i, j = _best_window(spans, max_chars)
+    if i < j:
+        first_hit, last_hit = spans[i][0], spans[j - 1][1]
+        # Lead-in context, unless it would push the last match out.
+        start = max(0, last_hit - max_chars, first_hit - SNIPPET_LEAD_CHARS)
+    else:
+        first_hit = last_hit = start = 0
+    start = min(start, len(summary) - max_chars)
+    end = start + max_chars
+    # Snap to word boundaries without cutting off a match.
+    if start > 0:
+        space = summary.find(" ", start, max(start, first_hit))
+        if space != -1:
+            start = space + 1
+    if end < len(summary):
+        space = summary.rfind(" ", max(start, last_hit), end)
+        if space != -1:
+            end = space
+
+    prefix = ELLIPSIS if start > 0 else ""
+    suffix = ELLIPSIS if end < len(summary) else ""
+    shift = len(prefix) - start
+    matches = [
+        (span_start + shift, span_end + shift)
+        for span_start, span_end, _ in spans
+        if span_start >= start and span_end <= end
+    ]
+    return prefix + summary[start:end] + suffix, matches
+
+
+def utf16_spans(text: str, spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Code point spans of `text` as UTF-16 code unit (JavaScript) offsets."""
+    if not spans or text.isascii() or max(text) <= "\uffff":
+        return spans
+    # astral[i]: characters above U+FFFF in text[:i], each one extra unit.
+    astral = list(accumulate((char > "\uffff" for char in text), initial=0))
+    return [(start + astral[start], end + astral[end]) for start, end in spans]
+
+
+def highlight_paper(paper: "ArxivPaper", terms: tuple[str, ...]) -> dict:
+    snippet, snippet_matches = summary_snippet(paper.summary, terms)
+    title_spans = [(start, end) for start, end, _ in match_spans(paper.title, terms)]
+    return {
+        "title": utf16_spans(paper.title, title_spans),
+        "snippet": snippet,
+        "snippet_matches": utf16_spans(snippet, snippet_matches),
+    }
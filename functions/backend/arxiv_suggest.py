@@ -0,0 +1,318 @@
+"""
+Title typeahead for arxiv-sanity.
+
+`SuggestIndex` is an immutable prefix index over folded title tokens:
+  - `terms`: the sorted vocabulary, so a typed prefix is a `bisect` range
+  - term -> papers postings (CSR, newest paper first within each term)
+  - paper -> terms (CSR), to check the other words of a multi-word query
+  - the newest `PREFIX_HEADS` papers for every one- and two-letter prefix
+
+Papers are numbered oldest to newest, so "newest" is "largest number" and
+no timestamps are kept. Titles and ids are read back from SQLite for the
+handful of results only.
+
+`TitleSuggester` holds a base index over the newest `max_papers` papers plus
+a small delta index of papers written since. Each refresh rebuilds the
+delta (cheap), masking base entries it replaces; when the delta outgrows
+`delta_limit`, the next refresh rebuilds the base instead. Memory stays
+proportional to `max_papers` title tokens.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from backend.arxiv_snapshot import fold_text
+
+SUGGEST_MAX_PAPERS = 1_000_000
+DELTA_LIMIT = 20_000
+# A prefix whose postings fit in this many entries is resolved exactly;
+# beyond it, only the newest few papers of each matching term are read.
+EXACT_POSTINGS_LIMIT = 8_192
+# Per-term head size, as a multiple of the limit, for multi-word queries.
+HEAD_FACTOR = 8
+# Prefixes this short match thousands of terms, so their newest papers are
+# precomputed instead.
+SHORT_PREFIX_CHARS = 2
+PREFIX_HEADS = 256
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_MAX_CHAR = "\U0010ffff"
+
+
+def title_tokens(text: str) -> list[str]:
+    return _TOKEN.findall(fold_text(text))
+
+
+def _gather(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Positions start..start+length for every (start, length), flattened."""
+    offsets = np.cumsum(lengths) - lengths
+    return (
+        np.arange(int(lengths.sum()), dtype=np.int64)
+        - np.repeat(offsets, lengths)
+        + np.repeat(starts, lengths)
+    )
+
+
+class SuggestIndex:
+    def __init__(
+        self,
+        rowids: np.ndarray,
+        terms: list[str],
+        term_ptr: np.ndarray,
+        term_docs: np.ndarray,
+        doc_ptr: np.ndarray,
+        doc_terms: np.ndarray,
+    ):
+        self.rowids = rowids
+        self.terms = terms
+        self.term_ptr = term_ptr
+        self.term_docs = term_docs
+        self.doc_ptr = doc_ptr
+        self.doc_terms = doc_terms
+        self._rowid_order = np.argsort(rowids, kind="stable")
+        self._prefix_heads = self._short_prefix_heads()
+
+    def _short_prefix_heads(self) -> dict[str, np.ndarray]:
+        heads = {}
+        for length in range(1, SHORT_PREFIX_CHARS + 1):
+            lo = 0
+            while lo < len(self.terms):
+                prefix = self.terms[lo][:length]
+                hi = bisect_left(self.terms, prefix + _MAX_CHAR, lo)
+                if len(prefix) == length:
+                    docs = self._term_heads(lo, hi, PREFIX_HEADS)
+                    heads[prefix] = np.unique(docs)[::-1][:PREFIX_HEADS]
+                lo = hi
+        return heads
+
+    def _term_heads(self, lo: int, hi: int, heads: int) -> np.ndarray:
+        """The newest `heads` postings of each term in [lo, hi)."""
+        starts = self.term_ptr[lo:hi]
+        lengths = np.minimum(np.diff(self.term_ptr[lo : hi + 1]), heads)
+        return self.term_docs[_gather(starts, lengths)]
+
+    @classmethod
+    def build(cls, rows: Iterable[tuple[int, str]]) -> "SuggestIndex":
+        """`rows` are (papers.rowid, title), oldest first."""
+        rowids = array("q")
+        doc_ptr = array("q", [0])
+        doc_terms = array("i")
+        term_ids: dict[str, int] = {}
+        for rowid, title in rows:
+            doc_terms.extend(
+                {
+                    term_ids.setdefault(token, len(term_ids))
+                    for token in title_tokens(title)
+                }
+            )
+            doc_ptr.append(len(doc_terms))
+            rowids.append(rowid)
+
+        terms = sorted(term_ids)
+        rank = np.empty(len(terms), dtype=np.int32)
+        rank[np.fromiter((term_ids[t] for t in terms), np.int32, len(terms))] = (
+            np.arange(len(terms), dtype=np.int32)
+        )
+        doc_ptr_array = np.frombuffer(doc_ptr, dtype=np.int64)
+        doc_terms_array = rank[np.frombuffer(doc_terms, dtype=np.int32)]
+        owner = np.repeat(
+            np.arange(len(rowids), dtype=np.int32), np.diff(doc_ptr_array)
+        )
+        # By term, then newest paper first.
+        order = np.lexsort((-owner, doc_terms_array))
+        term_ptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(doc_terms_array, minlength=len(terms)), out=term_ptr[1:]
+        )
+        return cls(
+            np.frombuffer(rowids, dtype=np.int64),
+            terms,
+            term_ptr,
+            owner[order],
+            doc_ptr_array,
+            doc_terms_array,
+        )
+
+    def __len__(self) -> int:
+        return len(self.rowids)
+
+    def docs_for_rowids(self, rowids: Iterable[int]) -> np.ndarray:
+        wanted = np.fromiter(rowids, dtype=np.int64)
+        if not len(self.rowids) or not len(wanted):
+            return np.zeros(0, dtype=np.int64)
+        sorted_rowids = self.rowids[self._rowid_order]
+        positions = np.searchsorted(sorted_rowids, wanted)
+        positions = np.minimum(positions, len(sorted_rowids) - 1)
+        found = sorted_rowids[positions] == wanted
+        return self._rowid_order[positions[found]]
+
+    def _term_range(self, prefix: str) -> tuple[int, int]:
+        lo = bisect_left(self.terms, prefix)
+        return lo, bisect_left(self.terms, prefix + _MAX_CHAR, lo)
+
+    def _candidate_count(self, prefix: str, lo: int, hi: int, heads: int) -> int:
+        size = int(self.term_ptr[hi] - self.term_ptr[lo])
+        if size <= EXACT_POSTINGS_LIMIT:
+            return size
+        if prefix in self._prefix_heads:
+            return PREFIX_HEADS
+        return min(size, (hi - lo) * heads)
+
+    def _has_term_in(self, docs: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        starts = self.doc_ptr[docs]
+        lengths = self.doc_ptr[docs + 1] - starts
+        values = self.doc_terms[_gather(starts, lengths)]
+        owner = np.repeat(np.arange(len(docs)), lengths)
+        hit = (values >= lo) & (values < hi)
+        return np.bincount(owner[hit], minlength=len(docs)) > 0
+
+    def lookup(
+        self,
+        prefixes: list[str],
+        limit: int,
+        skip: Optional[np.ndarray] = None,
+    ) -> list[int]:
+        """
+        Row ids of the newest papers with a title word starting with every
+        prefix. `skip` is a per-paper mask of entries to ignore.
+        """
+        if not prefixes or not len(self):
+            return []
+        ranges = [self._term_range(prefix) for prefix in prefixes]
+        if any(lo == hi for lo, hi in ranges):
+            return []
+        heads = limit * (HEAD_FACTOR if len(prefixes) > 1 else 1)
+        # Start from the prefix with the fewest candidates; the other
+        # prefixes filter them.
+        costs = [
+            self._candidate_count(prefix, lo, hi, heads)
+            for prefix, (lo, hi) in zip(prefixes, ranges)
+        ]
+        pivot = int(np.argmin(costs))
+        prefix, (lo, hi) = prefixes[pivot], ranges.pop(pivot)
+        start, end = self.term_ptr[lo], self.term_ptr[hi]
+        if end - start <= EXACT_POSTINGS_LIMIT:
+            docs = np.unique(self.term_docs[start:end])[::-1]
+        elif prefix in self._prefix_heads:
+            docs = self._prefix_heads[prefix]
+        else:
+            docs = np.unique(self._term_heads(lo, hi, heads))[::-1]
+        if skip is not None:
+            docs = docs[~skip[docs]]
+        for other_lo, other_hi in ranges:
+            if not len(docs):
+                break
+            docs = docs[self._has_term_in(docs, other_lo, other_hi)]
+        return [int(rowid) for rowid in self.rowids[docs[:limit]]]
+
+
+@dataclass(frozen=True)
+class _SuggestState:
+    generation: int
+    # Largest papers.updated_at already indexed.
+    indexed_through: float
+    base: SuggestIndex
+    delta_rows: dict[int, str]
+    delta: SuggestIndex
+    superseded: np.ndarray
+
+
+class TitleSuggester:
+    """Base + delta suggest indexes for one store; see the module docstring."""
+
+    def __init__(
+        self, max_papers: int = SUGGEST_MAX_PAPERS, delta_limit: int = DELTA_LIMIT
+    ):
+        self.max_papers = max_papers
+        self.delta_limit = delta_limit
+        self._state: Optional[_SuggestState] = None
+
+    @property
+    def generation(self) -> Optional[int]:
+        state = self._state
+        return state.generation if state is not None else None
+
+    def stats(self) -> dict:
+        state = self._state
+        if state is None:
+            return {}
+        return {
+            "generation": state.generation,
+            "base_papers": len(state.base),
+            "base_terms": len(state.base.terms),
+            "delta_papers": len(state.delta),
+        }
+
+    def refresh(self, conn: sqlite3.Connection, generation: int) -> None:
+        """Bring the index up to `generation`, incrementally when possible."""
+        state = self._state
+        if state is not None:
+            rows = conn.execute(
+                "SELECT rowid, title, updated_at FROM papers"
+                " WHERE updated_at > ? ORDER BY updated_at",
+                (state.indexed_through,),
+            ).fetchall()
+            if len(state.delta_rows) + len(rows) <= self.delta_limit:
+                self._state = self._with_delta(state, rows, generation)
+                return
+        self._state = self._rebuild(conn, generation)
+
+    def _rebuild(self, conn: sqlite3.Connection, generation: int) -> _SuggestState:
+        indexed_through = conn.execute(
+            "SELECT COALESCE(MAX(updated_at), 0) FROM papers"
+        ).fetchone()[0]
+        rows = conn.execute(
+            "SELECT rowid, title FROM papers"
+            " ORDER BY updated_time DESC, paper_id DESC LIMIT ?",
+            (self.max_papers,),
+        ).fetchall()
+        base = SuggestIndex.build((row[0], row[1]) for row in reversed(rows))
+        return _SuggestState(
+            generation=generation,
+            indexed_through=indexed_through,
+            base=base,
+            delta_rows={},
+            delta=SuggestIndex.build([]),
+            superseded=np.zeros(len(base), dtype=bool),
+        )
+
+    def _with_delta(
+        self, state: _SuggestState, rows: list, generation: int
+    ) -> _SuggestState:
+        delta_rows = dict(state.delta_rows)
+        for rowid, title, _ in rows:
+            # Re-inserting moves a rewritten paper to the newest end.
+            delta_rows.pop(rowid, None)
+            delta_rows[rowid] = title
+        superseded = state.superseded.copy()
+        superseded[state.base.docs_for_rowids(delta_rows)] = True
+        return _SuggestState(
+            generation=generation,
+            indexed_through=max(
+                [state.indexed_through, *(row[2] for row in rows)]
+            ),
+            base=state.base,
+            delta_rows=delta_rows,
+            delta=SuggestIndex.build(delta_rows.items()),
+            superseded=superseded,
+        )
+
+    def suggest(self, query: str, limit: int) -> Optional[list[int]]:
+        """Row ids, newest first; None until the first build finishes."""
+        state = self._state
+        if state is None:
+            return None
+        prefixes = list(dict.fromkeys(title_tokens(query)))
+        rowids = state.delta.lookup(prefixes, limit)
+        if len(rowids) < limit:
+            rowids += state.base.lookup(
+                prefixes, limit - len(rowids), skip=state.superseded
+            )
+        return rowids
@@ -0,0 +1,133 @@
+"""
+Small in-process caching primitives shared by the backend.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class LruCache:
+    """
+    Thread-safe LRU cache bounded by the total size of its entries.
+
+    Callers pass the size of each value (bytes for raw payloads, an estimate
+    for parsed objects). Entries also expire after their TTL, if one is set.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, tuple[Any, int, Optional[float]]] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING if absent or expired."""
+        return self._lookup(key, record=True)
+
+    def peek(self, key: Hashable) -> Any:
+        """Like get(), but without touching hit/miss counters."""
+        return self._lookup(key, record=False)
+
+    def _lookup(self, key: Hashable, *, record: bool) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if record:
+                    self.stats.misses += 1
+                return MISSING
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                if record:
+                    self.stats.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            if record:
+                self.stats.hits += 1
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        size: int,
+        ttl_seconds: Optional[float] = None,
+    ) -> bool:
+        """Store a value. Returns False if it is too large to cache."""
+        if size > self.max_size:
+            return False
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._size += size
+            while self._size > self.max_size and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats.evictions += 1
+        return True
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def pop_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches; scans all keys."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
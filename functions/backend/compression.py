@@ -0,0 +1,225 @@
+"""
+Negotiated brotli/gzip compression for API responses.
+
+Document JSON is large and highly repetitive, so it shrinks several-fold on
+the wire. Complete responses that carry an ETag are compressed once per
+(ETag, encoding) and the compressed body is reused from an LRU until the
+document changes. Streamed bodies are compressed incrementally, except
+`text/event-stream`, which is passed through so events are not held back.
+"""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.cache import MISSING, LruCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - Brotli is listed in requirements.
+    brotli = None
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+UNCOMPRESSED_STATUSES = {204, 206, 304}
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    codings: dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def choose_encoding(header: str, available: tuple[str, ...]) -> Optional[str]:
+    """Pick the highest-q coding we support; ties go to the earlier one."""
+    codings = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = codings.get(encoding, codings.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    if content_type.startswith("text/event-stream"):
+        return False
+    return content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+
+def _weaken_etag(etag: str) -> str:
+    # The compressed body is a different representation of the same entity.
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str, level: int):
+        self._encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress and flush, so each chunk reaches the client promptly."""
+        if self._encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_level: int = 5,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"br": brotli_level, "gzip": gzip_level}
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+        self.cache = LruCache(cache_max_bytes) if cache_max_bytes > 0 else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        responder = _CompressionResponder(
+            self, choose_encoding(accept, self.encodings), send
+        )
+        await self.app(scope, receive, responder.send)
+
+    def compress_body(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        key = None
+        if etag and self.cache is not None:
+            key = (etag, encoding, len(body))
+            cached = self.cache.get(key)
+            if cached is not MISSING:
+                return cached
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.levels["br"])
+        else:
+            compressed = gzip.compress(body, self.levels["gzip"], mtime=0)
+        if key is not None:
+            self.cache.set(key, compressed, len(compressed))
+        return compressed
+
+
+class _CompressionResponder:
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send
+    ):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._mode: Optional[str] = None
+        self._compressor: Optional[_StreamCompressor] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk decides the mode.
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+        if self._mode is None:
+            await self._send_first(message)
+        elif self._mode == "stream":
+            body = self._compressor.compress(message.get("body", b""))
+            if not message.get("more_body", False):
+                body += self._compressor.finish()
+            await self._send(
+                {
+                    "type": "http.response.body",
+                    "body": body,
+                    "more_body": message.get("more_body", False),
+                }
+            )
+        else:
+            await self._send(message)
+
+    async def _send_first(self, message: Message) -> None:
+        start = self._start
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if (
+            start["status"] in UNCOMPRESSED_STATUSES
+            or "content-encoding" in headers
+            or not _is_compressible(headers.get("content-type", ""))
+        ):
+            self._mode = "passthrough"
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None or (
+            not more_body and len(body) < self.middleware.minimum_size
+        ):
+            self._mode = "passthrough"
+            await self._send(start)
+            await self._send(message)
+            return
+
+        etag = headers.get("etag")
+        if etag:
+            headers["ETag"] = _weaken_etag(etag)
+        headers["Content-Encoding"] = self.encoding
+        if not more_body:
+            self._mode = "whole"
+            compressed = self.middleware.compress_body(body, self.encoding, etag)
+            headers["Content-Length"] = str(len(compressed))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        self._mode = "stream"
+        if "content-length" in headers:
+            del headers["content-length"]
+        self._compressor = _StreamCompressor(
+            self.encoding, self.middleware.levels[self.encoding]
+        )
+        await self._send(start)
+        await self._send(
+            {
+                "type": "http.response.body",
+                "body": self._compressor.compress(body),
+                "more_body": True,
+            }
+        )
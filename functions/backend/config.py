@@ -34,6 +34,87 @@ class Settings(BaseSettings):
         default=None, env="AWS_SECRET_ACCESS_KEY"
     )
 
+    # Read-through cache for storage objects (doc index + section chunks)
+    storage_cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024, env="STORAGE_CACHE_MAX_BYTES"
+    )
+    storage_cache_max_entry_bytes: int = Field(
+        default=16 * 1024 * 1024, env="STORAGE_CACHE_MAX_ENTRY_BYTES"
+    )
+    storage_cache_ttl_seconds: float = Field(
+        default=600.0, env="STORAGE_CACHE_TTL_SECONDS"
+    )
+    storage_cache_negative_ttl_seconds: float = Field(
+        default=60.0, env="STORAGE_CACHE_NEGATIVE_TTL_SECONDS"
+    )
+
+    # Presigned URL reuse (seconds of validity a reused URL must have left)
+    signed_url_cache_max_entries: int = Field(
+        default=10000, env="SIGNED_URL_CACHE_MAX_ENTRIES"
+    )
+    signed_url_safety_margin_seconds: int = Field(
+        default=300, env="SIGNED_URL_SAFETY_MARGIN_SECONDS"
+    )
+
+    # Cache-Control sent with ETag'd document responses (CDN friendly)
+    doc_cache_control: str = Field(
+        default="public, max-age=60, stale-while-revalidate=600",
+        env="DOC_CACHE_CONTROL",
+    )
+
+    # Largest PDF accepted by /request_local_pdf_import
+    local_pdf_max_bytes: int = Field(
+        default=100 * 1024 * 1024, env="LOCAL_PDF_MAX_BYTES"
+    )
+
+    # Parsed LumiDocs + prompt context reused across questions on one paper
+    parsed_doc_cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024, env="PARSED_DOC_CACHE_MAX_BYTES"
+    )
+
+    # Generated answers reused for repeated questions (Redis when REDIS_URL
+    # is set, otherwise in-process; TTL of 0 disables the cache)
+    answer_cache_ttl_seconds: float = Field(
+        default=7 * 24 * 3600.0, env="ANSWER_CACHE_TTL_SECONDS"
+    )
+    answer_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024, env="ANSWER_CACHE_MAX_BYTES"
+    )
+    answer_cache_redis_prefix: str = Field(
+        default="lumi:answers:", env="ANSWER_CACHE_REDIS_PREFIX"
+    )
+
+    # Coalescing of identical concurrent work. Answer generation can also be
+    # coalesced across replicas with a Redis lock (needs REDIS_URL).
+    singleflight_use_redis: bool = Field(
+        default=False, env="SINGLEFLIGHT_USE_REDIS"
+    )
+    singleflight_lock_timeout_seconds: float = Field(
+        default=120.0, env="SINGLEFLIGHT_LOCK_TIMEOUT_SECONDS"
+    )
+    singleflight_lock_wait_seconds: float = Field(
+        default=60.0, env="SINGLEFLIGHT_LOCK_WAIT_SECONDS"
+    )
+
+    # Per-route metrics at /metrics, and a Server-Timing header with the
+    # db/storage/llm breakdown of each response
+    metrics_enabled: bool = Field(default=True, env="METRICS_ENABLED")
+    server_timing_header: bool = Field(
+        default=True, env="SERVER_TIMING_HEADER"
+    )
+
+    # Response compression (brotli preferred when installed, else gzip)
+    compression_minimum_size: int = Field(
+        default=1024, env="COMPRESSION_MINIMUM_SIZE"
+    )
+    compression_gzip_level: int = Field(default=6, env="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_level: int = Field(
+        default=5, env="COMPRESSION_BROTLI_LEVEL"
+    )
+    compression_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024, env="COMPRESSION_CACHE_MAX_BYTES"
+    )
+
     # LLM / Gemini
     gemini_api_key: Optional[str] = Field(default=None, env="GEMINI_API_KEY")
 
@@ -56,6 +137,16 @@ class Settings(BaseSettings):
         ),
         env="ARXIV_SANITY_QUERY",
     )
+    # Serve arxiv-sanity browse/search from an in-memory snapshot of the DB
+    # (holds every paper in memory; rebuilt in the background after ingest).
+    arxiv_sanity_snapshot: bool = Field(
+        default=False, env="ARXIV_SANITY_SNAPSHOT"
+    )
+    # Newest papers whose titles the /arxiv-sanity/suggest index holds
+    # (roughly 100MB per million papers).
+    arxiv_sanity_suggest_max_papers: int = Field(
+        default=1_000_000, env="ARXIV_SANITY_SUGGEST_MAX_PAPERS"
+    )
 
 
 @lru_cache(maxsize=1)
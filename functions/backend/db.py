@@ -9,9 +9,20 @@ import uuid
 from dataclasses import dataclass, field
 from typing import Dict, Optional, Protocol
 
-from sqlalchemy import JSON, Column, Float, String, create_engine, select
+from sqlalchemy import (
+    JSON,
+    Column,
+    Float,
+    String,
+    Text,
+    cast,
+    create_engine,
+    func,
+    select,
+)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
+from backend.responses import dumps_json
 from shared.types import LoadingStatus
 
 
@@ -67,9 +78,24 @@ class DbClient(Protocol):
     ) -> Optional[tuple[dict, dict]]:
         ...
 
+    def get_lumi_doc_raw(
+        self, arxiv_id: str, version: str, include_doc: bool = True
+    ) -> Optional[tuple[Optional[bytes], bytes]]:
+        """Serialized (lumi_doc, summaries) JSON; lumi_doc is None if excluded."""
+        ...
+
+    def get_lumi_doc_updated_at(
+        self, arxiv_id: str, version: str
+    ) -> Optional[float]:
+        ...
+
     def list_docs(self, limit: int = 100) -> list[tuple[str, str, dict]]:
         ...
 
+    def list_doc_ids(self, limit: int = 1000) -> list[str]:
+        """arXiv ids of imported docs (any version), most recently saved first."""
+        ...
+
     def requeue_stale_locks(self, lock_timeout_seconds: float = 600) -> int:
         ...
 
@@ -123,6 +149,7 @@ class InMemoryDbClient:
         self.metadata: Dict[str, dict] = {}
         self.feedback: Dict[str, FeedbackRecord] = {}
         self.docs: Dict[tuple[str, str], tuple[dict, dict]] = {}
+        self.doc_updated_at: Dict[tuple[str, str], float] = {}
         self.locked: set[str] = set()
 
     def create_import_job(
@@ -160,6 +187,7 @@ class InMemoryDbClient:
         self.metadata.clear()
         self.feedback.clear()
         self.docs.clear()
+        self.doc_updated_at.clear()
 
     def fetch_next_waiting_job(self) -> Optional[JobRecord]:
         for job in self.jobs.values():
@@ -205,12 +233,30 @@ class InMemoryDbClient:
         self, arxiv_id: str, version: str, doc_json: dict, summaries_json: dict
     ) -> None:
         self.docs[(arxiv_id, version)] = (doc_json, summaries_json)
+        self.doc_updated_at[(arxiv_id, version)] = time.time()
 
     def get_lumi_doc(
         self, arxiv_id: str, version: str
     ) -> Optional[tuple[dict, dict]]:
         return self.docs.get((arxiv_id, version))
 
+    def get_lumi_doc_raw(
+        self, arxiv_id: str, version: str, include_doc: bool = True
+    ) -> Optional[tuple[Optional[bytes], bytes]]:
+        doc_tuple = self.docs.get((arxiv_id, version))
+        if not doc_tuple:
+            return None
+        doc_json, summaries_json = doc_tuple
+        return (
+            dumps_json(doc_json) if include_doc else None,
+            dumps_json(summaries_json),
+        )
+
+    def get_lumi_doc_updated_at(
+        self, arxiv_id: str, version: str
+    ) -> Optional[float]:
+        return self.doc_updated_at.get((arxiv_id, version))
+
     def list_docs(self, limit: int = 100) -> list[tuple[str, str, dict]]:
         items: list[tuple[str, str, dict]] = []
         for (arxiv_id, version), (doc_json, summaries_json) in self.docs.items():
@@ -220,6 +266,12 @@ class InMemoryDbClient:
                 break
         return items
 
+    def list_doc_ids(self, limit: int = 1000) -> list[str]:
+        newest: Dict[str, float] = {}
+        for (arxiv_id, _), updated_at in self.doc_updated_at.items():
+            newest[arxiv_id] = max(updated_at, newest.get(arxiv_id, 0.0))
+        return sorted(newest, key=newest.__getitem__, reverse=True)[:limit]
+
     def requeue_stale_locks(self, lock_timeout_seconds: float = 600) -> int:
         now = time.time()
         requeued = 0
@@ -455,19 +507,64 @@ class PostgresDbClient:
                 return None
             return row.lumi_doc, row.summaries
 
-    def list_docs(self, limit: int = 100) -> list[tuple[str, str, dict]]:
+    def get_lumi_doc_raw(
+        self, arxiv_id: str, version: str, include_doc: bool = True
+    ) -> Optional[tuple[Optional[bytes], bytes]]:
+        # Read the JSON columns as text so the driver never decodes them.
+        columns = [cast(PaperVersionRow.summaries, Text)]
+        if include_doc:
+            columns.append(cast(PaperVersionRow.lumi_doc, Text))
         with self.Session() as session:
-            rows = (
-                session.query(PaperVersionRow)
-                .order_by(PaperVersionRow.updated_at.desc())
-                .limit(limit)
-                .all()
+            stmt = select(*columns).where(
+                PaperVersionRow.arxiv_id == arxiv_id,
+                PaperVersionRow.version == version,
+            )
+            row = session.execute(stmt).first()
+            if row is None:
+                return None
+            doc_text = row[1] if include_doc else None
+            return (
+                doc_text.encode("utf-8") if doc_text is not None else None,
+                row[0].encode("utf-8"),
+            )
+
+    def get_lumi_doc_updated_at(
+        self, arxiv_id: str, version: str
+    ) -> Optional[float]:
+        # Only the timestamp column, so conditional requests skip the JSON.
+        with self.Session() as session:
+            stmt = select(PaperVersionRow.updated_at).where(
+                PaperVersionRow.arxiv_id == arxiv_id,
+                PaperVersionRow.version == version,
             )
-            results: list[tuple[str, str, dict]] = []
-            for row in rows:
-                meta = row.lumi_doc.get("metadata", {}) if row.lumi_doc else {}
-                results.append((row.arxiv_id, row.version, meta))
-            return results
+            return session.execute(stmt).scalar_one_or_none()
+
+    def list_docs(self, limit: int = 100) -> list[tuple[str, str, dict]]:
+        # Extract metadata in SQL so whole documents never leave the database.
+        stmt = (
+            select(
+                PaperVersionRow.arxiv_id,
+                PaperVersionRow.version,
+                PaperVersionRow.lumi_doc["metadata"],
+            )
+            .order_by(PaperVersionRow.updated_at.desc())
+            .limit(limit)
+        )
+        with self.Session() as session:
+            return [
+                (arxiv_id, version, meta or {})
+                for arxiv_id, version, meta in session.execute(stmt)
+            ]
+
+    def list_doc_ids(self, limit: int = 1000) -> list[str]:
+        stmt = (
+            select(PaperVersionRow.arxiv_id)
+            .group_by(PaperVersionRow.arxiv_id)
+            .order_by(func.max(PaperVersionRow.updated_at).desc())
+            .limit(limit)
+        )
+        with self.Session() as session:
+            return list(session.execute(stmt).scalars())
 
 
 Base = declarative_base()
@@ -5,15 +5,34 @@ Dependency wiring for the FastAPI app.
 from __future__ import annotations
 
 from backend.config import get_settings
+from backend.answer_cache import (
+    AnswerCache,
+    InMemoryAnswerStore,
+    RedisAnswerStore,
+)
 from backend.arxiv_sanity import ArxivSanityStore
 from backend.db import DbClient, InMemoryDbClient, PostgresDbClient
+from backend.doc_cache import ParsedDocCache
+from backend.metrics import get_metrics_registry, instrument
 from backend.queue import InMemoryJobQueue, JobQueue, RedisJobQueue
-from backend.storage import CosStorageClient, InMemoryStorageClient, StorageClient
+from backend.singleflight import SingleFlight
+from backend.storage import (
+    CachedStorageClient,
+    CosStorageClient,
+    InMemoryStorageClient,
+    SignedUrlCache,
+    StorageClient,
+)
 
 _db_client: DbClient | None = None
 _storage_client: StorageClient | None = None
+_uncached_storage_client: StorageClient | None = None
 _queue_client: JobQueue | None = None
 _arxiv_sanity_store: ArxivSanityStore | None = None
+_signed_url_cache: SignedUrlCache | None = None
+_parsed_doc_cache: ParsedDocCache | None = None
+_answer_cache: AnswerCache | None = None
+_singleflight: SingleFlight | None = None
 
 
 def get_db_client() -> DbClient:
@@ -33,26 +52,125 @@ def get_db_client() -> DbClient:
         except NotImplementedError:
             # Until PostgresDbClient is implemented, fall back to in-memory.
             _db_client = InMemoryDbClient()
+    instrument(_db_client, "db", DbClient)
     return _db_client
 
 
 def get_storage_client() -> StorageClient:
+    """Storage for the API's read paths, behind the read cache if enabled."""
     global _storage_client
     if _storage_client:
         return _storage_client
 
+    settings = get_settings()
+    inner = get_uncached_storage_client()
+    if isinstance(inner, CosStorageClient) and settings.storage_cache_max_bytes > 0:
+        _storage_client = CachedStorageClient(
+            inner,
+            max_bytes=settings.storage_cache_max_bytes,
+            ttl_seconds=settings.storage_cache_ttl_seconds,
+            negative_ttl_seconds=settings.storage_cache_negative_ttl_seconds,
+            max_entry_bytes=settings.storage_cache_max_entry_bytes,
+        )
+        get_metrics_registry().register_stats(
+            "storage_cache", _storage_client.stats
+        )
+        instrument(_storage_client, "storage", StorageClient)
+    else:
+        _storage_client = inner
+    return _storage_client
+
+
+def get_uncached_storage_client() -> StorageClient:
+    """
+    Storage without the read cache, for the worker and scripts. They read
+    each object (an uploaded source.pdf, a doc being backfilled) about once,
+    so caching would only hold memory.
+    """
+    global _uncached_storage_client
+    if _uncached_storage_client:
+        return _uncached_storage_client
+
     settings = get_settings()
     if settings.use_in_memory_backends or not settings.cos_bucket:
-        _storage_client = InMemoryStorageClient()
+        _uncached_storage_client = InMemoryStorageClient()
     else:
-        _storage_client = CosStorageClient(
+        _uncached_storage_client = CosStorageClient(
             bucket=settings.cos_bucket,
             region=settings.cos_region or "",
             endpoint=settings.cos_endpoint or "",
             access_key_id=settings.aws_access_key_id or "",
             secret_access_key=settings.aws_secret_access_key or "",
         )
-    return _storage_client
+    instrument(_uncached_storage_client, "storage", StorageClient)
+    return _uncached_storage_client
+
+
+def get_signed_url_cache() -> SignedUrlCache:
+    global _signed_url_cache
+    if _signed_url_cache:
+        return _signed_url_cache
+    settings = get_settings()
+    _signed_url_cache = SignedUrlCache(
+        max_entries=settings.signed_url_cache_max_entries,
+        safety_margin_seconds=settings.signed_url_safety_margin_seconds,
+    )
+    get_metrics_registry().register_stats(
+        "signed_url_cache", _signed_url_cache.stats
+    )
+    return _signed_url_cache
+
+
+def get_parsed_doc_cache() -> ParsedDocCache:
+    global _parsed_doc_cache
+    if _parsed_doc_cache:
+        return _parsed_doc_cache
+    _parsed_doc_cache = ParsedDocCache(get_settings().parsed_doc_cache_max_bytes)
+    get_metrics_registry().register_stats(
+        "parsed_doc_cache", _parsed_doc_cache.stats
+    )
+    return _parsed_doc_cache
+
+
+def get_answer_cache() -> AnswerCache | None:
+    """
+    Return the answer cache, or None when disabled (TTL of 0).
+    """
+    global _answer_cache
+    if _answer_cache:
+        return _answer_cache
+
+    settings = get_settings()
+    if settings.answer_cache_ttl_seconds <= 0:
+        return None
+    if settings.redis_url and not settings.use_in_memory_backends:
+        store = RedisAnswerStore(
+            settings.redis_url, key_prefix=settings.answer_cache_redis_prefix
+        )
+    else:
+        store = InMemoryAnswerStore(
+            settings.answer_cache_max_bytes, settings.answer_cache_ttl_seconds
+        )
+    _answer_cache = AnswerCache(store, settings.answer_cache_ttl_seconds)
+    get_metrics_registry().register_stats("answer_cache", _answer_cache.stats)
+    return _answer_cache
+
+
+def get_singleflight() -> SingleFlight:
+    global _singleflight
+    if _singleflight:
+        return _singleflight
+    settings = get_settings()
+    redis_url = None
+    if settings.singleflight_use_redis and not settings.use_in_memory_backends:
+        redis_url = settings.redis_url
+    _singleflight = SingleFlight(
+        redis_url,
+        lock_timeout_seconds=settings.singleflight_lock_timeout_seconds,
+        lock_wait_seconds=settings.singleflight_lock_wait_seconds,
+    )
+    get_metrics_registry().register_stats("singleflight", _singleflight.stats)
+    return _singleflight
 
 
 def get_queue_client() -> JobQueue:
@@ -79,5 +197,16 @@ def get_arxiv_sanity_store() -> ArxivSanityStore:
     if _arxiv_sanity_store:
         return _arxiv_sanity_store
     settings = get_settings()
-    _arxiv_sanity_store = ArxivSanityStore(settings.arxiv_sanity_data_dir)
+    _arxiv_sanity_store = ArxivSanityStore(
+        settings.arxiv_sanity_data_dir,
+        snapshot=settings.arxiv_sanity_snapshot,
+        suggest_max_papers=settings.arxiv_sanity_suggest_max_papers,
+    )
+    get_metrics_registry().register_stats(
+        "arxiv_suggest", _arxiv_sanity_store.suggest_stats
+    )
+    if settings.arxiv_sanity_snapshot:
+        get_metrics_registry().register_stats(
+            "arxiv_snapshot", _arxiv_sanity_store.snapshot_stats
+        )
     return _arxiv_sanity_store
@@ -0,0 +1,79 @@
+"""
+In-process cache of parsed LumiDocs and their prompt context.
+
+Answering a question needs the whole document as a `LumiDoc` plus the
+formatted span list used in every prompt. Both are derived from the stored
+JSON, so they are cached per (arxiv_id, version) and tagged with the row's
+`updated_at`; a `save_lumi_doc` from any process bumps that timestamp and
+the stale entry is rebuilt on the next request.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+from answers.answers import build_spans_string
+from backend.cache import MISSING, LruCache
+from backend.db import DbClient
+from backend.singleflight import SingleFlight
+from shared.lumi_doc import LumiDoc
+from shared.lumi_doc_convert import doc_from_dict
+
+# Parsed dataclass trees are several times larger than their JSON text.
+PARSED_SIZE_FACTOR = 4
+
+
+@dataclass(frozen=True)
+class ParsedDoc:
+    doc: LumiDoc
+    spans_string: str
+    updated_at: float
+
+
+class ParsedDocCache:
+    def __init__(self, max_bytes: int):
+        self._cache = LruCache(max_bytes)
+        # Questions about a newly popular paper arrive together; parse once.
+        self._flight = SingleFlight()
+
+    def get(self, db: DbClient, arxiv_id: str, version: str) -> Optional[ParsedDoc]:
+        """Return the parsed doc, loading it from the DB if stale or absent."""
+        updated_at = db.get_lumi_doc_updated_at(arxiv_id, version)
+        if updated_at is None:
+            return None
+        key = (arxiv_id, version)
+        cached = self._cache.get(key)
+        if cached is not MISSING and cached.updated_at == updated_at:
+            return cached
+        parsed, _ = self._flight.do(
+            (arxiv_id, version, updated_at),
+            lambda: self._load(db, arxiv_id, version, updated_at),
+        )
+        return parsed
+
+    def _load(
+        self, db: DbClient, arxiv_id: str, version: str, updated_at: float
+    ) -> Optional[ParsedDoc]:
+        key = (arxiv_id, version)
+        # The JSON text sizes the entry without serializing the doc again.
+        raw = db.get_lumi_doc_raw(arxiv_id, version)
+        if not raw:
+            self._cache.pop(key)
+            return None
+        doc_raw, _ = raw
+        doc = doc_from_dict(json.loads(doc_raw))
+        parsed = ParsedDoc(
+            doc=doc, spans_string=build_spans_string(doc), updated_at=updated_at
+        )
+        size = len(doc_raw) * PARSED_SIZE_FACTOR + len(parsed.spans_string)
+        self._cache.set(key, parsed, size)
+        return parsed
+
+    def stats(self) -> dict:
+        return {
+            **self._cache.stats.as_dict(),
+            "entries": len(self._cache),
+            "bytes": self._cache.size,
+        }
@@ -1,10 +1,28 @@
 """
 Helpers for chunking LumiDoc payloads by section.
+
+Published docs are stored as:
+  - papers/{id}/v{version}/lumi_doc.json          full doc (compact JSON)
+  - papers/{id}/v{version}/lumi_doc_index.json    doc without section contents,
+                                                  plus every figure path
+  - papers/{id}/v{version}/sections/{id}.json     one object per top-level section
+  - papers/{id}/v{version}/section_offsets.json   byte range of every section
+                                                  (including subsections) in
+                                                  lumi_doc.json
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+import io
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.responses import dumps_json
+
+if TYPE_CHECKING:
+    from backend.storage import StorageClient
+
+SECTION_LIST_KEYS = ("sections", "subSections")
 
 
 def _strip_section_contents(section: Dict[str, Any]) -> Dict[str, Any]:
@@ -27,6 +45,8 @@ def build_doc_index(doc_json: Dict[str, Any]) -> Dict[str, Any]:
     doc_index = dict(doc_json)
     doc_index["sections"] = []
     doc_index["sectionOutline"] = build_section_outline(sections)
+    # Lets figures be signed from the index without loading the full doc.
+    doc_index["imagePaths"] = collect_image_paths(doc_json)
     return doc_index
 
 
@@ -45,3 +65,134 @@ def find_section_by_id(
         if match:
             return match
     return None
+
+
+def collect_image_paths(doc_json: Dict[str, Any]) -> List[str]:
+    """Return every image storage path referenced by a LumiDoc payload."""
+    paths: List[str] = []
+    seen: set[str] = set()
+
+    def _add(path: Any) -> None:
+        if isinstance(path, str) and path and path not in seen:
+            seen.add(path)
+            paths.append(path)
+
+    def _walk(value: Any) -> None:
+        if isinstance(value, dict):
+            _add(value.get("storagePath"))
+            _add(value.get("imageStoragePath"))
+            for child in value.values():
+                if isinstance(child, (dict, list)):
+                    _walk(child)
+        elif isinstance(value, list):
+            for child in value:
+                _walk(child)
+
+    _walk(doc_json)
+    return paths
+
+
+def doc_base_path(arxiv_id: str, version: str) -> str:
+    return f"papers/{arxiv_id}/v{version}"
+
+
+def section_chunk_path(arxiv_id: str, version: str, section_id: str) -> str:
+    return f"{doc_base_path(arxiv_id, version)}/sections/{section_id}.json"
+
+
+def serialize_doc_with_section_offsets(
+    doc_json: Dict[str, Any],
+) -> Tuple[bytes, Dict[str, List[int]]]:
+    """
+    Serialize a doc to compact JSON and record the [start, end) byte range
+    of every section and subsection, keyed by section id.
+    """
+    out = bytearray()
+    offsets: Dict[str, List[int]] = {}
+    _encode_object(doc_json, out, offsets)
+    return bytes(out), offsets
+
+
+def _encode_object(
+    obj: Dict[str, Any], out: bytearray, offsets: Dict[str, List[int]]
+) -> None:
+    out += b"{"
+    for idx, (key, value) in enumerate(obj.items()):
+        if idx:
+            out += b","
+        out += dumps_json(key) + b":"
+        if key not in SECTION_LIST_KEYS or not isinstance(value, list):
+            out += dumps_json(value)
+            continue
+        out += b"["
+        for section_idx, section in enumerate(value):
+            if section_idx:
+                out += b","
+            if not isinstance(section, dict):
+                out += dumps_json(section)
+                continue
+            start = len(out)
+            _encode_object(section, out, offsets)
+            section_id = section.get("id")
+            if section_id and section_id not in offsets:
+                offsets[section_id] = [start, len(out)]
+        out += b"]"
+    out += b"}"
+
+
+def publish_doc_chunks(
+    storage: "StorageClient", arxiv_id: str, version: str, doc_json: Dict[str, Any]
+) -> int:
+    """
+    Upload the full doc, its index, per-section chunks and the section
+    offset index. Returns the number of section chunks written.
+    """
+    base_path = doc_base_path(arxiv_id, version)
+    doc_bytes, offsets = serialize_doc_with_section_offsets(doc_json)
+    storage.upload_fileobj(io.BytesIO(doc_bytes), f"{base_path}/lumi_doc.json")
+    # Written after the artifact so offsets never point into an older doc.
+    storage.upload_json(
+        f"{base_path}/section_offsets.json",
+        {"artifact": "lumi_doc.json", "sections": offsets},
+    )
+    storage.upload_json(f"{base_path}/lumi_doc_index.json", build_doc_index(doc_json))
+    section_count = 0
+    for section in iter_section_chunks(doc_json):
+        section_id = section.get("id")
+        if not section_id:
+            continue
+        storage.upload_json(section_chunk_path(arxiv_id, version, section_id), section)
+        section_count += 1
+    return section_count
+
+
+def read_section_from_artifact(
+    storage: "StorageClient",
+    arxiv_id: str,
+    version: str,
+    section_id: str,
+    doc_version: object = None,
+) -> Optional[bytes]:
+    """
+    Read one section from lumi_doc.json with a ranged GET, using the offset
+    index. Returns None if either object is missing or the range is stale.
+    `doc_version` is passed to `get_bytes` for the offset index.
+    """
+    base_path = doc_base_path(arxiv_id, version)
+    try:
+        offsets = json.loads(
+            storage.get_bytes(
+                f"{base_path}/section_offsets.json", version=doc_version
+            )
+        )
+        start, end = offsets["sections"][section_id]
+        section_raw = storage.get_range(f"{base_path}/lumi_doc.json", start, end)
+    except (FileNotFoundError, KeyError, ValueError, TypeError):
+        return None
+    try:
+        # Only this one section is decoded, to confirm the range is current.
+        if json.loads(section_raw).get("id") != section_id:
+            return None
+    except (ValueError, AttributeError):
+        return None
+    return section_raw
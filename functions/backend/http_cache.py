@@ -0,0 +1,65 @@
+"""
+Conditional-request helpers (ETag / Last-Modified) for document routes.
+
+Documents only change when the worker calls `save_lumi_doc`, which bumps
+`paper_versions.updated_at`, so validators are derived from that timestamp
+and checked before the document body is loaded.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: object) -> str:
+    """Return a strong ETag for the given version components."""
+    raw = "\x1f".join(repr(part) for part in parts)
+    return '"%s"' % hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _etag_matches(header_value: str, etag: str) -> bool:
+    for candidate in header_value.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses the weak comparison function.
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[float]
+) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # When both are sent, If-None-Match takes precedence.
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution.
+        return int(last_modified) <= since
+    return False
+
+
+def cache_headers(
+    etag: str, last_modified: Optional[float], cache_control: str
+) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return headers
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
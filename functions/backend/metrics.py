@@ -0,0 +1,318 @@
+"""
+Per-route latency, payload-size and sub-timing metrics.
+
+`MetricsMiddleware` records, for each matched route template: a latency
+histogram, a response-size histogram (bytes on the wire, after
+compression), and request counts by status. Time spent in the DB, storage
+and the LLM during a request is collected through `timed(kind)`. It is
+exported as per-route histograms and echoed to the client in a
+`Server-Timing` header.
+
+Everything is held in process memory and rendered in the Prometheus text
+format by `/metrics`, so no metrics backend is needed to use it.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+SIZE_BUCKETS = tuple(float(4**exp * 256) for exp in range(9))  # 256B .. 16MB
+SUBTIMING_KINDS = ("db", "storage", "llm")
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label tuple."""
+
+    def __init__(
+        self, name: str, help_text: str, labels: tuple[str, ...], buckets
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values: tuple, value: float) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # Per-bucket counts, then sum and count.
+                series = [0] * len(self.buckets) + [0.0, 0]
+                self._series[label_values] = series
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            items = sorted(self._series.items())
+            items = [(labels, list(series)) for labels, series in items]
+        for label_values, series in items:
+            labels = _format_labels(self.labels, label_values)
+            for bound, count in zip(self.buckets, series):
+                le = _format_labels(
+                    self.labels + ("le",), label_values + (_format_value(bound),)
+                )
+                lines.append(f"{self.name}_bucket{le} {count}")
+            inf = _format_labels(self.labels + ("le",), label_values + ("+Inf",))
+            lines.append(f"{self.name}_bucket{inf} {series[-1]}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values: tuple, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.request_seconds = Histogram(
+            "lumi_http_request_duration_seconds",
+            "Time from request start to the last response byte.",
+            ("method", "route"),
+            LATENCY_BUCKETS,
+        )
+        self.response_bytes = Histogram(
+            "lumi_http_response_size_bytes",
+            "Response body size as sent.",
+            ("method", "route"),
+            SIZE_BUCKETS,
+        )
+        self.requests = Counter(
+            "lumi_http_requests_total",
+            "Requests by route and status code.",
+            ("method", "route", "status"),
+        )
+        self.subtiming_seconds = Histogram(
+            "lumi_http_request_subtiming_seconds",
+            "Time per request spent in a backend dependency (db, storage, llm).",
+            ("route", "kind"),
+            LATENCY_BUCKETS,
+        )
+        self._gauge_sources: dict[str, Any] = {}
+
+    def register_stats(self, name: str, source) -> None:
+        """Export a component's stats() dict as lumi_<name>_<key> gauges."""
+        self._gauge_sources[name] = source
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in (
+            self.requests,
+            self.request_seconds,
+            self.response_bytes,
+            self.subtiming_seconds,
+        ):
+            lines.extend(metric.render())
+        for name, source in sorted(self._gauge_sources.items()):
+            try:
+                stats = source()
+            except Exception:
+                continue
+            for key, value in sorted(stats.items()):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric = f"lumi_{name}_{key}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _registry
+
+
+class RequestTimings:
+    """Seconds spent per dependency kind during one request."""
+
+    def __init__(self):
+        self._totals: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, kind: str, seconds: float) -> None:
+        with self._lock:
+            self._totals[kind] = self._totals.get(kind, 0.0) + seconds
+
+    def totals(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._totals)
+
+
+_request_timings: contextvars.ContextVar[Optional[RequestTimings]] = (
+    contextvars.ContextVar("lumi_request_timings", default=None)
+)
+_active_kinds: contextvars.ContextVar[frozenset] = contextvars.ContextVar(
+    "lumi_active_timing_kinds", default=frozenset()
+)
+
+
+@contextmanager
+def timed(kind: str) -> Iterator[None]:
+    """
+    Attribute the enclosed time to `kind` for the current request.
+
+    Nested blocks of the same kind (a DB method calling another) count once.
+    """
+    active = _active_kinds.get()
+    timings = _request_timings.get()
+    if kind in active or timings is None:
+        yield
+        return
+    token = _active_kinds.set(active | {kind})
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(kind, time.perf_counter() - start)
+        _active_kinds.reset(token)
+
+
+def instrument(client: Any, kind: str, interface: type) -> Any:
+    """
+    Time every method of `interface` called on `client` as `kind`.
+
+    Methods are wrapped on the instance, so the client keeps its type (and
+    its state) and callers do not need to know it is instrumented.
+    """
+    for name, member in vars(interface).items():
+        if name.startswith("_") or not callable(member):
+            continue
+        method = getattr(client, name, None)
+        if method is not None:
+            setattr(client, name, _timed_method(method, kind))
+    return client
+
+
+def _timed_method(method, kind: str):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with timed(kind):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+def format_server_timing(total_seconds: float, timings: dict[str, float]) -> str:
+    parts = [
+        f"{kind};dur={timings[kind] * 1000:.1f}"
+        for kind in SUBTIMING_KINDS
+        if kind in timings
+    ]
+    parts.append(f"app;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        registry: Optional[MetricsRegistry] = None,
+        server_timing: bool = True,
+    ):
+        self.app = app
+        self.registry = registry or get_metrics_registry()
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    # Streamed bodies only report the time to first byte.
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        format_server_timing(
+                            time.perf_counter() - start, timings.totals()
+                        ),
+                    )
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope.get("method", "")
+            self.registry.requests.inc((method, route_path, str(status)))
+            self.registry.request_seconds.observe((method, route_path), elapsed)
+            self.registry.response_bytes.observe((method, route_path), size)
+            for kind, seconds in timings.totals().items():
+                self.registry.subtiming_seconds.observe((route_path, kind), seconds)
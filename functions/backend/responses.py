@@ -0,0 +1,66 @@
+"""
+Pass-through JSON responses for large document payloads.
+
+Document routes already hold JSON text (the stored index/section objects or
+the raw Postgres column), so they splice it into the response envelope
+instead of decoding it, validating it with pydantic and re-encoding it.
+Streaming answers use the same encoder for their server-sent events.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.
+    orjson = None
+
+
+def dumps_json(value: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(
+        value, default=str, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def json_object_from_parts(parts: Iterable[tuple[str, Any]]) -> bytes:
+    """
+    Build a JSON object from (key, value) pairs.
+
+    `bytes` values are treated as already-serialized JSON and spliced in
+    verbatim; anything else is serialized with `dumps_json`. Callers must
+    only pass bytes that came from a JSON encoder or trusted storage.
+    """
+    chunks = []
+    for key, value in parts:
+        encoded = value if isinstance(value, (bytes, bytearray)) else dumps_json(value)
+        chunks.append(dumps_json(key) + b":" + bytes(encoded))
+    return b"{" + b",".join(chunks) + b"}"
+
+
+def json_array_from_parts(items: Iterable[bytes]) -> bytes:
+    """Join already-serialized JSON values into a JSON array."""
+    return b"[" + b",".join(items) + b"]"
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one server-sent event with a JSON data line."""
+    # JSON never contains raw newlines, so one data line is always enough.
+    return b"event: %s\ndata: %s\n\n" % (event.encode("utf-8"), dumps_json(data))
+
+
+class RawJsonResponse(Response):
+    """Response whose content is already-encoded JSON bytes."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps_json(content)
@@ -5,27 +5,53 @@ HTTP routes for the refactored backend API.
 from __future__ import annotations
 
 import time
+import contextvars
+import io
 import os
-import tempfile
 import re
-import io
 import json
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 from dataclasses import asdict
 from datetime import datetime, timezone
+from typing import BinaryIO
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 
+from backend.answer_cache import AnswerCache, answer_cache_key, refresh_answer
 from backend.dependencies import (
+    get_answer_cache,
     get_arxiv_sanity_store,
     get_db_client,
+    get_parsed_doc_cache,
     get_queue_client,
+    get_signed_url_cache,
+    get_singleflight,
     get_storage_client,
 )
-from backend.arxiv_sanity import DEFAULT_PAGE_SIZE
+from backend.arxiv_sanity import DEFAULT_PAGE_SIZE, recent_cursor
+from backend.arxiv_snippets import highlight_paper, query_terms
 from backend.db import DbClient, FeedbackRecord
+from backend.doc_cache import ParsedDocCache
+from backend.metrics import timed
 from backend.queue import JobQueue
-from backend.schemas import LumiDocResponse, LumiDocSectionResponse
+from backend.singleflight import SingleFlight
+from backend.schemas import (
+    LumiDocResponse,
+    LumiDocSectionResponse,
+    LumiDocSectionsResponse,
+)
 from backend.schemas import (
     AnswerRequest,
     AnswerResponse,
@@ -39,19 +65,40 @@ from backend.schemas import (
     RequestImportPayload,
     RequestImportResponse,
     SignUrlResponse,
+    SignUrlsRequest,
+    SignUrlsResponse,
     ListPapersResponse,
     PaperSummary,
+    ArxivAuthorsResponse,
     ArxivSearchResponse,
+    ArxivSuggestResponse,
 )
 from backend.arxiv_sanity import ArxivSanityStore
-from backend.storage import StorageClient
-from backend.doc_chunks import build_doc_index, find_section_by_id
+from backend.storage import SignedUrlCache, StorageClient
+from backend.doc_chunks import (
+    build_doc_index,
+    collect_image_paths,
+    find_section_by_id,
+    read_section_from_artifact,
+    section_chunk_path,
+)
 from backend.config import get_settings
+from backend.http_cache import cache_headers, is_not_modified, make_etag, not_modified
+from backend.responses import (
+    RawJsonResponse,
+    dumps_json,
+    json_array_from_parts,
+    json_object_from_parts,
+    sse_event,
+)
 from models import api_config
-from answers.answers import generate_lumi_answer
+from answers.answers import (
+    build_lumi_answer,
+    generate_lumi_answer,
+    stream_lumi_answer_markdown,
+)
 from shared.api import LumiAnswerRequest, HighlightSelection, ImageInfo
 from shared.lumi_doc import Position
-from shared.lumi_doc_convert import doc_from_dict
 from shared.json_utils import convert_keys
 from shared.types import LoadingStatus
 
@@ -61,16 +108,20 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MAX_SECTIONS_PER_REQUEST = 50
+SECTION_FETCH_CONCURRENCY = 8
+
 
 def _normalize_title(value: str) -> str:
     return re.sub(r"\s+", " ", value or "").strip().lower()
 
 
-def _extract_pdf_title_for_dedupe(pdf_bytes: bytes, fallback: str) -> str:
+def _extract_pdf_title_for_dedupe(pdf_stream: BinaryIO, fallback: str) -> str:
     try:
         from pdfminer.high_level import extract_text
 
-        first_page = extract_text(io.BytesIO(pdf_bytes), page_numbers=[0]) or ""
+        pdf_stream.seek(0)
+        first_page = extract_text(pdf_stream, page_numbers=[0]) or ""
     except Exception:
         first_page = ""
 
@@ -137,7 +188,7 @@ def request_arxiv_doc_import(
 @router.post(
     "/request_local_pdf_import", response_model=RequestImportResponse, status_code=202
 )
-async def request_local_pdf_import(
+def request_local_pdf_import(
     file: UploadFile = File(...),
     title: str | None = Form(None),
     authors: str | None = Form(None),
@@ -146,12 +197,30 @@ async def request_local_pdf_import(
     queue: JobQueue = Depends(get_queue_client),
     storage: StorageClient = Depends(get_storage_client),
 ):
+    """
+    Plain `def` so FastAPI runs it in the threadpool: title extraction, the
+    dedupe scan and the storage upload all block.
+    """
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="PDF file required")
 
-    pdf_bytes = await file.read()
+    # Starlette has already spooled the upload (to disk past 1 MB); the body
+    # size middleware stopped anything far over the limit while it arrived.
+    # This check is the exact one, on the file alone.
+    pdf_stream = file.file
+    pdf_stream.seek(0, os.SEEK_END)
+    size = pdf_stream.tell()
+    max_bytes = get_settings().local_pdf_max_bytes
+    if size > max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"PDF exceeds the {max_bytes // (1024 * 1024)} MB upload limit",
+        )
+    if size == 0:
+        raise HTTPException(status_code=400, detail="PDF file is empty")
+
     title_candidate = _extract_pdf_title_for_dedupe(
-        pdf_bytes, file.filename or "Uploaded PDF"
+        pdf_stream, file.filename or "Uploaded PDF"
     )
     existing = _find_existing_paper_by_title(db, title_candidate)
     if existing:
@@ -174,10 +243,8 @@ async def request_local_pdf_import(
     job = db.create_import_job(arxiv_id, version)
 
     storage_path = f"papers/{arxiv_id}/v{version}/source.pdf"
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=True) as temp_file:
-        temp_file.write(pdf_bytes)
-        temp_file.flush()
-        storage.upload_file(temp_file.name, storage_path)
+    pdf_stream.seek(0)
+    storage.upload_fileobj(pdf_stream, storage_path)
 
     metadata_payload = {
         "storage_pdf_path": storage_path,
@@ -224,19 +291,161 @@ def get_arxiv_metadata(
 
 @router.post("/get_lumi_response", response_model=AnswerResponse)
 def get_lumi_response(
-    payload: AnswerRequest, db: DbClient = Depends(get_db_client)
+    payload: AnswerRequest,
+    db: DbClient = Depends(get_db_client),
+    parsed_doc_cache: ParsedDocCache = Depends(get_parsed_doc_cache),
+    answer_cache: AnswerCache | None = Depends(get_answer_cache),
+    flight: SingleFlight = Depends(get_singleflight),
+):
+    parsed = parsed_doc_cache.get(db, payload.arxiv_id, payload.version)
+    if not parsed:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    request = _to_lumi_answer_request(payload)
+    cache_key, answer_json = _lookup_cached_answer(
+        answer_cache, payload, parsed.updated_at, request
+    )
+
+    def generate() -> dict:
+        if cache_key is not None and not payload.bypass_cache:
+            # Another replica may have answered while we waited for its lock.
+            cached = answer_cache.peek(cache_key, request)
+            if cached is not None:
+                return cached
+        settings = get_settings()
+        _apply_gemini_api_key(settings.gemini_api_key)
+        with timed("llm"):
+            answer = generate_lumi_answer(
+                parsed.doc,
+                request,
+                settings.gemini_api_key,
+                spans_string=parsed.spans_string,
+            )
+        generated = convert_keys(asdict(answer), "snake_to_camel")
+        if cache_key is not None:
+            answer_cache.set(cache_key, generated)
+        return generated
+
+    if answer_json is None and cache_key is None:
+        answer_json = generate()
+    elif answer_json is None:
+        # Identical questions in flight share one model call.
+        answer_json, shared = flight.do(
+            ("answer", cache_key, payload.bypass_cache), generate, distributed=True
+        )
+        if shared:
+            answer_json = refresh_answer(answer_json, request)
+    return AnswerResponse(
+        arxiv_id=payload.arxiv_id, version=payload.version, answer=answer_json
+    )
+
+
+@router.post("/get_lumi_response_stream")
+def get_lumi_response_stream(
+    payload: AnswerRequest,
+    db: DbClient = Depends(get_db_client),
+    parsed_doc_cache: ParsedDocCache = Depends(get_parsed_doc_cache),
+    answer_cache: AnswerCache | None = Depends(get_answer_cache),
 ):
-    doc_tuple = db.get_lumi_doc(payload.arxiv_id, payload.version)
-    if not doc_tuple:
+    """
+    Server-sent events: `chunk` events carry markdown as Gemini produces it,
+    then a single `answer` event carries the same body as /get_lumi_response
+    (or an `error` event if generation fails). Cached answers are sent as a
+    lone `answer` event.
+    """
+    parsed = parsed_doc_cache.get(db, payload.arxiv_id, payload.version)
+    if not parsed:
         raise HTTPException(status_code=404, detail="Document not found")
-    doc_json, _ = doc_tuple
 
     settings = get_settings()
-    if settings.gemini_api_key:
-        api_config.DEFAULT_API_KEY = settings.gemini_api_key
-        os.environ["GEMINI_API_KEY"] = settings.gemini_api_key
-        os.environ["GOOGLE_API_KEY"] = settings.gemini_api_key
+    _apply_gemini_api_key(settings.gemini_api_key)
+    request = _to_lumi_answer_request(payload)
+    cache_key, cached_answer = _lookup_cached_answer(
+        answer_cache, payload, parsed.updated_at, request
+    )
+
+    def answer_event(answer_json: dict) -> bytes:
+        return sse_event(
+            "answer",
+            {
+                "arxiv_id": payload.arxiv_id,
+                "version": payload.version,
+                "answer": answer_json,
+            },
+        )
+
+    def events():
+        if cached_answer is not None:
+            yield answer_event(cached_answer)
+            return
+        chunks = []
+        try:
+            stream = stream_lumi_answer_markdown(
+                parsed.doc,
+                request,
+                settings.gemini_api_key,
+                spans_string=parsed.spans_string,
+            )
+            while True:
+                # Only time the model; yielding waits on the client.
+                with timed("llm"):
+                    text = next(stream, None)
+                if text is None:
+                    break
+                chunks.append(text)
+                yield sse_event("chunk", {"text": text})
+            answer = build_lumi_answer(request, "".join(chunks))
+        except Exception:
+            logger.exception("Streaming answer failed for %s", payload.arxiv_id)
+            yield sse_event("error", {"detail": "Could not generate an answer"})
+            return
+        answer_json = convert_keys(asdict(answer), "snake_to_camel")
+        if cache_key is not None:
+            answer_cache.set(cache_key, answer_json)
+        yield answer_event(answer_json)
 
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _lookup_cached_answer(
+    answer_cache: AnswerCache | None,
+    payload: AnswerRequest,
+    doc_updated_at: float,
+    request: LumiAnswerRequest,
+) -> tuple[str | None, dict | None]:
+    """
+    Returns (cache_key, cached_answer_json). The key is None when the cache
+    is disabled. A bypassed lookup still returns the key, so the regenerated
+    answer replaces the cached one.
+    """
+    if answer_cache is None:
+        return None, None
+    try:
+        key = answer_cache_key(
+            payload.arxiv_id, payload.version, doc_updated_at, request
+        )
+    except ValueError:
+        # No query or highlight; let the answer path raise its own error.
+        return None, None
+    if payload.bypass_cache:
+        answer_cache.record_bypass()
+        return key, None
+    return key, answer_cache.get(key, request)
+
+
+def _apply_gemini_api_key(api_key: str | None) -> None:
+    if api_key:
+        api_config.DEFAULT_API_KEY = api_key
+        os.environ["GEMINI_API_KEY"] = api_key
+        os.environ["GOOGLE_API_KEY"] = api_key
+
+
+def _to_lumi_answer_request(payload: AnswerRequest) -> LumiAnswerRequest:
     highlighted = []
     for item in payload.highlighted_spans or []:
         position = item.get("position") or {}
@@ -263,18 +472,12 @@ def get_lumi_response(
             caption=payload.image.get("caption"),
         )
 
-    request = LumiAnswerRequest(
+    return LumiAnswerRequest(
         query=payload.query,
         highlight=payload.highlight,
         highlighted_spans=highlighted or None,
         image=image_info,
     )
-    lumi_doc = doc_from_dict(doc_json)
-    answer = generate_lumi_answer(lumi_doc, request, settings.gemini_api_key)
-    answer_json = convert_keys(asdict(answer), "snake_to_camel")
-    return AnswerResponse(
-        arxiv_id=payload.arxiv_id, version=payload.version, answer=answer_json
-    )
 
 
 @router.post("/get_personal_summary", response_model=PersonalSummaryResponse)
@@ -310,12 +513,37 @@ def sign_url(
     op: str = Query("get", pattern="^(get|put)$"),
     expires_in: int = Query(3600, ge=60, le=86400),
     storage: StorageClient = Depends(get_storage_client),
+    signed_urls: SignedUrlCache = Depends(get_signed_url_cache),
 ):
     if op == "get":
-        url = storage.presign_get(path, expires_in=expires_in)
+        url, expires_at = signed_urls.presign_get(
+            storage, path, expires_in=expires_in
+        )
     else:
         url = storage.presign_put(path, expires_in=expires_in)
-    return SignUrlResponse(url=url)
+        expires_at = time.time() + expires_in
+    return SignUrlResponse(url=url, expires_at=expires_at)
+
+
+@router.post("/sign-urls", response_model=SignUrlsResponse)
+def sign_urls(
+    payload: SignUrlsRequest,
+    storage: StorageClient = Depends(get_storage_client),
+    signed_urls: SignedUrlCache = Depends(get_signed_url_cache),
+):
+    urls: dict[str, str] = {}
+    earliest_expiry = time.time() + payload.expires_in
+    for path in payload.paths:
+        if path in urls:
+            continue
+        if payload.op == "get":
+            urls[path], expires_at = signed_urls.presign_get(
+                storage, path, expires_in=payload.expires_in
+            )
+            earliest_expiry = min(earliest_expiry, expires_at)
+        else:
+            urls[path] = storage.presign_put(path, expires_in=payload.expires_in)
+    return SignUrlsResponse(urls=urls, expires_at=earliest_expiry)
 
 
 @router.get("/list-papers", response_model=ListPapersResponse)
@@ -336,22 +564,33 @@ def list_recent_arxiv(
     page: int = Query(1, ge=1),
     page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
     categories: str | None = Query(None),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page (overrides page)"
+    ),
     store: ArxivSanityStore = Depends(get_arxiv_sanity_store),
 ):
-    offset = (page - 1) * page_size
+    offset = 0 if cursor else (page - 1) * page_size
     category_list = (
         [c.strip() for c in categories.split(",") if c.strip()]
         if categories
         else None
     )
-    papers, total = store.list_recent(
-        limit=page_size, offset=offset, categories=category_list
-    )
+    try:
+        papers, total = store.list_recent(
+            limit=page_size, offset=offset, categories=category_list, cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     payload = [
         {"metadata": paper.to_metadata(), "score": None} for paper in papers
     ]
+    next_cursor = recent_cursor(papers[-1]) if len(papers) == page_size else None
     return ArxivSearchResponse(
-        papers=payload, total=total, page=page, page_size=page_size
+        papers=payload,
+        total=total,
+        page=page,
+        page_size=page_size,
+        next_cursor=next_cursor,
     )
 
 
@@ -361,6 +600,9 @@ def search_arxiv(
     page: int = Query(1, ge=1),
     page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
     categories: str | None = Query(None),
+    compact: bool = Query(
+        False, description="Omit full summaries; highlights.snippet remains"
+    ),
     store: ArxivSanityStore = Depends(get_arxiv_sanity_store),
 ):
     offset = (page - 1) * page_size
@@ -372,6 +614,102 @@ def search_arxiv(
     results, total = store.search(
         query, limit=page_size, offset=offset, categories=category_list
     )
+    terms = query_terms(query)
+    payload = [
+        {
+            "metadata": paper.to_metadata(include_summary=not compact),
+            "score": score,
+            "highlights": highlight_paper(paper, terms),
+        }
+        for paper, score in results
+    ]
+    return ArxivSearchResponse(
+        papers=payload, total=total, page=page, page_size=page_size
+    )
+
+
+@router.get("/arxiv-sanity/suggest", response_model=ArxivSuggestResponse)
+def suggest_arxiv(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(8, ge=1, le=20),
+    store: ArxivSanityStore = Depends(get_arxiv_sanity_store),
+):
+    return ArxivSuggestResponse(suggestions=store.suggest(q, limit=limit))
+
+
+@router.get("/arxiv-sanity/authors", response_model=ArxivAuthorsResponse)
+def list_arxiv_authors(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    store: ArxivSanityStore = Depends(get_arxiv_sanity_store),
+):
+    return ArxivAuthorsResponse(authors=store.list_authors(prefix, limit=limit))
+
+
+@router.get("/arxiv-sanity/author/{key:path}", response_model=ArxivSearchResponse)
+def list_arxiv_author_papers(
+    key: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page (overrides page)"
+    ),
+    store: ArxivSanityStore = Depends(get_arxiv_sanity_store),
+):
+    offset = 0 if cursor else (page - 1) * page_size
+    try:
+        result = store.list_author_papers(
+            key, limit=page_size, offset=offset, cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if result is None:
+        raise HTTPException(status_code=404, detail="Author not found")
+    papers, total = result
+    payload = [
+        {"metadata": paper.to_metadata(), "score": None} for paper in papers
+    ]
+    next_cursor = recent_cursor(papers[-1]) if len(papers) == page_size else None
+    return ArxivSearchResponse(
+        papers=payload,
+        total=total,
+        page=page,
+        page_size=page_size,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/arxiv-sanity/similar/{paper_id:path}", response_model=ArxivSearchResponse
+)
+def similar_arxiv(
+    paper_id: str,
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    store: ArxivSanityStore = Depends(get_arxiv_sanity_store),
+):
+    results = store.similar(paper_id, limit=page_size)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Paper not in similarity index")
+    payload = [
+        {"metadata": paper.to_metadata(), "score": score}
+        for paper, score in results
+    ]
+    return ArxivSearchResponse(
+        papers=payload, total=len(payload), page=1, page_size=page_size
+    )
+
+
+@router.get("/arxiv-sanity/recommended", response_model=ArxivSearchResponse)
+def recommended_arxiv(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    store: ArxivSanityStore = Depends(get_arxiv_sanity_store),
+):
+    # Ranked offline by the ingest daemon; empty until it has run with a
+    # non-empty library.
+    results, total = store.list_recommended(
+        limit=page_size, offset=(page - 1) * page_size
+    )
     payload = [
         {"metadata": paper.to_metadata(), "score": score}
         for paper, score in results
@@ -381,21 +719,69 @@ def search_arxiv(
     )
 
 
+def _check_doc_freshness(
+    request: Request,
+    db: DbClient,
+    arxiv_id: str,
+    version: str,
+    variant: str,
+    *extra: object,
+    cache_control: str | None = None,
+) -> tuple[dict[str, str] | None, bool, float | None]:
+    """
+    Returns (cache headers, not_modified, updated_at) for a document response.
+
+    Headers are None when the doc has no row; the ETag covers the route
+    variant plus `updated_at`, which changes on every `save_lumi_doc`.
+    Storage reads for the body must pass `updated_at` as their `version`,
+    so a cached copy of an older publish is never sent under the new ETag.
+    """
+    updated_at = db.get_lumi_doc_updated_at(arxiv_id, version)
+    if updated_at is None:
+        return None, False, None
+    etag = make_etag(variant, arxiv_id, version, updated_at, *extra)
+    headers = cache_headers(
+        etag, updated_at, cache_control or get_settings().doc_cache_control
+    )
+    return headers, is_not_modified(request, etag, updated_at), updated_at
+
+
 @router.get("/lumi-doc/{arxiv_id}/{version}", response_model=LumiDocResponse)
 def get_lumi_doc(
     arxiv_id: str,
     version: str,
+    request: Request,
     db: DbClient = Depends(get_db_client),
+    flight: SingleFlight = Depends(get_singleflight),
 ):
-    doc_tuple = db.get_lumi_doc(arxiv_id, version)
-    if not doc_tuple:
+    headers, unchanged, _ = _check_doc_freshness(
+        request, db, arxiv_id, version, "doc"
+    )
+    if headers is None:
         raise HTTPException(status_code=404, detail="Document not found")
-    doc_json, summaries_json = doc_tuple
-    return LumiDocResponse(
-        arxiv_id=arxiv_id,
-        version=version,
-        doc=doc_json,
-        summaries=summaries_json,
+    if unchanged:
+        return not_modified(headers)
+
+    raw, _ = flight.do(
+        ("lumi_doc_raw", arxiv_id, version, True),
+        lambda: db.get_lumi_doc_raw(arxiv_id, version),
+    )
+    if not raw:
+        raise HTTPException(status_code=404, detail="Document not found")
+    doc_raw, summaries_raw = raw
+    return RawJsonResponse(
+        json_object_from_parts(
+            [
+                ("arxiv_id", arxiv_id),
+                ("version", version),
+                ("doc", doc_raw),
+                ("summaries", summaries_raw),
+                ("signed_urls", None),
+                ("signed_urls_expire_at", None),
+                ("initial_sections", None),
+            ]
+        ),
+        headers=headers,
     )
 
 
@@ -403,26 +789,129 @@ def get_lumi_doc(
 def get_lumi_doc_index(
     arxiv_id: str,
     version: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    sign_images: bool = Query(
+        False,
+        description=(
+            "Embed presigned GET URLs for all figures. The response is not"
+            " shared-cacheable; readers should sign via /api/sign-urls instead."
+        ),
+    ),
+    include_sections: int = Query(
+        0,
+        ge=0,
+        le=MAX_SECTIONS_PER_REQUEST,
+        description="Also return the first N sections (initial bundle)",
+    ),
     db: DbClient = Depends(get_db_client),
     storage: StorageClient = Depends(get_storage_client),
+    signed_url_cache: SignedUrlCache = Depends(get_signed_url_cache),
+    flight: SingleFlight = Depends(get_singleflight),
 ):
-    doc_tuple = db.get_lumi_doc(arxiv_id, version)
-    if not doc_tuple:
+    if sign_images:
+        # Signed URLs expire, so that variant is only reusable by the same
+        # client within one safety-margin window and never by a CDN.
+        window = max(1, get_settings().signed_url_safety_margin_seconds)
+        headers, unchanged, updated_at = _check_doc_freshness(
+            request,
+            db,
+            arxiv_id,
+            version,
+            "index+signed",
+            include_sections,
+            int(time.time() // window),
+            cache_control="private, no-cache",
+        )
+    else:
+        headers, unchanged, updated_at = _check_doc_freshness(
+            request, db, arxiv_id, version, "index", include_sections
+        )
+    if headers is None:
         raise HTTPException(status_code=404, detail="Document not found")
-    doc_json, summaries_json = doc_tuple
+    if unchanged:
+        return not_modified(headers)
 
     base_path = f"papers/{arxiv_id}/v{version}"
     index_path = f"{base_path}/lumi_doc_index.json"
-    try:
-        doc_index = json.loads(storage.get_bytes(index_path))
-    except Exception:
-        doc_index = build_doc_index(doc_json)
 
-    return LumiDocResponse(
-        arxiv_id=arxiv_id,
-        version=version,
-        doc=doc_index,
-        summaries=summaries_json,
+    def read_index() -> bytes | None:
+        try:
+            # Written by the worker via upload_json, so it is spliced in as-is.
+            return storage.get_bytes(index_path, version=updated_at) or None
+        except Exception:
+            return None
+
+    index_raw, _ = flight.do(("storage", index_path, updated_at), read_index)
+    doc_index = None
+    if index_raw is not None and (sign_images or include_sections):
+        doc_index = json.loads(index_raw)
+
+    doc_json = None
+    # Indexes published before they listed figures have no imagePaths.
+    if index_raw is None or (sign_images and "imagePaths" not in doc_index):
+        doc_tuple = _get_lumi_doc_shared(flight, db, arxiv_id, version)
+        if not doc_tuple:
+            raise HTTPException(status_code=404, detail="Document not found")
+        doc_json, summaries_json = doc_tuple
+        summaries_raw = dumps_json(summaries_json)
+        if index_raw is None:
+            doc_index = build_doc_index(doc_json)
+            index_raw = dumps_json(doc_index)
+        else:
+            doc_index["imagePaths"] = collect_image_paths(doc_json)
+    else:
+        raw, _ = flight.do(
+            ("lumi_doc_raw", arxiv_id, version, False),
+            lambda: db.get_lumi_doc_raw(arxiv_id, version, include_doc=False),
+        )
+        if not raw:
+            raise HTTPException(status_code=404, detail="Document not found")
+        _, summaries_raw = raw
+
+    signed_urls = None
+    signed_urls_expire_at = None
+    if sign_images:
+        signed_urls = {}
+        for path in doc_index["imagePaths"]:
+            signed_urls[path], expires_at = signed_url_cache.presign_get(
+                storage, path
+            )
+            if signed_urls_expire_at is None or expires_at < signed_urls_expire_at:
+                signed_urls_expire_at = expires_at
+
+    initial_sections = None
+    if include_sections:
+        outline = doc_index.get("sectionOutline") or []
+        section_ids = [
+            section["id"] for section in outline[:include_sections] if section.get("id")
+        ]
+        sections_raw, _ = _load_sections_raw(
+            db,
+            storage,
+            arxiv_id,
+            version,
+            section_ids,
+            background_tasks,
+            flight,
+            doc_json=doc_json,
+            doc_updated_at=updated_at,
+        )
+        initial_sections = json_array_from_parts(sections_raw)
+
+    return RawJsonResponse(
+        json_object_from_parts(
+            [
+                ("arxiv_id", arxiv_id),
+                ("version", version),
+                ("doc", index_raw),
+                ("summaries", summaries_raw),
+                ("signed_urls", signed_urls),
+                ("signed_urls_expire_at", signed_urls_expire_at),
+                ("initial_sections", initial_sections),
+            ]
+        ),
+        headers=headers,
     )
 
 
@@ -434,28 +923,208 @@ def get_lumi_doc_section(
     arxiv_id: str,
     version: str,
     section_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: DbClient = Depends(get_db_client),
     storage: StorageClient = Depends(get_storage_client),
+    flight: SingleFlight = Depends(get_singleflight),
 ):
-    base_path = f"papers/{arxiv_id}/v{version}"
-    section_path = f"{base_path}/sections/{section_id}.json"
-    try:
-        section = json.loads(storage.get_bytes(section_path))
-        return LumiDocSectionResponse(
-            arxiv_id=arxiv_id,
-            version=version,
-            section=section,
+    headers, unchanged, updated_at = _check_doc_freshness(
+        request, db, arxiv_id, version, "section", section_id
+    )
+    if unchanged:
+        return not_modified(headers)
+
+    sections_raw, missing = _load_sections_raw(
+        db,
+        storage,
+        arxiv_id,
+        version,
+        [section_id],
+        background_tasks,
+        flight,
+        doc_updated_at=updated_at,
+    )
+    if missing:
+        detail = "Section not found" if headers else "Document not found"
+        raise HTTPException(status_code=404, detail=detail)
+    return RawJsonResponse(
+        json_object_from_parts(
+            [
+                ("arxiv_id", arxiv_id),
+                ("version", version),
+                ("section", sections_raw[0]),
+            ]
+        ),
+        headers=headers,
+    )
+
+
+@router.get(
+    "/lumi-doc-sections/{arxiv_id}/{version}",
+    response_model=LumiDocSectionsResponse,
+)
+def get_lumi_doc_sections(
+    arxiv_id: str,
+    version: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    ids: str = Query(..., description="Comma-separated section ids"),
+    db: DbClient = Depends(get_db_client),
+    storage: StorageClient = Depends(get_storage_client),
+    flight: SingleFlight = Depends(get_singleflight),
+):
+    """
+    Returns several sections in one response, in the requested order. Ids
+    that do not exist are listed in `missing` rather than failing the batch.
+    """
+    section_ids = list(dict.fromkeys(part.strip() for part in ids.split(",")))
+    section_ids = [section_id for section_id in section_ids if section_id]
+    if not section_ids:
+        raise HTTPException(status_code=400, detail="No section ids given")
+    if len(section_ids) > MAX_SECTIONS_PER_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_SECTIONS_PER_REQUEST} sections per request",
         )
-    except Exception:
-        doc_tuple = db.get_lumi_doc(arxiv_id, version)
-        if not doc_tuple:
-            raise HTTPException(status_code=404, detail="Document not found")
-        doc_json, _ = doc_tuple
-        section = find_section_by_id(doc_json.get("sections") or [], section_id)
-        if not section:
-            raise HTTPException(status_code=404, detail="Section not found")
-        return LumiDocSectionResponse(
-            arxiv_id=arxiv_id,
-            version=version,
-            section=section,
+
+    headers, unchanged, updated_at = _check_doc_freshness(
+        request, db, arxiv_id, version, "sections", *section_ids
+    )
+    if headers is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if unchanged:
+        return not_modified(headers)
+
+    sections_raw, missing = _load_sections_raw(
+        db,
+        storage,
+        arxiv_id,
+        version,
+        section_ids,
+        background_tasks,
+        flight,
+        doc_updated_at=updated_at,
+    )
+    return RawJsonResponse(
+        json_object_from_parts(
+            [
+                ("arxiv_id", arxiv_id),
+                ("version", version),
+                ("sections", json_array_from_parts(sections_raw)),
+                ("missing", missing),
+            ]
+        ),
+        headers=headers,
+    )
+
+
+def _load_sections_raw(
+    db: DbClient,
+    storage: StorageClient,
+    arxiv_id: str,
+    version: str,
+    section_ids: list[str],
+    background_tasks: BackgroundTasks,
+    flight: SingleFlight,
+    doc_json: dict | None = None,
+    doc_updated_at: float | None = None,
+) -> tuple[list[bytes], list[str]]:
+    """
+    Returns (serialized sections in request order, ids that were not found).
+
+    Section chunks are read from storage concurrently. A missing chunk is
+    cut out of lumi_doc.json with a ranged read via the section offset
+    index; only if that fails too is the full doc loaded (or `doc_json`
+    used, if the caller already has it). Chunks recovered either way are
+    re-uploaded in the background so the next read is a plain hit.
+    Concurrent requests for the same section share one load, and only the
+    request that did the load schedules the repair. Storage reads are
+    versioned by `doc_updated_at` (see `_check_doc_freshness`).
+    """
+
+    def _load_chunk(section_id: str) -> tuple[bytes | None, bool]:
+        try:
+            path = section_chunk_path(arxiv_id, version, section_id)
+            chunk = storage.get_bytes(path, version=doc_updated_at) or None
+        except Exception:
+            chunk = None
+        if chunk is not None:
+            return chunk, False
+        chunk = read_section_from_artifact(
+            storage, arxiv_id, version, section_id, doc_version=doc_updated_at
+        )
+        return chunk, chunk is not None
+
+    def _read_chunk(section_id: str) -> tuple[bytes | None, bool]:
+        (chunk, recovered), shared = flight.do(
+            ("section", arxiv_id, version, section_id, doc_updated_at),
+            lambda: _load_chunk(section_id),
         )
+        return chunk, recovered and not shared
+
+    if len(section_ids) > 1:
+        workers = min(SECTION_FETCH_CONCURRENCY, len(section_ids))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Copy the request context so storage time is still attributed.
+            futures = [
+                pool.submit(contextvars.copy_context().run, _read_chunk, section_id)
+                for section_id in section_ids
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [_read_chunk(section_id) for section_id in section_ids]
+
+    chunks = [chunk for chunk, _ in results]
+    repaired: dict[str, bytes] = {
+        section_id: chunk
+        for section_id, (chunk, recovered) in zip(section_ids, results)
+        if recovered
+    }
+
+    if any(chunk is None for chunk in chunks):
+        if doc_json is None:
+            doc_tuple = _get_lumi_doc_shared(flight, db, arxiv_id, version)
+            doc_json = doc_tuple[0] if doc_tuple else {}
+        sections = doc_json.get("sections") or []
+        for idx, section_id in enumerate(section_ids):
+            if chunks[idx] is None:
+                section = find_section_by_id(sections, section_id)
+                if section:
+                    chunks[idx] = repaired[section_id] = dumps_json(section)
+
+    if repaired:
+        logger.info(
+            "Repairing %d missing section chunk(s) for %s v%s",
+            len(repaired),
+            arxiv_id,
+            version,
+        )
+        background_tasks.add_task(
+            _repair_section_chunks, storage, arxiv_id, version, repaired
+        )
+
+    missing = [sid for sid, chunk in zip(section_ids, chunks) if chunk is None]
+    return [chunk for chunk in chunks if chunk is not None], missing
+
+
+def _get_lumi_doc_shared(
+    flight: SingleFlight, db: DbClient, arxiv_id: str, version: str
+) -> tuple[dict, dict] | None:
+    """db.get_lumi_doc, shared between concurrent callers (treat as read-only)."""
+    doc_tuple, _ = flight.do(
+        ("lumi_doc", arxiv_id, version),
+        lambda: db.get_lumi_doc(arxiv_id, version),
+    )
+    return doc_tuple
+
+
+def _repair_section_chunks(
+    storage: StorageClient, arxiv_id: str, version: str, chunks: dict[str, bytes]
+) -> None:
+    for section_id, chunk in chunks.items():
+        path = section_chunk_path(arxiv_id, version, section_id)
+        try:
+            storage.upload_fileobj(io.BytesIO(chunk), path)
+        except Exception:
+            logger.exception("Failed to repair section chunk %s", path)
@@ -49,6 +49,8 @@ class AnswerRequest(BaseModel):
     highlight: Optional[str] = None
     highlighted_spans: Optional[list] = Field(default=None, alias="highlightedSpans")
     image: Optional[dict] = None
+    # Skip the answer cache and always ask the model (e.g. "regenerate").
+    bypass_cache: bool = Field(default=False, alias="bypassCache")
 
 
 class AnswerResponse(BaseModel):
@@ -81,6 +83,20 @@ class FeedbackResponse(BaseModel):
 
 class SignUrlResponse(BaseModel):
     url: str
+    # Unix timestamp after which the URL stops working.
+    expires_at: Optional[float] = None
+
+
+class SignUrlsRequest(BaseModel):
+    paths: list[str] = Field(..., min_length=1, max_length=200)
+    op: Literal["get", "put"] = "get"
+    expires_in: int = Field(3600, ge=60, le=86400)
+
+
+class SignUrlsResponse(BaseModel):
+    urls: dict[str, str]
+    # Earliest expiry (Unix timestamp) across the returned URLs.
+    expires_at: float
 
 
 class LumiDocResponse(BaseModel):
@@ -88,6 +104,9 @@ class LumiDocResponse(BaseModel):
     version: str
     doc: dict
     summaries: dict
+    signed_urls: Optional[dict[str, str]] = None
+    signed_urls_expire_at: Optional[float] = None
+    initial_sections: Optional[list[dict]] = None
 
 
 class LumiDocSectionResponse(BaseModel):
@@ -96,6 +115,13 @@ class LumiDocSectionResponse(BaseModel):
     section: dict
 
 
+class LumiDocSectionsResponse(BaseModel):
+    arxiv_id: str
+    version: str
+    sections: list[dict]
+    missing: list[str] = Field(default_factory=list)
+
+
 class PaperSummary(BaseModel):
     arxiv_id: str
     version: str
@@ -111,15 +137,45 @@ class ArxivPaperMetadata(BaseModel):
     version: str
     authors: list[str]
     title: str
-    summary: str
+    # None in compact search results; use highlights.snippet instead.
+    summary: str | None = None
     updatedTimestamp: str
     publishedTimestamp: str
     categories: list[str] | None = None
 
 
+class ArxivSearchHighlights(BaseModel):
+    # [start, end) UTF-16 code unit offsets of query matches (JS indices).
+    title: list[tuple[int, int]]
+    snippet: str
+    snippet_matches: list[tuple[int, int]]
+
+
 class ArxivSearchPaper(BaseModel):
     metadata: ArxivPaperMetadata
     score: Optional[float] = None
+    # Set by /arxiv-sanity/search.
+    highlights: Optional[ArxivSearchHighlights] = None
+
+
+class ArxivAuthor(BaseModel):
+    # Normalized name; use it with /arxiv-sanity/author/{key}.
+    key: str
+    name: str
+    paper_count: int
+
+
+class ArxivAuthorsResponse(BaseModel):
+    authors: list[ArxivAuthor]
+
+
+class ArxivSuggestion(BaseModel):
+    paper_id: str
+    title: str
+
+
+class ArxivSuggestResponse(BaseModel):
+    suggestions: list[ArxivSuggestion]
 
 
 class ArxivSearchResponse(BaseModel):
@@ -127,3 +183,5 @@ class ArxivSearchResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    # Set by /arxiv-sanity/recent when another page may follow.
+    next_cursor: Optional[str] = None
@@ -0,0 +1,129 @@
+"""
+Request coalescing ("singleflight") for identical concurrent work.
+
+When a paper trends, many requests for the same document, section or
+answer arrive together. `SingleFlight.do(key, fn)` runs `fn` once per key
+at a time; callers that arrive while it is in flight wait and receive the
+same result (or exception) instead of repeating the DB fetch or LLM call.
+
+Coalescing is in-process by default. For work that is worth deduplicating
+across API replicas (answer generation), pass `distributed=True` and give
+the SingleFlight a Redis URL: the leader then also holds a Redis lock, so
+leaders in other processes wait for it and can pick up its result from a
+shared cache. If Redis is unreachable or the wait times out, the work
+simply runs locally.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+import redis
+from redis import exceptions as redis_exceptions
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        *,
+        lock_prefix: str = "lumi:flight:",
+        lock_timeout_seconds: float = 120.0,
+        lock_wait_seconds: float = 60.0,
+    ):
+        self.redis_url = redis_url
+        self.lock_prefix = lock_prefix
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.lock_wait_seconds = lock_wait_seconds
+        self._redis = redis.Redis.from_url(redis_url) if redis_url else None
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(
+        self, key: Hashable, fn: Callable[[], T], *, distributed: bool = False
+    ) -> tuple[T, bool]:
+        """
+        Run `fn` unless an identical call is in flight.
+
+        Returns (result, shared); `shared` is True when the result came from
+        another caller's execution, so mutable results should be copied and
+        side effects (like scheduling repairs) left to that caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            if distributed and self._redis is not None:
+                call.result = self._run_locked(key, fn)
+            else:
+                call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def _run_locked(self, key: Hashable, fn: Callable[[], T]) -> T:
+        parts = key if isinstance(key, tuple) else (key,)
+        name = self.lock_prefix + ":".join(str(part) for part in parts)
+        try:
+            lock = self._redis.lock(
+                name,
+                timeout=self.lock_timeout_seconds,
+                blocking_timeout=self.lock_wait_seconds,
+            )
+            acquired = lock.acquire()
+        except redis_exceptions.RedisError:
+            logger.warning("Singleflight lock unavailable for %s", name)
+            self._redis = redis.Redis.from_url(self.redis_url)
+            return fn()
+        try:
+            return fn()
+        finally:
+            if acquired:
+                try:
+                    lock.release()
+                except redis_exceptions.RedisError:
+                    # Expired while we worked (another process may own it
+                    # now) or Redis went away; it times out on its own.
+                    pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
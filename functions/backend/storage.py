@@ -5,11 +5,24 @@ Storage abstraction for Tencent COS (S3-compatible) and in-memory testing.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol
+from typing import BinaryIO, Protocol
+import io
 import json
+import shutil
+import tempfile
+import threading
+import time
 
-import boto3
-from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from backend.cache import MISSING, LruCache
+from shared.s3_client import get_s3_client
+
+_MISSING_KEY_ERROR_CODES = {"NoSuchKey", "404", "NotFound"}
+
+# Streams larger than this spill from memory to a temporary file.
+STREAM_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+STREAM_CHUNK_BYTES = 1024 * 1024
 
 
 class StorageClient(Protocol):
@@ -27,7 +40,24 @@ class StorageClient(Protocol):
     def upload_file(self, src_path: str, dest_path: str) -> None:
         ...
 
-    def get_bytes(self, path: str) -> bytes:
+    def upload_fileobj(self, fileobj: BinaryIO, dest_path: str) -> None:
+        """Upload from a readable binary stream without buffering it whole."""
+        ...
+
+    def get_bytes(self, path: str, version: object = None) -> bytes:
+        """
+        `version` names the revision the caller expects (e.g. the doc row's
+        updated_at); caching clients never answer it with a copy cached
+        under another version. Uncached clients ignore it.
+        """
+        ...
+
+    def open_stream(self, path: str) -> BinaryIO:
+        """Return a seekable binary stream over the object; caller closes it."""
+        ...
+
+    def get_range(self, path: str, start: int, end: int) -> bytes:
+        """Return bytes [start, end) of the object."""
         ...
 
 
@@ -56,7 +86,10 @@ class InMemoryStorageClient:
         with open(src_path, "rb") as f:
             self.stored_objects[dest_path] = f.read()
 
-    def get_bytes(self, path: str) -> bytes:
+    def upload_fileobj(self, fileobj: BinaryIO, dest_path: str) -> None:
+        self.stored_objects[dest_path] = fileobj.read()
+
+    def get_bytes(self, path: str, version: object = None) -> bytes:
         stored = self.stored_objects.get(path)
         if stored is None:
             raise FileNotFoundError(path)
@@ -64,6 +97,12 @@ class InMemoryStorageClient:
             return stored
         return json.dumps(stored, default=str).encode("utf-8")
 
+    def open_stream(self, path: str) -> BinaryIO:
+        return io.BytesIO(self.get_bytes(path))
+
+    def get_range(self, path: str, start: int, end: int) -> bytes:
+        return self.get_bytes(path)[start:end]
+
 
 @dataclass
 class CosStorageClient:
@@ -78,18 +117,11 @@ class CosStorageClient:
     secret_access_key: str
 
     def __post_init__(self):
-        # Use virtual-hosted style addressing to satisfy COS requirements.
-        config = Config(
-            s3={"addressing_style": "virtual"},
-            signature_version="s3v4",
-        )
-        self._client = boto3.client(
-            "s3",
-            endpoint_url=self.endpoint,
-            region_name=self.region,
-            aws_access_key_id=self.access_key_id,
-            aws_secret_access_key=self.secret_access_key,
-            config=config,
+        self._client = get_s3_client(
+            endpoint=self.endpoint,
+            region=self.region,
+            access_key_id=self.access_key_id,
+            secret_access_key=self.secret_access_key,
         )
 
     def presign_get(self, path: str, expires_in: int = 3600) -> str:
@@ -123,6 +155,190 @@ class CosStorageClient:
     def upload_file(self, src_path: str, dest_path: str) -> None:
         self._client.upload_file(src_path, self.bucket, dest_path)
 
-    def get_bytes(self, path: str) -> bytes:
-        response = self._client.get_object(Bucket=self.bucket, Key=path)
+    def upload_fileobj(self, fileobj: BinaryIO, dest_path: str) -> None:
+        # Multipart upload in chunks; the stream is never held in memory.
+        self._client.upload_fileobj(fileobj, self.bucket, dest_path)
+
+    def _get_object(self, path: str, **kwargs) -> dict:
+        try:
+            return self._client.get_object(Bucket=self.bucket, Key=path, **kwargs)
+        except ClientError as exc:
+            code = exc.response.get("Error", {}).get("Code")
+            if code in _MISSING_KEY_ERROR_CODES:
+                raise FileNotFoundError(path) from exc
+            raise
+
+    def get_bytes(self, path: str, version: object = None) -> bytes:
+        return self._get_object(path)["Body"].read()
+
+    def open_stream(self, path: str) -> BinaryIO:
+        # The HTTP body is not seekable, so spool it: small objects stay in
+        # memory and large ones (e.g. scanned PDFs) spill to disk.
+        body = self._get_object(path)["Body"]
+        spool = tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_MAX_BYTES)
+        try:
+            shutil.copyfileobj(body, spool, STREAM_CHUNK_BYTES)
+        except Exception:
+            spool.close()
+            raise
+        finally:
+            body.close()
+        spool.seek(0)
+        return spool
+
+    def get_range(self, path: str, start: int, end: int) -> bytes:
+        if end <= start:
+            return b""
+        response = self._get_object(path, Range=f"bytes={start}-{end - 1}")
         return response["Body"].read()
+
+
+class _NegativeEntry:
+    """Marks a key that storage reported as missing."""
+
+
+_NEGATIVE = _NegativeEntry()
+
+
+class CachedStorageClient:
+    """
+    Read-through LRU cache in front of another StorageClient.
+
+    Only `get_bytes` is cached. Entries are bounded by total bytes and expire
+    after a TTL; keys that raise FileNotFoundError are remembered as negative
+    entries for a shorter TTL. Writes through this client invalidate the
+    path, but writes from other processes (e.g. the worker) are only picked
+    up once the entry expires, unless the reader passes a `version`: entries
+    are keyed by (path, version), so a new version is always a miss. Reads
+    whose bytes back DB-derived validators (ETags) must pass one. Entries
+    for old versions are left to LRU eviction and the TTL.
+    """
+
+    def __init__(
+        self,
+        inner: StorageClient,
+        *,
+        max_bytes: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        max_entry_bytes: int | None = None,
+    ):
+        self.inner = inner
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entry_bytes = max_entry_bytes or max_bytes
+        self.negative_hits = 0
+        self._cache = LruCache(max_bytes, ttl_seconds=ttl_seconds)
+        # Bumped by every invalidation. A read only fills the cache if no
+        # write happened while it was in flight, since its bytes may predate
+        # that write. One counter for all paths keeps this bounded; writes
+        # through the API process are rare, so few reads are left uncached.
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    def presign_get(self, path: str, expires_in: int = 3600) -> str:
+        return self.inner.presign_get(path, expires_in=expires_in)
+
+    def presign_put(self, path: str, expires_in: int = 3600) -> str:
+        return self.inner.presign_put(path, expires_in=expires_in)
+
+    def upload_json(self, path: str, payload: dict) -> None:
+        # Before the write, so the old bytes stop being served while it runs;
+        # after it, so reads that overlapped the upload do not cache them.
+        self.invalidate(path)
+        self.inner.upload_json(path, payload)
+        self.invalidate(path)
+
+    def upload_file(self, src_path: str, dest_path: str) -> None:
+        self.invalidate(dest_path)
+        self.inner.upload_file(src_path, dest_path)
+        self.invalidate(dest_path)
+
+    def upload_fileobj(self, fileobj: BinaryIO, dest_path: str) -> None:
+        self.invalidate(dest_path)
+        self.inner.upload_fileobj(fileobj, dest_path)
+        self.invalidate(dest_path)
+
+    def get_bytes(self, path: str, version: object = None) -> bytes:
+        key = (path, version)
+        cached = self._cache.get(key)
+        if cached is _NEGATIVE:
+            self.negative_hits += 1
+            raise FileNotFoundError(path)
+        if cached is not MISSING:
+            return cached
+        writes = self._writes
+        try:
+            data = self.inner.get_bytes(path)
+        except FileNotFoundError:
+            self._fill(
+                writes,
+                key,
+                _NEGATIVE,
+                size=len(path),
+                ttl_seconds=self.negative_ttl_seconds,
+            )
+            raise
+        if len(data) <= self.max_entry_bytes:
+            self._fill(writes, key, data, size=len(data))
+        return data
+
+    def _fill(self, writes: int, key: tuple, value: object, **kwargs) -> None:
+        with self._writes_lock:
+            if self._writes == writes:
+                self._cache.set(key, value, **kwargs)
+
+    def open_stream(self, path: str) -> BinaryIO:
+        # Large objects are streamed from the backend and never cached.
+        return self.inner.open_stream(path)
+
+    def get_range(self, path: str, start: int, end: int) -> bytes:
+        # Ranges come from objects that are never read whole here (the full
+        # lumi_doc.json), so there is no cached copy to slice.
+        return self.inner.get_range(path, start, end)
+
+    def invalidate(self, path: str) -> None:
+        """Drop `path` under every version."""
+        with self._writes_lock:
+            self._writes += 1
+            self._cache.pop_where(lambda key: key[0] == path)
+
+    def stats(self) -> dict:
+        stats = self._cache.stats.as_dict()
+        stats["negative_hits"] = self.negative_hits
+        stats["entries"] = len(self._cache)
+        stats["bytes"] = self._cache.size
+        return stats
+
+
+class SignedUrlCache:
+    """
+    Reuses presigned GET URLs until a safety margin before they expire.
+
+    Signing is cheap but not free, and a figure-heavy paper asks for dozens
+    of URLs per page view. A cached URL is only handed out while it still has
+    at least `safety_margin_seconds` of validity left.
+    """
+
+    def __init__(self, max_entries: int = 10000, safety_margin_seconds: int = 300):
+        self.safety_margin_seconds = safety_margin_seconds
+        self._cache = LruCache(max_entries)
+
+    def presign_get(
+        self, storage: StorageClient, path: str, expires_in: int = 3600
+    ) -> tuple[str, float]:
+        """Return (url, expires_at) where expires_at is a Unix timestamp."""
+        key = (path, expires_in)
+        cached = self._cache.get(key)
+        if cached is not MISSING:
+            return cached
+        expires_at = time.time() + expires_in
+        url = storage.presign_get(path, expires_in=expires_in)
+        reuse_for = expires_in - self.safety_margin_seconds
+        if reuse_for > 0:
+            self._cache.set(key, (url, expires_at), size=1, ttl_seconds=reuse_for)
+        return url, expires_at
+
+    def stats(self) -> dict:
+        stats = self._cache.stats.as_dict()
+        stats["entries"] = len(self._cache)
+        return stats
@@ -0,0 +1,173 @@
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+from redis import exceptions as redis_exceptions
+
+from backend.answer_cache import (
+    AnswerCache,
+    InMemoryAnswerStore,
+    RedisAnswerStore,
+    answer_cache_key,
+)
+from backend.app import create_app
+from backend.dependencies import get_db_client
+from shared.api import HighlightSelection, ImageInfo, LumiAnswerRequest
+from shared.lumi_doc import Position
+
+CONTENT = [
+    {
+        "id": "c1",
+        "textContent": {
+            "tagName": "p",
+            "spans": [
+                {
+                    "id": "sp1",
+                    "text": "See [1].",
+                    "innerTags": [
+                        {
+                            "id": "t1",
+                            "tagName": "reference",
+                            "metadata": {"id": "Author2023Title"},
+                            "position": {"startIndex": 4, "endIndex": 7},
+                            "children": [],
+                        }
+                    ],
+                }
+            ],
+        },
+    }
+]
+
+
+def _selection(span_id: str) -> HighlightSelection:
+    return HighlightSelection(span_id=span_id, position=Position(0, 1))
+
+
+class AnswerCacheKeyTests(unittest.TestCase):
+    def test_query_is_normalized(self):
+        first = LumiAnswerRequest(query="What is  attention?")
+        second = LumiAnswerRequest(query="  what is attention ")
+        self.assertEqual(
+            answer_cache_key("2401.1", "1", 10.0, first),
+            answer_cache_key("2401.1", "1", 10.0, second),
+        )
+
+    def test_key_covers_prompt_inputs(self):
+        base = LumiAnswerRequest(
+            query="why?",
+            highlight="softmax",
+            highlighted_spans=[_selection("a"), _selection("b")],
+        )
+        key = answer_cache_key("2401.1", "1", 10.0, base)
+        reordered = LumiAnswerRequest(
+            query="why?",
+            highlight="softmax",
+            highlighted_spans=[_selection("b"), _selection("a")],
+        )
+        self.assertEqual(key, answer_cache_key("2401.1", "1", 10.0, reordered))
+
+        variants = [
+            ("2401.2", "1", 10.0, base),
+            ("2401.1", "2", 10.0, base),
+            # A re-import of the document bumps updated_at.
+            ("2401.1", "1", 11.0, base),
+            ("2401.1", "1", 10.0, LumiAnswerRequest(query="why?")),
+            (
+                "2401.1",
+                "1",
+                10.0,
+                LumiAnswerRequest(
+                    query="why?",
+                    highlight="softmax",
+                    highlighted_spans=[_selection("a")],
+                ),
+            ),
+            (
+                "2401.1",
+                "1",
+                10.0,
+                LumiAnswerRequest(
+                    query="why?", image=ImageInfo(image_storage_path="x.png")
+                ),
+            ),
+        ]
+        for args in variants:
+            self.assertNotEqual(key, answer_cache_key(*args), args)
+
+
+class AnswerCacheTests(unittest.TestCase):
+    def test_hit_gets_fresh_ids(self):
+        cache = AnswerCache(InMemoryAnswerStore(1024 * 1024, 60), ttl_seconds=60)
+        request = LumiAnswerRequest(query="why")
+        self.assertIsNone(cache.get("k", request))
+
+        cache.set("k", {"id": "a1", "responseContent": CONTENT, "timestamp": 1})
+        answer = cache.get("k", request)
+        self.assertNotEqual(answer["id"], "a1")
+        self.assertEqual(answer["request"]["query"], "why")
+        content = answer["responseContent"][0]
+        span = content["textContent"]["spans"][0]
+        self.assertNotEqual(content["id"], "c1")
+        self.assertNotEqual(span["id"], "sp1")
+        self.assertEqual(span["text"], "See [1].")
+        # Citation targets point into the paper and must survive.
+        self.assertEqual(span["innerTags"][0]["metadata"], {"id": "Author2023Title"})
+
+        cache.record_bypass()
+        self.assertEqual(
+            cache.stats(), {"hits": 1, "misses": 1, "bypasses": 1, "hit_rate": 0.5}
+        )
+
+    def test_redis_errors_fall_back_to_no_cache(self):
+        store = RedisAnswerStore("redis://localhost:6379/0")
+        for error in (
+            redis_exceptions.TimeoutError("timed out"),
+            redis_exceptions.ResponseError("OOM command not allowed"),
+            redis_exceptions.ReadOnlyError("read only replica"),
+        ):
+            store.client = mock.Mock()
+            store.client.get.side_effect = error
+            store.client.setex.side_effect = error
+            cache = AnswerCache(store, ttl_seconds=60)
+            self.assertIsNone(cache.get("k", LumiAnswerRequest(query="why")))
+            cache.set("k", {"id": "a1", "responseContent": CONTENT, "timestamp": 1})
+
+
+class AnswerCacheRouteTests(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(create_app())
+        get_db_client().save_lumi_doc(
+            "2401.00020", "1", {"metadata": {}, "sections": []}, {}
+        )
+
+    def test_repeated_question_is_served_from_cache(self):
+        body = {"arxiv_id": "2401.00020", "version": "1", "query": "What is it?"}
+        with mock.patch(
+            "answers.answers.gemini.call_predict", return_value="An answer."
+        ) as predict:
+            first = self.client.post("/api/get_lumi_response", json=body)
+            second = self.client.post(
+                "/api/get_lumi_response", json={**body, "query": "what is it"}
+            )
+            self.assertEqual(predict.call_count, 1)
+
+            bypassed = self.client.post(
+                "/api/get_lumi_response", json={**body, "bypassCache": True}
+            )
+            self.assertEqual(predict.call_count, 2)
+
+        for resp in (first, second, bypassed):
+            self.assertEqual(resp.status_code, 200)
+        first_answer = first.json()["answer"]
+        second_answer = second.json()["answer"]
+        self.assertNotEqual(first_answer["id"], second_answer["id"])
+        self.assertEqual(second_answer["request"]["query"], "what is it")
+        self.assertEqual(
+            first_answer["responseContent"][0]["textContent"]["spans"][0]["text"],
+            second_answer["responseContent"][0]["textContent"]["spans"][0]["text"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,14 @@
+import json
 import unittest
+from unittest import mock
 
 from fastapi.testclient import TestClient
 
 from backend.app import create_app
-from backend.dependencies import get_db_client
+from backend.dependencies import get_db_client, get_storage_client
 from backend.db import InMemoryDbClient
+from backend.doc_chunks import publish_doc_chunks
+from backend.storage import CachedStorageClient, InMemoryStorageClient
 
 
 class BackendApiTests(unittest.TestCase):
@@ -36,6 +40,279 @@ class BackendApiTests(unittest.TestCase):
         self.assertIn("url", response.json())
         self.assertIn("foo/bar.png", response.json()["url"])
 
+    def test_sign_urls_batch(self):
+        response = self.client.post(
+            "/api/sign-urls",
+            json={"paths": ["a/1.png", "a/2.png", "a/1.png"]},
+        )
+        self.assertEqual(response.status_code, 200)
+        urls = response.json()["urls"]
+        self.assertEqual(set(urls), {"a/1.png", "a/2.png"})
+        self.assertIn("a/2.png", urls["a/2.png"])
+
+    def test_lumi_doc_index_embeds_signed_image_urls(self):
+        doc = {
+            "metadata": {"featuredImage": {"imageStoragePath": "p/v1/cover.png"}},
+            "sections": [
+                {
+                    "id": "s1",
+                    "contents": [{"imageContent": {"storagePath": "p/v1/fig1.png"}}],
+                }
+            ],
+        }
+        get_db_client().save_lumi_doc("2401.00001", "1", doc, {})
+        resp = self.client.get(
+            "/api/lumi-doc-index/2401.00001/1", params={"sign_images": "true"}
+        )
+        self.assertEqual(resp.status_code, 200)
+        payload = resp.json()
+        self.assertEqual(payload["doc"]["sections"], [])
+        self.assertEqual(
+            set(payload["signed_urls"]), {"p/v1/cover.png", "p/v1/fig1.png"}
+        )
+
+    def test_published_index_lists_and_signs_figures_without_the_doc(self):
+        doc = {
+            "metadata": {"featuredImage": {"imageStoragePath": "p/v1/cover.png"}},
+            "sections": [
+                {
+                    "id": "s1",
+                    "contents": [{"imageContent": {"storagePath": "p/v1/fig1.png"}}],
+                }
+            ],
+        }
+        db = get_db_client()
+        db.save_lumi_doc("2401.00008", "1", doc, {})
+        publish_doc_chunks(get_storage_client(), "2401.00008", "1", doc)
+
+        with mock.patch.object(db, "get_lumi_doc") as get_lumi_doc:
+            plain = self.client.get("/api/lumi-doc-index/2401.00008/1")
+            signed = self.client.get(
+                "/api/lumi-doc-index/2401.00008/1", params={"sign_images": "true"}
+            )
+        get_lumi_doc.assert_not_called()
+        self.assertEqual(
+            plain.json()["doc"]["imagePaths"], ["p/v1/cover.png", "p/v1/fig1.png"]
+        )
+        self.assertIsNone(plain.json()["signed_urls"])
+        self.assertNotIn("private", plain.headers["cache-control"])
+        self.assertEqual(
+            set(signed.json()["signed_urls"]), {"p/v1/cover.png", "p/v1/fig1.png"}
+        )
+
+    def test_index_published_before_image_paths_falls_back_to_the_doc(self):
+        doc = {
+            "metadata": {},
+            "sections": [
+                {
+                    "id": "s1",
+                    "contents": [{"imageContent": {"storagePath": "p/v1/fig1.png"}}],
+                }
+            ],
+        }
+        get_db_client().save_lumi_doc("2401.00009", "1", doc, {})
+        old_index = {"metadata": {}, "sections": [], "sectionOutline": []}
+        get_storage_client().upload_json(
+            "papers/2401.00009/v1/lumi_doc_index.json", old_index
+        )
+        resp = self.client.get(
+            "/api/lumi-doc-index/2401.00009/1", params={"sign_images": "true"}
+        )
+        self.assertEqual(set(resp.json()["signed_urls"]), {"p/v1/fig1.png"})
+
+    def test_lumi_doc_conditional_requests(self):
+        doc = {"metadata": {}, "sections": [{"id": "s1", "contents": []}]}
+        get_db_client().save_lumi_doc("2401.00002", "1", doc, {})
+
+        for path in (
+            "/api/lumi-doc/2401.00002/1",
+            "/api/lumi-doc-index/2401.00002/1",
+            "/api/lumi-doc-section/2401.00002/1/s1",
+        ):
+            first = self.client.get(path)
+            self.assertEqual(first.status_code, 200)
+            etag = first.headers["etag"]
+            self.assertIn("max-age", first.headers["cache-control"])
+
+            cached = self.client.get(path, headers={"If-None-Match": etag})
+            self.assertEqual(cached.status_code, 304)
+            self.assertEqual(cached.content, b"")
+            self.assertEqual(cached.headers["etag"], etag)
+
+            since = self.client.get(
+                path,
+                headers={"If-Modified-Since": first.headers["last-modified"]},
+            )
+            self.assertEqual(since.status_code, 304)
+
+        index_etag = self.client.get("/api/lumi-doc-index/2401.00002/1").headers[
+            "etag"
+        ]
+        get_db_client().save_lumi_doc("2401.00002", "1", doc, {})
+        changed = self.client.get(
+            "/api/lumi-doc-index/2401.00002/1",
+            headers={"If-None-Match": index_etag},
+        )
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], index_etag)
+
+    def test_republish_by_another_process_is_not_served_from_cache(self):
+        shared = InMemoryStorageClient()
+        # The API and the worker each have their own cache over one bucket.
+        api_storage, worker_storage = (
+            CachedStorageClient(
+                shared, max_bytes=1 << 20, ttl_seconds=600, negative_ttl_seconds=600
+            )
+            for _ in range(2)
+        )
+        app = create_app()
+        app.dependency_overrides[get_storage_client] = lambda: api_storage
+        client = TestClient(app)
+        db = get_db_client()
+
+        def publish(title: str) -> None:
+            doc = {
+                "metadata": {"title": title},
+                "sections": [{"id": "s1", "contents": [title]}],
+            }
+            db.save_lumi_doc("2401.00007", "1", doc, {})
+            publish_doc_chunks(worker_storage, "2401.00007", "1", doc)
+
+        index_path = "/api/lumi-doc-index/2401.00007/1"
+        section_path = "/api/lumi-doc-section/2401.00007/1/s1"
+        publish("Old")
+        old = client.get(index_path)
+        self.assertEqual(old.json()["doc"]["metadata"]["title"], "Old")
+        section = client.get(section_path).json()["section"]
+        self.assertEqual(section["contents"], ["Old"])
+
+        publish("New")
+        new = client.get(index_path, headers={"If-None-Match": old.headers["etag"]})
+        self.assertEqual(new.status_code, 200)
+        self.assertEqual(new.json()["doc"]["metadata"]["title"], "New")
+        section = client.get(section_path).json()["section"]
+        self.assertEqual(section["contents"], ["New"])
+
+    def test_lumi_doc_routes_pass_stored_json_through(self):
+        doc = {"metadata": {"title": "Ünïcode"}, "sections": [{"id": "s1"}]}
+        get_db_client().save_lumi_doc("2401.00003", "1", doc, {"x": 1})
+
+        resp = self.client.get("/api/lumi-doc/2401.00003/1")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers["content-type"], "application/json")
+        self.assertIn("etag", resp.headers)
+        self.assertEqual(
+            resp.json(),
+            {
+                "arxiv_id": "2401.00003",
+                "version": "1",
+                "doc": doc,
+                "summaries": {"x": 1},
+                "signed_urls": None,
+                "signed_urls_expire_at": None,
+                "initial_sections": None,
+            },
+        )
+
+        section = self.client.get("/api/lumi-doc-section/2401.00003/1/s1")
+        self.assertEqual(section.json()["section"], {"id": "s1"})
+        missing = self.client.get("/api/lumi-doc-section/2401.00003/1/s2")
+        self.assertEqual(missing.status_code, 404)
+
+    def test_lumi_doc_sections_batch_and_initial_bundle(self):
+        sections = [{"id": f"s{i}", "contents": [{"n": i}]} for i in range(4)]
+        get_db_client().save_lumi_doc(
+            "2401.00005", "1", {"metadata": {}, "sections": sections}, {}
+        )
+        # One chunk comes from storage, the rest fall back to the stored doc.
+        get_storage_client().upload_json(
+            "papers/2401.00005/v1/sections/s2.json", sections[2]
+        )
+
+        resp = self.client.get(
+            "/api/lumi-doc-sections/2401.00005/1", params={"ids": "s2,s0,nope,s2"}
+        )
+        self.assertEqual(resp.status_code, 200)
+        payload = resp.json()
+        self.assertEqual(payload["sections"], [sections[2], sections[0]])
+        self.assertEqual(payload["missing"], ["nope"])
+        cached = self.client.get(
+            "/api/lumi-doc-sections/2401.00005/1",
+            params={"ids": "s2,s0,nope,s2"},
+            headers={"If-None-Match": resp.headers["etag"]},
+        )
+        self.assertEqual(cached.status_code, 304)
+
+        bundle = self.client.get(
+            "/api/lumi-doc-index/2401.00005/1", params={"include_sections": 3}
+        ).json()
+        self.assertEqual(bundle["initial_sections"], sections[:3])
+        self.assertEqual(bundle["doc"]["sections"], [])
+
+        too_many = ",".join(f"x{i}" for i in range(51))
+        resp = self.client.get(
+            "/api/lumi-doc-sections/2401.00005/1", params={"ids": too_many}
+        )
+        self.assertEqual(resp.status_code, 400)
+
+    def test_missing_section_chunk_is_read_by_offset_and_repaired(self):
+        sections = [
+            {"id": "s1", "subSections": [{"id": "s1a", "contents": []}]},
+            {"id": "s2", "contents": []},
+        ]
+        doc = {"metadata": {}, "sections": sections}
+        db = get_db_client()
+        storage = get_storage_client()
+        db.save_lumi_doc("2401.00006", "1", doc, {})
+        publish_doc_chunks(storage, "2401.00006", "1", doc)
+        chunk_path = "papers/2401.00006/v1/sections/s1a.json"
+        self.assertNotIn(chunk_path, storage.stored_objects)
+
+        with mock.patch.object(db, "get_lumi_doc") as get_lumi_doc:
+            resp = self.client.get("/api/lumi-doc-section/2401.00006/1/s1a")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["section"], sections[0]["subSections"][0])
+        get_lumi_doc.assert_not_called()
+        self.assertEqual(
+            json.loads(storage.get_bytes(chunk_path)), sections[0]["subSections"][0]
+        )
+
+    def test_get_lumi_response_stream(self):
+        get_db_client().save_lumi_doc(
+            "2401.00004", "1", {"metadata": {}, "sections": []}, {}
+        )
+        with mock.patch(
+            "answers.answers.gemini.call_predict_stream",
+            return_value=iter(["Hello ", "**world**"]),
+        ):
+            resp = self.client.post(
+                "/api/get_lumi_response_stream",
+                json={"arxiv_id": "2401.00004", "version": "1", "query": "hi"},
+            )
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers["content-type"].startswith("text/event-stream"))
+        events = []
+        for block in resp.text.strip().split("\n\n"):
+            event_line, data_line = block.split("\n")
+            events.append(
+                (event_line.removeprefix("event: "), json.loads(data_line[6:]))
+            )
+        self.assertEqual(
+            events[:2],
+            [("chunk", {"text": "Hello "}), ("chunk", {"text": "**world**"})],
+        )
+        name, final = events[2]
+        self.assertEqual(name, "answer")
+        self.assertEqual(final["answer"]["request"]["query"], "hi")
+        self.assertTrue(final["answer"]["responseContent"])
+
+    def test_get_lumi_response_stream_not_found(self):
+        resp = self.client.post(
+            "/api/get_lumi_response_stream",
+            json={"arxiv_id": "missing", "version": "1", "query": "hi"},
+        )
+        self.assertEqual(resp.status_code, 404)
+
     def test_get_lumi_doc_not_found(self):
         resp = self.client.get("/api/lumi-doc/doesnotexist/1")
         self.assertEqual(resp.status_code, 404)
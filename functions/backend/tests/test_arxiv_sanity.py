@@ -0,0 +1,623 @@
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+from fastapi.testclient import TestClient
+
+from backend.app import create_app
+from backend.arxiv_sanity import (
+    ArxivExportClient,
+    ArxivPaper,
+    ArxivSanityStore,
+    RateLimiter,
+    recent_cursor,
+)
+from backend.arxiv_similarity import build_similarity_index
+from backend.dependencies import get_arxiv_sanity_store
+
+
+def make_paper(
+    paper_id: str,
+    title: str,
+    summary: str = "",
+    authors: list[str] | None = None,
+    categories: list[str] | None = None,
+    updated_time: float = 1.0,
+) -> ArxivPaper:
+    return ArxivPaper(
+        paper_id=paper_id,
+        version="1",
+        title=title,
+        summary=summary,
+        authors=authors or ["A. Author"],
+        updated_timestamp="",
+        published_timestamp="",
+        updated_time=updated_time,
+        published_time=updated_time,
+        categories=categories or ["cs.LG"],
+    )
+
+
+class ArxivSanitySearchTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = ArxivSanityStore(self._tmp.name)
+        filler = "We study several unrelated problems in depth. " * 5
+        self.store.upsert_papers(
+            [
+                make_paper(
+                    "1", "Attention is all you need", filler, ["A. Vaswani"], ["cs.CL"]
+                ),
+                make_paper(
+                    "2", "Residual learning", filler + "attention", ["K. He"], ["cs.CV"]
+                ),
+                make_paper(
+                    "3", "Image transformers", filler, ["L. Attention"], ["cs.CV"]
+                ),
+                make_paper("4", "Graph kernels", filler, ["B. Other"], ["cs.LG"]),
+            ]
+        )
+
+    def test_title_outranks_author_outranks_summary(self):
+        results, total = self.store.search("attention", limit=10)
+        self.assertEqual(total, 3)
+        self.assertEqual([paper.paper_id for paper, _ in results], ["1", "3", "2"])
+        scores = [score for _, score in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_prefix_match_category_filter_and_paging(self):
+        results, total = self.store.search("transform", limit=10)
+        self.assertEqual([paper.paper_id for paper, _ in results], ["3"])
+
+        results, total = self.store.search(
+            "attention", limit=1, offset=1, categories=["cs.CV"]
+        )
+        self.assertEqual(total, 2)
+        self.assertEqual([paper.paper_id for paper, _ in results], ["2"])
+
+        self.assertEqual(self.store.search("  ?! ", limit=10), ([], 0))
+
+    def test_index_follows_updates(self):
+        self.store.upsert_papers(
+            [make_paper("4", "Graph attention networks", updated_time=2.0)]
+        )
+        results, _ = self.store.search("graph attention", limit=1)
+        self.assertEqual(results[0][0].paper_id, "4")
+        _, total = self.store.search("kernels", limit=10)
+        self.assertEqual(total, 0)
+
+
+class ArxivSanityWriteTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = ArxivSanityStore(self._tmp.name)
+        self.addCleanup(self.store.close)
+
+    def test_upsert_only_counts_newer_versions(self):
+        papers = [make_paper(str(idx), f"Paper {idx}") for idx in range(5)]
+        self.assertEqual(self.store.upsert_papers(papers), 5)
+        self.assertEqual(self.store.upsert_papers(papers), 0)
+        newer = make_paper("2", "Revised", updated_time=2.0)
+        stale = make_paper("3", "Stale", updated_time=0.5)
+        self.assertEqual(self.store.upsert_papers([newer, stale]), 1)
+        papers, _ = self.store.list_recent(limit=10)
+        titles = {paper.paper_id: paper.title for paper in papers}
+        self.assertEqual(titles["2"], "Revised")
+        self.assertEqual(titles["3"], "Paper 3")
+        self.assertEqual(self.store.upsert_papers([]), 0)
+
+    def test_readers_do_not_wait_for_an_open_write(self):
+        self.store.upsert_papers([make_paper("1", "Committed")])
+        writer = sqlite3.connect(self.store.db_path)
+        self.addCleanup(writer.close)
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("UPDATE papers SET title = 'Uncommitted'")
+        papers, _ = self.store.list_recent(limit=10)
+        self.assertEqual([paper.title for paper in papers], ["Committed"])
+        mode = writer.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_connection_is_reused_per_thread(self):
+        self.assertIs(self.store._connect(), self.store._connect())
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.store._connect()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], self.store._connect())
+
+
+ATOM_ENTRY = """
+<entry>
+  <id>http://arxiv.org/abs/{paper_id}v1</id>
+  <updated>{updated}</updated>
+  <published>{updated}</published>
+  <title>Paper {paper_id}</title>
+  <summary>About {paper_id}.</summary>
+  <author><name>A. Author</name></author>
+  <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+</entry>
+"""
+
+
+class FakeExportApi:
+    """
+    Serves recorded (paper_id, updated) entries like the export API would:
+    filtered by the lastUpdatedDate window, oldest first, paged.
+    """
+
+    def __init__(self, entries: list[tuple[str, str]]):
+        self.entries = sorted(entries, key=lambda entry: entry[1])
+        self.urls: list[str] = []
+
+    def __call__(self, url: str) -> bytes:
+        self.urls.append(url)
+        params = parse_qs(urlsplit(url).query)
+        since, until = re.search(
+            r"lastUpdatedDate:\[(\d{12})\+TO\+(\d{12})\]", url
+        ).groups()
+        start = int(params["start"][0])
+        size = int(params["max_results"][0])
+        matching = [
+            (paper_id, updated)
+            for paper_id, updated in self.entries
+            if since <= re.sub(r"\D", "", updated)[:12] <= until
+        ]
+        body = "".join(
+            ATOM_ENTRY.format(paper_id=paper_id, updated=updated)
+            for paper_id, updated in matching[start : start + size]
+        )
+        return (
+            '<feed xmlns="http://www.w3.org/2005/Atom">' + body + "</feed>"
+        ).encode("utf-8")
+
+
+def updated_at(day: int, hour: int = 0) -> str:
+    return f"2024-03-{day:02d}T{hour:02d}:00:00Z"
+
+
+class ArxivSanityIngestTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = ArxivSanityStore(self._tmp.name)
+        self.api = FakeExportApi(
+            [
+                (f"2403.{idx:05d}", updated_at(1 + idx // 24, idx % 24))
+                for idx in range(240)
+            ]
+        )
+        self.client = ArxivExportClient(get=self.api, min_interval=0)
+        self.now = datetime(2024, 3, 11, tzinfo=timezone.utc)
+
+    def test_ingest_resumes_from_high_water_mark(self):
+        updated = self.store.ingest(
+            query="cat:cs.LG",
+            num=150,
+            lookback_days=30,
+            client=self.client,
+            now=self.now,
+        )
+        self.assertEqual(updated, 150)
+        self.assertEqual(len(self.api.urls), 2)
+        mark = self.store.get_high_water_mark("cat:cs.LG")
+        self.assertEqual(mark, updated_at(7, 5))
+
+        updated = self.store.ingest(
+            query="cat:cs.LG", num=500, client=self.client, now=self.now
+        )
+        self.assertEqual(updated, 90)
+        self.assertIn(
+            "lastUpdatedDate:[202403070500+TO+202403110000]", self.api.urls[2]
+        )
+        mark = self.store.get_high_water_mark("cat:cs.LG")
+        self.assertEqual(mark, updated_at(10, 23))
+
+        # Nothing new: one request, nothing written.
+        urls_before = len(self.api.urls)
+        self.assertEqual(
+            self.store.ingest(query="cat:cs.LG", client=self.client, now=self.now), 0
+        )
+        self.assertEqual(len(self.api.urls), urls_before + 1)
+        _, total = self.store.list_recent(limit=1)
+        self.assertEqual(total, 240)
+
+    def test_first_run_uses_lookback(self):
+        updated = self.store.ingest(
+            query="cat:cs.LG", lookback_days=1, client=self.client, now=self.now
+        )
+        self.assertEqual(updated, 24)
+
+    def test_backfill_windows_cover_the_range(self):
+        updated = self.store.backfill(
+            query="cat:cs.LG",
+            since=datetime(2024, 3, 1, tzinfo=timezone.utc),
+            until=self.now,
+            window_days=3,
+            workers=3,
+            client=self.client,
+        )
+        # Windows share their boundary minute; upserts skip the repeats.
+        self.assertEqual(updated, 240)
+        self.assertEqual(len(self.api.urls), 4)
+        self.assertIsNone(self.store.get_high_water_mark("cat:cs.LG"))
+
+    def test_rate_limiter_spaces_requests(self):
+        clock = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        limiter = RateLimiter(3.0, clock=lambda: clock[0], sleep=sleep)
+        limiter.wait()
+        clock[0] += 1.0
+        limiter.wait()
+        limiter.wait()
+        self.assertEqual(sleeps, [2.0, 3.0])
+
+
+class ArxivSanityRecentTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = ArxivSanityStore(self._tmp.name)
+        categories = [["cs.CV"], ["cs.LG"], ["cs.CV", "cs.LG"], ["cs.RO"]]
+        self.store.upsert_papers(
+            [
+                make_paper(
+                    f"p{idx:02d}",
+                    f"Paper {idx}",
+                    categories=categories[idx % 4],
+                    # Pairs share a timestamp so paper_id breaks the tie.
+                    updated_time=float(idx // 2),
+                )
+                for idx in range(20)
+            ]
+        )
+
+    def _walk(self, categories=None, page_size=3):
+        ids, cursor = [], None
+        while True:
+            papers, total = self.store.list_recent(
+                limit=page_size, categories=categories, cursor=cursor
+            )
+            ids.extend(paper.paper_id for paper in papers)
+            if len(papers) < page_size:
+                return ids, total
+            cursor = recent_cursor(papers[-1])
+
+    def test_cursor_pages_cover_everything_in_order(self):
+        ids, total = self._walk()
+        self.assertEqual(total, 20)
+        self.assertEqual(ids, [f"p{idx:02d}" for idx in reversed(range(20))])
+
+        offset_page, _ = self.store.list_recent(limit=3, offset=3)
+        self.assertEqual([paper.paper_id for paper in offset_page], ids[3:6])
+
+    def test_category_filter_merges_categories(self):
+        ids, total = self._walk(categories=["cs.CV", "cs.RO"])
+        expected = [
+            f"p{idx:02d}" for idx in reversed(range(20)) if idx % 4 in (0, 2, 3)
+        ]
+        self.assertEqual(ids, expected)
+        self.assertEqual(total, len(expected))
+
+    def test_categories_follow_updates(self):
+        self.store.upsert_papers(
+            [make_paper("p01", "Moved", categories=["cs.RO"], updated_time=99.0)]
+        )
+        papers, total = self.store.list_recent(limit=1, categories=["cs.RO"])
+        self.assertEqual(papers[0].paper_id, "p01")
+        self.assertEqual(total, 6)
+        _, lg_total = self.store.list_recent(limit=1, categories=["cs.LG"])
+        self.assertEqual(lg_total, 9)
+
+    def test_route_returns_next_cursor(self):
+        app = create_app()
+        app.dependency_overrides[get_arxiv_sanity_store] = lambda: self.store
+        client = TestClient(app)
+
+        first = client.get("/api/arxiv-sanity/recent", params={"page_size": 15})
+        body = first.json()
+        self.assertEqual(len(body["papers"]), 15)
+        second = client.get(
+            "/api/arxiv-sanity/recent",
+            params={"page_size": 15, "cursor": body["next_cursor"]},
+        ).json()
+        self.assertEqual(len(second["papers"]), 5)
+        self.assertIsNone(second["next_cursor"])
+
+        bad = client.get("/api/arxiv-sanity/recent", params={"cursor": "%%%"})
+        self.assertEqual(bad.status_code, 400)
+
+
+class ArxivSanityAuthorTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = ArxivSanityStore(self._tmp.name)
+        self.store.upsert_papers(
+            [
+                make_paper("1", "One", authors=["Yann LeCun", "J. Müller"]),
+                make_paper("2", "Two", authors=["Yann LeCun"], updated_time=2.0),
+                make_paper("3", "Three", authors=["Yannis Other"], updated_time=3.0),
+            ]
+        )
+
+    def test_prefix_matches_full_name_and_surname(self):
+        authors = self.store.list_authors("yann", limit=10)
+        self.assertEqual(
+            [(a["key"], a["paper_count"]) for a in authors],
+            [("yann lecun", 2), ("yannis other", 1)],
+        )
+        self.assertEqual(
+            [a["name"] for a in self.store.list_authors("LECU", limit=10)],
+            ["Yann LeCun"],
+        )
+        self.assertEqual(
+            [a["key"] for a in self.store.list_authors("mull", limit=10)],
+            ["j muller"],
+        )
+        self.assertEqual(self.store.list_authors(" .. ", limit=10), [])
+
+    def test_author_papers_follow_updates(self):
+        papers, total = self.store.list_author_papers("yann lecun", limit=10)
+        self.assertEqual([paper.paper_id for paper in papers], ["2", "1"])
+        self.assertEqual(total, 2)
+
+        self.store.upsert_papers(
+            [make_paper("1", "One v2", authors=["J. Müller"], updated_time=4.0)]
+        )
+        papers, total = self.store.list_author_papers("yann lecun", limit=10)
+        self.assertEqual(([paper.paper_id for paper in papers], total), (["2"], 1))
+        # A stale version does not touch the index.
+        self.store.upsert_papers(
+            [make_paper("1", "Old", authors=["Yann LeCun"], updated_time=0.5)]
+        )
+        _, total = self.store.list_author_papers("yann lecun", limit=10)
+        self.assertEqual(total, 1)
+        self.store.upsert_papers(
+            [make_paper("2", "Two v2", authors=["Someone"], updated_time=5.0)]
+        )
+        self.assertIsNone(self.store.list_author_papers("yann lecun", limit=10))
+
+    def test_routes(self):
+        app = create_app()
+        app.dependency_overrides[get_arxiv_sanity_store] = lambda: self.store
+        client = TestClient(app)
+        authors = client.get("/api/arxiv-sanity/authors", params={"prefix": "yann"})
+        key = authors.json()["authors"][0]["key"]
+        first = client.get(
+            f"/api/arxiv-sanity/author/{key}", params={"page_size": 1}
+        ).json()
+        self.assertEqual(first["papers"][0]["metadata"]["paperId"], "2")
+        second = client.get(
+            f"/api/arxiv-sanity/author/{key}",
+            params={"page_size": 1, "cursor": first["next_cursor"]},
+        ).json()
+        self.assertEqual(second["papers"][0]["metadata"]["paperId"], "1")
+        missing = client.get("/api/arxiv-sanity/author/nobody")
+        self.assertEqual(missing.status_code, 404)
+
+
+class ArxivSanitySimilarTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = ArxivSanityStore(self._tmp.name)
+        topics = [
+            "diffusion denoising score sampler image generation",
+            "reinforcement policy reward agent environment",
+            "graph message passing node edge neighborhood",
+        ]
+        self.store.upsert_papers(
+            [
+                make_paper(f"{idx // 3}.{idx % 3}", f"Paper {idx}", topics[idx % 3])
+                for idx in range(12)
+            ]
+        )
+
+    def _build(self):
+        build_similarity_index(
+            self.store.db_path,
+            self.store.similarity_dir,
+            min_df=1,
+            max_df_fraction=0.5,
+        )
+
+    def test_similar_papers_share_a_topic(self):
+        self.assertIsNone(self.store.similar("0.0", limit=5))
+        os.makedirs(self.store.similarity_dir)
+        self._build()
+        results = self.store.similar("0.0", limit=5)
+        ids = [paper.paper_id for paper, _ in results]
+        self.assertEqual(sorted(ids), ["1.0", "2.0", "3.0"])
+        self.assertAlmostEqual(results[0][1], 1.0, places=5)
+        self.assertIsNone(self.store.similar("missing", limit=5))
+
+    def test_new_build_is_picked_up(self):
+        os.makedirs(self.store.similarity_dir)
+        self._build()
+        self.assertIsNone(self.store.similar("9.9", limit=5))
+        self.store.upsert_papers(
+            [make_paper("9.9", "Late", "graph message passing node edge")]
+        )
+        self._build()
+        self.store._similarity.check_seconds = 0
+        results = self.store.similar("9.9", limit=2)
+        self.assertEqual([paper.paper_id[-1] for paper, _ in results], ["2", "2"])
+
+    def test_route(self):
+        os.makedirs(self.store.similarity_dir)
+        self._build()
+        app = create_app()
+        app.dependency_overrides[get_arxiv_sanity_store] = lambda: self.store
+        client = TestClient(app)
+        resp = client.get("/api/arxiv-sanity/similar/0.1", params={"page_size": 2})
+        self.assertEqual(resp.status_code, 200)
+        body = resp.json()
+        self.assertEqual(len(body["papers"]), 2)
+        self.assertGreater(body["papers"][0]["score"], 0)
+        missing = client.get("/api/arxiv-sanity/similar/none")
+        self.assertEqual(missing.status_code, 404)
+
+
+class ArxivSanityRecommendTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = ArxivSanityStore(self._tmp.name)
+        topics = [
+            "diffusion denoising score sampler image generation",
+            "reinforcement policy reward agent environment",
+            "graph message passing node edge neighborhood",
+        ]
+        self.store.upsert_papers(
+            [
+                make_paper(
+                    f"{idx // 3}.{idx % 3}",
+                    f"Paper {idx}",
+                    topics[idx % 3],
+                    updated_time=1000.0 + idx,
+                )
+                for idx in range(12)
+            ]
+        )
+        os.makedirs(self.store.similarity_dir)
+        build_similarity_index(
+            self.store.db_path,
+            self.store.similarity_dir,
+            min_df=1,
+            max_df_fraction=0.5,
+        )
+
+    def test_library_topic_ranks_first_and_library_is_excluded(self):
+        stored = self.store.build_recommendations(["0.2", "1.2"], window_days=None)
+        self.assertEqual(stored, 10)
+        results, total = self.store.list_recommended(limit=2)
+        self.assertEqual(total, 10)
+        self.assertEqual(sorted(p.paper_id for p, _ in results), ["2.2", "3.2"])
+        scores = [score for _, score in self.store.list_recommended(limit=10)[0]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertGreater(scores[1], scores[2])
+
+    def test_window_keep_and_empty_library(self):
+        now = datetime.fromtimestamp(1000.0 + 9, tz=timezone.utc)
+        stored = self.store.build_recommendations(
+            ["0.2"], window_days=5 / 86400, now=now, keep=3
+        )
+        self.assertEqual(stored, 3)
+        results, _ = self.store.list_recommended(limit=10)
+        # Papers 4..11 are in the window; the graph ones lead.
+        self.assertEqual(
+            sorted(p.paper_id for p, _ in results), ["1.2", "2.2", "3.2"]
+        )
+
+        self.assertEqual(self.store.build_recommendations(["missing"]), 0)
+        self.assertEqual(self.store.list_recommended(limit=10), ([], 0))
+
+    def test_route(self):
+        self.store.build_recommendations(["0.0"], window_days=None)
+        app = create_app()
+        app.dependency_overrides[get_arxiv_sanity_store] = lambda: self.store
+        client = TestClient(app)
+        body = client.get(
+            "/api/arxiv-sanity/recommended", params={"page": 2, "page_size": 2}
+        ).json()
+        self.assertEqual((body["total"], body["page"]), (11, 2))
+        # The other diffusion papers rank 1-3.
+        self.assertEqual(
+            [paper["metadata"]["paperId"][-1] for paper in body["papers"]], ["0", "1"]
+        )
+
+
+def snapshot_store(data_dir: str) -> ArxivSanityStore:
+    store = ArxivSanityStore(data_dir, snapshot=True)
+    store.wait_for_snapshot()
+    assert store._live_snapshot() is not None
+    return store
+
+
+class ArxivSanitySnapshotSearchTests(ArxivSanitySearchTests):
+    """The search tests again, served from the in-memory snapshot."""
+
+    def setUp(self):
+        super().setUp()
+        self.store = snapshot_store(self._tmp.name)
+
+
+class ArxivSanitySnapshotRecentTests(ArxivSanityRecentTests):
+    """The recent/cursor tests again, served from the in-memory snapshot."""
+
+    def setUp(self):
+        super().setUp()
+        self.store = snapshot_store(self._tmp.name)
+
+
+class ArxivSanitySnapshotReloadTests(unittest.TestCase):
+    def test_writes_from_another_process_swap_in_a_new_snapshot(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            store = snapshot_store(data_dir)
+            self.assertEqual(store.snapshot_stats()["papers"], 0)
+            # A separate store stands in for the ingest daemon.
+            ArxivSanityStore(data_dir).upsert_papers(
+                [make_paper("1", "Sparse experts", categories=["cs.LG"])]
+            )
+            # Stale snapshot: this read comes from SQLite, and a rebuild starts.
+            papers, total = store.list_recent(limit=5)
+            self.assertEqual((total, papers[0].title), (1, "Sparse experts"))
+            store.wait_for_snapshot()
+            snapshot = store._live_snapshot()
+            self.assertEqual(snapshot.generation, store.generation())
+            results, total = store.search("expert", limit=5, categories=["cs.LG"])
+            self.assertEqual([paper.paper_id for paper, _ in results], ["1"])
+            self.assertEqual(
+                store.search("expert", limit=5, categories=["cs.CV"]), ([], 0)
+            )
+
+
+class ArxivSanityMigrationTests(unittest.TestCase):
+    def test_existing_db_is_indexed_on_open(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            conn = sqlite3.connect(os.path.join(data_dir, "arxiv_sanity.db"))
+            conn.execute(
+                """
+                CREATE TABLE papers (
+                    paper_id TEXT PRIMARY KEY, version TEXT NOT NULL,
+                    title TEXT NOT NULL, summary TEXT NOT NULL,
+                    authors_json TEXT NOT NULL, updated_timestamp TEXT NOT NULL,
+                    published_timestamp TEXT NOT NULL, updated_time REAL NOT NULL,
+                    published_time REAL NOT NULL, categories_json TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "INSERT INTO papers VALUES"
+                " ('9', '1', 'Old paper on diffusion', '', '[\"C. Legacy\"]',"
+                " '', '', 1.0, 1.0, '[\"cs.LG\"]', 1.0)"
+            )
+            conn.commit()
+            conn.close()
+
+            store = ArxivSanityStore(data_dir)
+            results, total = store.search("legacy", limit=10)
+            self.assertEqual(total, 1)
+            self.assertEqual(results[0][0].paper_id, "9")
+            papers, total = store.list_recent(limit=10, categories=["cs.LG"])
+            self.assertEqual([paper.paper_id for paper in papers], ["9"])
+            self.assertEqual(
+                store.list_authors("legacy", limit=5)[0]["key"], "c legacy"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+
+from backend.app import create_app
+from backend.arxiv_sanity import ArxivPaper, ArxivSanityStore
+from backend.arxiv_snippets import (
+    ELLIPSIS,
+    SNIPPET_MAX_CHARS,
+    highlight_paper,
+    match_spans,
+    query_terms,
+    summary_snippet,
+)
+from backend.dependencies import get_arxiv_sanity_store
+
+
+def marked(text: str, spans) -> list[str]:
+    return [text[start:end] for start, end in spans]
+
+
+def js_marked(text: str, spans) -> list[str]:
+    """`text.slice(start, end)` as the client does it, in UTF-16 units."""
+    units = text.encode("utf-16-le")
+    return [units[2 * start : 2 * end].decode("utf-16-le") for start, end in spans]
+
+
+class SnippetTests(unittest.TestCase):
+    def test_prefix_and_diacritic_insensitive_matches(self):
+        title = "Vision Transformers by J. Müller"
+        spans = match_spans(title, query_terms("Transform MULLER"))
+        self.assertEqual(
+            marked(title, [(start, end) for start, end, _ in spans]),
+            ["Transformers", "Müller"],
+        )
+
+    def test_short_summary_is_returned_whole(self):
+        snippet, matches = summary_snippet("Sparse mixture of experts.", ("expert",))
+        self.assertEqual(snippet, "Sparse mixture of experts.")
+        self.assertEqual(marked(snippet, matches), ["experts"])
+
+    def test_window_covers_the_most_distinct_terms(self):
+        filler = "lorem ipsum dolor sit amet " * 20
+        summary = (
+            "We use attention early on. "
+            + filler
+            + "Here sparse attention meets routing experts. "
+            + filler
+        )
+        snippet, matches = summary_snippet(summary, query_terms("attention experts"))
+        self.assertLessEqual(len(snippet), SNIPPET_MAX_CHARS + 2 * len(ELLIPSIS))
+        self.assertTrue(snippet.startswith(ELLIPSIS))
+        self.assertTrue(snippet.endswith(ELLIPSIS))
+        self.assertEqual(marked(snippet, matches), ["attention", "experts"])
+        # Cut at word boundaries.
+        body = snippet[len(ELLIPSIS) : -len(ELLIPSIS)]
+        position = summary.index(body)
+        self.assertEqual(summary[position - 1], " ")
+        self.assertEqual(summary[position + len(body)], " ")
+
+    def test_no_match_falls_back_to_the_opening(self):
+        summary = "word " * 100
+        snippet, matches = summary_snippet(summary, ("missing",))
+        self.assertTrue(snippet.startswith("word"))
+        self.assertTrue(snippet.endswith(ELLIPSIS))
+        self.assertEqual(matches, [])
+
+    def test_offsets_count_utf16_units(self):
+        paper = ArxivPaper(
+            paper_id="2401.00001",
+            version="1",
+            title="𝒪(n) sparse attention",
+            summary="Bounds of 𝒪(log n) 😀 for sparse attention heads.",
+            authors=[],
+            updated_timestamp="",
+            published_timestamp="",
+            updated_time=0.0,
+            published_time=0.0,
+            categories=[],
+        )
+        highlights = highlight_paper(paper, query_terms("attention"))
+        self.assertEqual(highlights["title"], [(13, 22)])
+        self.assertEqual(js_marked(paper.title, highlights["title"]), ["attention"])
+        self.assertEqual(
+            js_marked(highlights["snippet"], highlights["snippet_matches"]),
+            ["attention"],
+        )
+
+
+class SearchHighlightRouteTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        store = ArxivSanityStore(self._tmp.name)
+        summary = "Background material on many topics. " * 30
+        store.upsert_papers(
+            [
+                ArxivPaper(
+                    paper_id=f"2401.{idx:05d}",
+                    version="1",
+                    title=f"Diffusion models part {idx}",
+                    summary=summary + "Our diffusion sampler is fast. " + summary,
+                    authors=["A. Author"],
+                    updated_timestamp="",
+                    published_timestamp="",
+                    updated_time=float(idx),
+                    published_time=float(idx),
+                    categories=["cs.LG"],
+                )
+                for idx in range(10)
+            ]
+        )
+        app = create_app()
+        app.dependency_overrides[get_arxiv_sanity_store] = lambda: store
+        self.client = TestClient(app)
+
+    def test_highlights_and_compact_mode(self):
+        params = {"query": "diffusion sampler"}
+        full = self.client.get("/api/arxiv-sanity/search", params=params)
+        compact = self.client.get(
+            "/api/arxiv-sanity/search", params={**params, "compact": "true"}
+        )
+        paper = compact.json()["papers"][0]
+        self.assertIsNone(paper["metadata"]["summary"])
+        highlights = paper["highlights"]
+        self.assertEqual(
+            marked(paper["metadata"]["title"], highlights["title"]), ["Diffusion"]
+        )
+        self.assertEqual(
+            marked(highlights["snippet"], highlights["snippet_matches"]),
+            ["diffusion", "sampler"],
+        )
+        self.assertIsNotNone(full.json()["papers"][0]["metadata"]["summary"])
+        self.assertLess(len(compact.content), len(full.content) / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
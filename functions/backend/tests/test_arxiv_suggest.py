@@ -0,0 +1,159 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from backend import arxiv_suggest
+from backend.app import create_app
+from backend.arxiv_sanity import ArxivPaper, ArxivSanityStore
+from backend.arxiv_suggest import SuggestIndex
+from backend.dependencies import get_arxiv_sanity_store
+
+
+def make_paper(paper_id: str, title: str, updated_time: float) -> ArxivPaper:
+    return ArxivPaper(
+        paper_id=paper_id,
+        version="1",
+        title=title,
+        summary="",
+        authors=["A. Author"],
+        updated_timestamp="",
+        published_timestamp="",
+        updated_time=updated_time,
+        published_time=updated_time,
+        categories=["cs.LG"],
+    )
+
+
+class SuggestIndexTests(unittest.TestCase):
+    def setUp(self):
+        # Row ids 10, 11, ... oldest first.
+        self.index = SuggestIndex.build(
+            enumerate(
+                [
+                    "Attention is all you need",
+                    "Graph attention networks",
+                    "Attentive Neural Processes",
+                    "Déjà vu: contextual sparsity",
+                    "Graph neural networks",
+                ],
+                start=10,
+            )
+        )
+
+    def test_every_word_is_a_prefix_newest_first(self):
+        self.assertEqual(self.index.lookup(["atten"], 10), [12, 11, 10])
+        self.assertEqual(self.index.lookup(["graph", "att"], 10), [11])
+        self.assertEqual(self.index.lookup(["net", "gra"], 1), [14])
+        self.assertEqual(self.index.lookup(["deja"], 10), [13])
+        self.assertEqual(self.index.lookup(["attention", "graph", "zzz"], 10), [])
+
+    def test_skip_mask_and_rowid_lookup(self):
+        skip = self.index.rowids == 11
+        self.assertEqual(self.index.lookup(["graph"], 10, skip=skip), [14])
+        self.assertEqual(
+            self.index.rowids[self.index.docs_for_rowids([14, 99, 10])].tolist(),
+            [14, 10],
+        )
+
+    def test_large_prefix_reads_term_heads(self):
+        with mock.patch.object(arxiv_suggest, "EXACT_POSTINGS_LIMIT", 1):
+            self.assertEqual(self.index.lookup(["att"], 2), [12, 11])
+            self.assertEqual(self.index.lookup(["n", "graph"], 5), [14, 11])
+
+
+class StoreSuggestTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = ArxivSanityStore(self._tmp.name)
+        self.store.upsert_papers(
+            [
+                make_paper("2301.00001", "Attention is all you need", 1.0),
+                make_paper("2301.00002", "Graph attention networks", 2.0),
+                make_paper("2402.00003", "Attentive Neural Processes", 3.0),
+            ]
+        )
+
+    def suggest_ids(self, query: str, limit: int = 10) -> list[str]:
+        return [s["paper_id"] for s in self.store.suggest(query, limit=limit)]
+
+    def test_falls_back_to_fts_until_the_index_loads(self):
+        with mock.patch.object(self.store, "_start_suggester_refresh"):
+            self.assertEqual(
+                self.suggest_ids("attent"), ["2402.00003", "2301.00002", "2301.00001"]
+            )
+            self.assertEqual(self.suggest_ids("graph att"), ["2301.00002"])
+        self.store.wait_for_suggester()
+
+    def test_ids_then_titles_and_incremental_refresh(self):
+        self.store.refresh_suggester()
+        self.assertEqual(
+            self.suggest_ids("arXiv:2301.0"), ["2301.00002", "2301.00001"]
+        )
+        self.assertEqual(self.suggest_ids("att", limit=2), ["2402.00003", "2301.00002"])
+
+        self.store.upsert_papers(
+            [
+                make_paper("2301.00001", "Sparse mixtures of experts", 4.0),
+                make_paper("2403.00004", "Attention sinks", 5.0),
+            ]
+        )
+        self.store.refresh_suggester()
+        self.assertEqual(self.store.suggest_stats()["delta_papers"], 2)
+        self.assertEqual(
+            self.suggest_ids("att"), ["2403.00004", "2402.00003", "2301.00002"]
+        )
+        self.assertEqual(self.suggest_ids("sparse exp"), ["2301.00001"])
+
+        # Outgrowing the delta rebuilds the base.
+        self.store._suggester.delta_limit = 0
+        self.store.upsert_papers([make_paper("2403.00005", "Sparse attention", 6.0)])
+        self.store.refresh_suggester()
+        self.assertEqual(self.store.suggest_stats()["delta_papers"], 0)
+        self.assertEqual(self.suggest_ids("sparse"), ["2403.00005", "2301.00001"])
+
+    def test_starts_on_an_empty_store(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            store = ArxivSanityStore(data_dir)
+            store.refresh_suggester()
+            self.assertEqual(store.suggest("attention", limit=5), [])
+            store.upsert_papers([make_paper("2501.00001", "Attention sinks", 1.0)])
+            store.refresh_suggester()
+            self.assertEqual(
+                [s["paper_id"] for s in store.suggest("attention", limit=5)],
+                ["2501.00001"],
+            )
+            store.close()
+
+    def test_index_is_bounded_to_the_newest_papers(self):
+        store = ArxivSanityStore(self._tmp.name, suggest_max_papers=2)
+        store.refresh_suggester()
+        self.assertEqual(store.suggest_stats()["base_papers"], 2)
+        suggestions = store.suggest("attention", limit=10)
+        self.assertNotIn("2301.00001", [s["paper_id"] for s in suggestions])
+
+    def test_route(self):
+        self.store.refresh_suggester()
+        app = create_app()
+        app.dependency_overrides[get_arxiv_sanity_store] = lambda: self.store
+        client = TestClient(app)
+        response = client.get(
+            "/api/arxiv-sanity/suggest", params={"q": "neural proc", "limit": 3}
+        )
+        self.assertEqual(
+            response.json(),
+            {
+                "suggestions": [
+                    {"paper_id": "2402.00003", "title": "Attentive Neural Processes"}
+                ]
+            },
+        )
+        self.assertEqual(
+            client.get("/api/arxiv-sanity/suggest", params={"q": ""}).status_code, 422
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
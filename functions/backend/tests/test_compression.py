@@ -0,0 +1,102 @@
+import gzip
+import unittest
+
+import brotli
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.compression import CompressionMiddleware, choose_encoding
+
+PAYLOAD = b'{"doc": "' + b"lumi " * 2000 + b'"}'
+
+
+def build_app() -> CompressionMiddleware:
+    app = FastAPI()
+
+    @app.get("/doc")
+    def doc():
+        return Response(
+            PAYLOAD, media_type="application/json", headers={"ETag": '"v1"'}
+        )
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(
+            iter([b"data: one\n\n", b"data: two\n\n"]),
+            media_type="text/event-stream",
+        )
+
+    @app.get("/chunks")
+    def chunks():
+        return StreamingResponse(
+            iter([PAYLOAD[:5000], PAYLOAD[5000:]]), media_type="application/json"
+        )
+
+    return CompressionMiddleware(app, minimum_size=500)
+
+
+class CompressionMiddlewareTests(unittest.TestCase):
+    def setUp(self):
+        self.middleware = build_app()
+        self.client = TestClient(self.middleware)
+
+    def get_raw(self, path: str, accept: str):
+        with self.client.stream(
+            "GET", path, headers={"Accept-Encoding": accept}
+        ) as response:
+            return response, b"".join(response.iter_raw())
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding("gzip, br", ("br", "gzip")), "br")
+        self.assertEqual(choose_encoding("br;q=0.5, gzip", ("br", "gzip")), "gzip")
+        self.assertEqual(choose_encoding("identity", ("br", "gzip")), None)
+        self.assertEqual(choose_encoding("*", ("br", "gzip")), "br")
+        self.assertEqual(choose_encoding("br;q=0", ("br", "gzip")), None)
+
+    def test_brotli_and_gzip_negotiation(self):
+        response, body = self.get_raw("/doc", "br")
+        self.assertEqual(response.headers["content-encoding"], "br")
+        self.assertEqual(brotli.decompress(body), PAYLOAD)
+        self.assertEqual(response.headers["etag"], 'W/"v1"')
+        self.assertIn("Accept-Encoding", response.headers["vary"])
+        self.assertLess(len(body), len(PAYLOAD) // 5)
+
+        response, body = self.get_raw("/doc", "gzip")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), PAYLOAD)
+        self.assertEqual(int(response.headers["content-length"]), len(body))
+
+    def test_compressed_body_is_reused_per_etag(self):
+        self.get_raw("/doc", "gzip")
+        self.get_raw("/doc", "gzip")
+        self.get_raw("/doc", "br")
+        stats = self.middleware.cache.stats
+        self.assertEqual((stats.hits, stats.misses), (1, 2))
+
+    def test_small_and_identity_responses_are_not_compressed(self):
+        response, body = self.get_raw("/small", "gzip")
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(body, b'{"ok": true}')
+        response, body = self.get_raw("/doc", "identity")
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(body, PAYLOAD)
+        self.assertIn("Accept-Encoding", response.headers["vary"])
+
+    def test_event_streams_pass_through(self):
+        response, body = self.get_raw("/events", "gzip, br")
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(body, b"data: one\n\ndata: two\n\n")
+
+    def test_streamed_json_is_compressed_incrementally(self):
+        response, body = self.get_raw("/chunks", "gzip")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), PAYLOAD)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import json
 import unittest
 
 from backend.db import FeedbackRecord, PostgresDbClient
@@ -59,6 +60,40 @@ class PostgresDbClientTests(unittest.TestCase):
         self.assertEqual(loaded[0], doc)
         self.assertEqual(loaded[1], summaries)
 
+    def test_get_lumi_doc_updated_at(self):
+        self.assertIsNone(self.db.get_lumi_doc_updated_at("missing", "1"))
+        self.db.save_lumi_doc("paper-ts", "1", {"a": 1}, {})
+        first = self.db.get_lumi_doc_updated_at("paper-ts", "1")
+        self.assertIsNotNone(first)
+        self.db.save_lumi_doc("paper-ts", "1", {"a": 2}, {})
+        self.assertGreaterEqual(self.db.get_lumi_doc_updated_at("paper-ts", "1"), first)
+
+    def test_get_lumi_doc_raw(self):
+        self.assertIsNone(self.db.get_lumi_doc_raw("missing", "1"))
+        self.db.save_lumi_doc("paper-raw", "1", {"title": "café"}, {"s": [1]})
+        doc_raw, summaries_raw = self.db.get_lumi_doc_raw("paper-raw", "1")
+        self.assertEqual(json.loads(doc_raw), {"title": "café"})
+        self.assertEqual(json.loads(summaries_raw), {"s": [1]})
+        doc_raw, _ = self.db.get_lumi_doc_raw("paper-raw", "1", include_doc=False)
+        self.assertIsNone(doc_raw)
+
+    def test_list_docs_returns_metadata_only(self):
+        self.db.save_lumi_doc(
+            "paper-list", "1", {"metadata": {"title": "T"}, "sections": [1]}, {}
+        )
+        self.db.save_lumi_doc("paper-nometa", "1", {"sections": []}, {})
+        docs = {(a, v): meta for a, v, meta in self.db.list_docs()}
+        self.assertEqual(docs[("paper-list", "1")], {"title": "T"})
+        self.assertEqual(docs[("paper-nometa", "1")], {})
+
+    def test_list_doc_ids_newest_first_once_per_paper(self):
+        db = PostgresDbClient("sqlite+pysqlite:///:memory:")
+        db.save_lumi_doc("paper-a", "1", {}, {})
+        db.save_lumi_doc("paper-b", "1", {}, {})
+        db.save_lumi_doc("paper-a", "2", {}, {})
+        self.assertEqual(db.list_doc_ids(), ["paper-a", "paper-b"])
+        self.assertEqual(db.list_doc_ids(limit=1), ["paper-a"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+from backend.db import InMemoryDbClient
+from backend.doc_cache import PARSED_SIZE_FACTOR, ParsedDocCache
+from backend.responses import dumps_json
+from shared.lumi_doc_convert import doc_from_dict
+
+DOC = {
+    "markdown": "",
+    "sections": [
+        {
+            "id": "s1",
+            "heading": {"headingLevel": 1, "text": "Intro"},
+            "contents": [
+                {
+                    "id": "c1",
+                    "textContent": {
+                        "tagName": "p",
+                        "spans": [{"id": "sp1", "text": "Hello", "innerTags": []}],
+                    },
+                }
+            ],
+        }
+    ],
+    "concepts": [],
+}
+
+
+class ParsedDocCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.db = InMemoryDbClient()
+        self.cache = ParsedDocCache(max_bytes=10 * 1024 * 1024)
+
+    def test_parses_once_per_update(self):
+        self.db.save_lumi_doc("2401.1", "1", DOC, {})
+        with mock.patch(
+            "backend.doc_cache.doc_from_dict", wraps=doc_from_dict
+        ) as parse:
+            first = self.cache.get(self.db, "2401.1", "1")
+            second = self.cache.get(self.db, "2401.1", "1")
+            self.assertIs(first, second)
+            self.assertEqual(parse.call_count, 1)
+            self.assertIn("sp1", first.spans_string)
+
+            # save_lumi_doc bumps updated_at, so the next read re-parses.
+            self.db.doc_updated_at[("2401.1", "1")] = first.updated_at + 1
+            third = self.cache.get(self.db, "2401.1", "1")
+            self.assertIsNot(third, first)
+            self.assertEqual(parse.call_count, 2)
+
+    def test_entry_is_sized_from_the_stored_json_text(self):
+        self.db.save_lumi_doc("2401.1", "1", DOC, {})
+        with mock.patch.object(self.db, "get_lumi_doc") as get_lumi_doc:
+            parsed = self.cache.get(self.db, "2401.1", "1")
+        get_lumi_doc.assert_not_called()
+        self.assertEqual(
+            self.cache.stats()["bytes"],
+            len(dumps_json(DOC)) * PARSED_SIZE_FACTOR + len(parsed.spans_string),
+        )
+
+    def test_missing_doc(self):
+        self.assertIsNone(self.cache.get(self.db, "missing", "1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import unittest
+
+from backend.doc_chunks import (
+    publish_doc_chunks,
+    read_section_from_artifact,
+    serialize_doc_with_section_offsets,
+)
+from backend.storage import InMemoryStorageClient
+
+DOC = {
+    "metadata": {"title": "Ünïcode title"},
+    "sections": [
+        {
+            "id": "s1",
+            "contents": [{"text": "a"}],
+            "subSections": [{"id": "s1a", "contents": [{"text": "b"}]}],
+        },
+        {"id": "s2", "contents": []},
+    ],
+}
+
+
+class SectionOffsetTests(unittest.TestCase):
+    def test_offsets_cover_sections_and_subsections(self):
+        doc_bytes, offsets = serialize_doc_with_section_offsets(DOC)
+        self.assertEqual(json.loads(doc_bytes), DOC)
+        self.assertEqual(set(offsets), {"s1", "s1a", "s2"})
+        start, end = offsets["s1a"]
+        self.assertEqual(
+            json.loads(doc_bytes[start:end]), DOC["sections"][0]["subSections"][0]
+        )
+
+    def test_read_section_from_artifact(self):
+        storage = InMemoryStorageClient()
+        self.assertEqual(publish_doc_chunks(storage, "p", "1", DOC), 2)
+        raw = read_section_from_artifact(storage, "p", "1", "s2")
+        self.assertEqual(json.loads(raw), DOC["sections"][1])
+        self.assertIsNone(read_section_from_artifact(storage, "p", "1", "nope"))
+        self.assertIsNone(read_section_from_artifact(storage, "q", "1", "s2"))
+
+        # A republished doc with shifted offsets is detected, not misread.
+        storage.stored_objects["papers/p/v1/lumi_doc.json"] = b"{}" * 100
+        self.assertIsNone(read_section_from_artifact(storage, "p", "1", "s2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+import httpx
+
+from backend.app import create_app
+from backend.config import get_settings
+from backend.db import InMemoryDbClient
+from backend.dependencies import get_db_client, get_storage_client
+
+PDF_BYTES = b"%PDF-1.4\n" + b"0" * 4096
+MULTIPART_FILE_HEADER = (
+    b"--x\r\n"
+    b'Content-Disposition: form-data; name="file"; filename="paper.pdf"\r\n'
+    b"Content-Type: application/pdf\r\n\r\n"
+)
+
+
+def slow_title_extraction(pdf_stream, fallback):
+    time.sleep(0.5)
+    return "A Title That Matches No Existing Paper"
+
+
+class LocalPdfUploadTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        db = get_db_client()
+        if isinstance(db, InMemoryDbClient):
+            db.reset()
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=create_app()),
+            base_url="http://test",
+        )
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    def upload(self, content: bytes = PDF_BYTES):
+        return self.client.post(
+            "/api/request_local_pdf_import",
+            files={"file": ("paper.pdf", content, "application/pdf")},
+        )
+
+    async def test_other_routes_stay_responsive_during_upload(self):
+        with mock.patch(
+            "backend.routes._extract_pdf_title_for_dedupe", slow_title_extraction
+        ):
+            upload_task = asyncio.create_task(self.upload())
+            await asyncio.sleep(0.1)
+
+            start = time.perf_counter()
+            listing = await self.client.get("/api/list-papers")
+            elapsed = time.perf_counter() - start
+
+            self.assertEqual(listing.status_code, 200)
+            self.assertFalse(upload_task.done())
+            self.assertLess(elapsed, 0.3)
+
+            response = await upload_task
+        self.assertEqual(response.status_code, 202)
+        arxiv_id = response.json()["arxiv_id"]
+        self.assertEqual(
+            get_storage_client().get_bytes(f"papers/{arxiv_id}/v1/source.pdf"),
+            PDF_BYTES,
+        )
+
+    async def test_rejects_oversized_upload(self):
+        settings = get_settings()
+        original = settings.local_pdf_max_bytes
+        settings.local_pdf_max_bytes = 1024
+        try:
+            response = await self.upload()
+        finally:
+            settings.local_pdf_max_bytes = original
+        self.assertEqual(response.status_code, 413)
+
+    async def call_upload_route(self, headers, body_chunks):
+        """Drive the ASGI app directly; returns (status, bytes read)."""
+        chunks = [MULTIPART_FILE_HEADER, *body_chunks]
+        read = 0
+        sent = []
+
+        async def receive():
+            nonlocal read
+            if not chunks:
+                return {"type": "http.disconnect"}
+            chunk = chunks.pop(0)
+            read += len(chunk)
+            return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/api/request_local_pdf_import",
+            "raw_path": b"/api/request_local_pdf_import",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"content-type", b"multipart/form-data; boundary=x"),
+                *headers,
+            ],
+            "client": ("test", 1),
+            "server": ("test", 80),
+        }
+        settings = get_settings()
+        original = settings.local_pdf_max_bytes
+        settings.local_pdf_max_bytes = 1024
+        try:
+            app = create_app()
+        finally:
+            settings.local_pdf_max_bytes = original
+        await app(scope, receive, send)
+        return sent[0]["status"], read
+
+    async def test_declared_oversized_upload_is_rejected_unread(self):
+        status, read = await self.call_upload_route(
+            [(b"content-length", str(64 * 1024 * 1024).encode())],
+            [b"x" * 1024 * 1024] * 64,
+        )
+        self.assertEqual(status, 413)
+        self.assertEqual(read, 0)
+
+    async def test_undeclared_oversized_upload_is_cut_off(self):
+        status, read = await self.call_upload_route([], [b"x" * 1024 * 1024] * 64)
+        self.assertEqual(status, 413)
+        # Stops at the first chunk past the limit plus multipart allowance.
+        self.assertLessEqual(read, 3 * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from backend.app import create_app
+from backend.dependencies import get_db_client
+from backend.metrics import (
+    Histogram,
+    MetricsRegistry,
+    format_server_timing,
+    instrument,
+    timed,
+)
+
+
+class HistogramTests(unittest.TestCase):
+    def test_render_is_cumulative(self):
+        histogram = Histogram("t_seconds", "Test.", ("route",), (0.1, 1.0))
+        histogram.observe(("/a",), 0.05)
+        histogram.observe(("/a",), 0.5)
+        histogram.observe(("/a",), 5.0)
+        lines = histogram.render()
+        self.assertIn('t_seconds_bucket{route="/a",le="0.1"} 1', lines)
+        self.assertIn('t_seconds_bucket{route="/a",le="1.0"} 2', lines)
+        self.assertIn('t_seconds_bucket{route="/a",le="+Inf"} 3', lines)
+        self.assertIn('t_seconds_count{route="/a"} 3', lines)
+
+    def test_registered_stats_become_gauges(self):
+        registry = MetricsRegistry()
+        registry.register_stats("demo", lambda: {"hits": 3, "hit_rate": 0.75})
+        text = registry.render()
+        self.assertIn("lumi_demo_hits 3", text)
+        self.assertIn("lumi_demo_hit_rate 0.75", text)
+
+
+class InstrumentTests(unittest.TestCase):
+    def test_nested_calls_are_counted_once(self):
+        class Client:
+            def outer(self):
+                return self.inner() + 1
+
+            def inner(self):
+                return 1
+
+        client = instrument(Client(), "db", Client)
+        self.assertIsInstance(client, Client)
+        # Outside a request there is nothing to attribute to.
+        with timed("db"):
+            self.assertEqual(client.outer(), 2)
+
+    def test_server_timing_format(self):
+        self.assertEqual(
+            format_server_timing(0.0125, {"llm": 0.01, "db": 0.001}),
+            "db;dur=1.0, llm;dur=10.0, app;dur=12.5",
+        )
+
+
+class MetricsRouteTests(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(create_app())
+
+    def test_requests_are_recorded_by_route_template(self):
+        get_db_client().save_lumi_doc(
+            "2401.00040", "1", {"metadata": {}, "sections": []}, {}
+        )
+        resp = self.client.get("/api/lumi-doc/2401.00040/1")
+        self.assertEqual(resp.status_code, 200)
+        server_timing = resp.headers["server-timing"]
+        self.assertIn("db;dur=", server_timing)
+        self.assertIn("app;dur=", server_timing)
+
+        metrics = self.client.get("/metrics")
+        self.assertEqual(metrics.status_code, 200)
+        self.assertTrue(metrics.headers["content-type"].startswith("text/plain"))
+        route = "/api/lumi-doc/{arxiv_id}/{version}"
+        self.assertIn(
+            f'lumi_http_requests_total{{method="GET",route="{route}",status="200"}}',
+            metrics.text,
+        )
+        self.assertIn(
+            f'lumi_http_request_duration_seconds_count{{method="GET",route="{route}"}}',
+            metrics.text,
+        )
+        self.assertIn(
+            f'lumi_http_request_subtiming_seconds_count{{route="{route}",kind="db"}}',
+            metrics.text,
+        )
+        self.assertIn(
+            f'lumi_http_response_size_bytes_sum{{method="GET",route="{route}"}}',
+            metrics.text,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from backend.app import create_app
+from backend.dependencies import get_db_client
+from backend.singleflight import SingleFlight
+
+
+class SingleFlightTests(unittest.TestCase):
+    def _run_concurrently(self, flight, key, fn, callers=8):
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return fn()
+
+        with ThreadPoolExecutor(max_workers=callers) as pool:
+            leader = pool.submit(flight.do, key, blocking)
+            started.wait(5)
+            followers = [pool.submit(flight.do, key, blocking) for _ in range(callers - 1)]
+            # Wait until every follower has joined the in-flight call.
+            while flight.stats()["coalesced"] < callers - 1:
+                threading.Event().wait(0.001)
+            release.set()
+            return leader, followers
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+        leader, followers = self._run_concurrently(
+            flight, "k", lambda: calls.append(1) or "value"
+        )
+        self.assertEqual(leader.result(), ("value", False))
+        for future in followers:
+            self.assertEqual(future.result(), ("value", True))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            flight.stats(), {"executions": 1, "coalesced": 7, "in_flight": 0}
+        )
+
+        # Once finished, the next call runs again.
+        self.assertEqual(flight.do("k", lambda: "again"), ("again", False))
+
+    def test_errors_fan_out(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        leader, followers = self._run_concurrently(flight, "k", fail, callers=3)
+        for future in [leader, *followers]:
+            with self.assertRaises(RuntimeError):
+                future.result()
+
+
+class CoalescedAnswerTests(unittest.TestCase):
+    def test_identical_questions_share_one_model_call(self):
+        client = TestClient(create_app())
+        get_db_client().save_lumi_doc(
+            "2401.00030", "1", {"metadata": {}, "sections": []}, {}
+        )
+        release = threading.Event()
+        calls = []
+
+        def slow_predict(*args, **kwargs):
+            calls.append(1)
+            release.wait(5)
+            return "Shared answer."
+
+        body = {"arxiv_id": "2401.00030", "version": "1", "query": "Why?"}
+        with mock.patch(
+            "answers.answers.gemini.call_predict", side_effect=slow_predict
+        ):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [
+                    pool.submit(client.post, "/api/get_lumi_response", json=body)
+                    for _ in range(4)
+                ]
+                threading.Event().wait(0.2)
+                release.set()
+                responses = [future.result() for future in futures]
+
+        self.assertEqual(len(calls), 1)
+        answer_ids = {resp.json()["answer"]["id"] for resp in responses}
+        self.assertEqual(len(answer_ids), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import time
+import unittest
+from unittest import mock
+
+from backend import dependencies
+from backend.config import get_settings
+from backend.storage import (
+    CachedStorageClient,
+    CosStorageClient,
+    InMemoryStorageClient,
+    SignedUrlCache,
+)
+
+
+class CountingStorageClient(InMemoryStorageClient):
+    def __post_init__(self):
+        super().__post_init__()
+        self.get_calls = 0
+
+    def get_bytes(self, path: str, version: object = None) -> bytes:
+        self.get_calls += 1
+        return super().get_bytes(path)
+
+
+class CachedStorageClientTests(unittest.TestCase):
+    def setUp(self):
+        self.inner = CountingStorageClient()
+        self.storage = CachedStorageClient(
+            self.inner,
+            max_bytes=1024,
+            ttl_seconds=60,
+            negative_ttl_seconds=60,
+        )
+
+    def test_read_through_hits_cache(self):
+        self.inner.upload_json("a.json", {"x": 1})
+        self.assertEqual(self.storage.get_bytes("a.json"), b'{"x": 1}')
+        self.assertEqual(self.storage.get_bytes("a.json"), b'{"x": 1}')
+        self.assertEqual(self.inner.get_calls, 1)
+        stats = self.storage.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_missing_keys_are_negatively_cached(self):
+        for _ in range(3):
+            with self.assertRaises(FileNotFoundError):
+                self.storage.get_bytes("missing.json")
+        self.assertEqual(self.inner.get_calls, 1)
+        self.assertEqual(self.storage.stats()["negative_hits"], 2)
+
+    def test_upload_invalidates_entry(self):
+        with self.assertRaises(FileNotFoundError):
+            self.storage.get_bytes("a.json")
+        self.storage.upload_json("a.json", {"x": 2})
+        self.assertEqual(self.storage.get_bytes("a.json"), b'{"x": 2}')
+        self.storage.upload_json("a.json", {"x": 3})
+        self.assertEqual(self.storage.get_bytes("a.json"), b'{"x": 3}')
+
+    def test_new_version_skips_entries_written_elsewhere(self):
+        # The worker writes through its own client; this one is not told.
+        self.inner.upload_json("a.json", {"x": 1})
+        self.assertEqual(self.storage.get_bytes("a.json", version=1.0), b'{"x": 1}')
+        self.inner.upload_json("a.json", {"x": 2})
+        self.assertEqual(self.storage.get_bytes("a.json", version=1.0), b'{"x": 1}')
+        self.assertEqual(self.storage.get_bytes("a.json", version=2.0), b'{"x": 2}')
+        self.assertEqual(self.inner.get_calls, 2)
+        # Writes through this client drop the path under every version.
+        self.storage.get_bytes("a.json")
+        self.storage.upload_json("a.json", {"x": 3})
+        self.assertEqual(self.storage.stats()["entries"], 0)
+        self.assertEqual(self.storage.get_bytes("a.json", version=2.0), b'{"x": 3}')
+
+    def test_read_overlapping_an_upload_is_not_cached(self):
+        self.inner.upload_json("a.json", {"x": 1})
+        read = self.inner.get_bytes
+
+        def slow_read(path, version=None):
+            data = read(path)
+            # The upload lands after the old bytes were read.
+            self.inner.get_bytes = read
+            self.storage.upload_json("a.json", {"x": 2})
+            return data
+
+        self.inner.get_bytes = slow_read
+        self.assertEqual(self.storage.get_bytes("a.json"), b'{"x": 1}')
+        self.assertEqual(self.storage.get_bytes("a.json"), b'{"x": 2}')
+
+    def test_evicts_least_recently_used_by_size(self):
+        self.inner.stored_objects["a"] = b"a" * 600
+        self.inner.stored_objects["b"] = b"b" * 600
+        self.storage.get_bytes("a")
+        self.storage.get_bytes("b")
+        self.storage.get_bytes("a")
+        self.assertEqual(self.inner.get_calls, 3)
+        self.assertLessEqual(self.storage.stats()["bytes"], 1024)
+
+    def test_ttl_expiry(self):
+        storage = CachedStorageClient(
+            self.inner, max_bytes=1024, ttl_seconds=0.01, negative_ttl_seconds=0.01
+        )
+        self.inner.upload_json("a.json", {"x": 1})
+        storage.get_bytes("a.json")
+        time.sleep(0.02)
+        storage.get_bytes("a.json")
+        self.assertEqual(self.inner.get_calls, 2)
+
+    def test_stream_and_range_reads(self):
+        self.inner.stored_objects["doc.pdf"] = b"0123456789"
+        with self.storage.open_stream("doc.pdf") as stream:
+            stream.seek(4)
+            self.assertEqual(stream.read(3), b"456")
+        self.assertEqual(self.storage.get_range("doc.pdf", 2, 5), b"234")
+        # Neither is cached, so a new object is seen at once.
+        self.inner.stored_objects["doc.pdf"] = b"abcdefghij"
+        self.assertEqual(self.storage.get_range("doc.pdf", 7, 10), b"hij")
+        self.assertEqual(self.storage.stats()["entries"], 0)
+        with self.assertRaises(FileNotFoundError):
+            self.storage.get_range("missing.pdf", 0, 1)
+
+
+class StorageDependencyTests(unittest.TestCase):
+    def test_worker_client_bypasses_the_read_cache(self):
+        settings = get_settings().model_copy(
+            update={
+                "use_in_memory_backends": False,
+                "cos_bucket": "bucket",
+                "cos_region": "ap-test",
+                "storage_cache_max_bytes": 1024,
+            }
+        )
+        with mock.patch.multiple(
+            dependencies,
+            get_settings=lambda: settings,
+            _storage_client=None,
+            _uncached_storage_client=None,
+        ):
+            api = dependencies.get_storage_client()
+            worker = dependencies.get_uncached_storage_client()
+        self.assertIsInstance(api, CachedStorageClient)
+        self.assertIsInstance(worker, CosStorageClient)
+        self.assertIs(api.inner, worker)
+
+
+class SignedUrlCacheTests(unittest.TestCase):
+    def test_reuses_url_until_safety_margin(self):
+        storage = InMemoryStorageClient()
+        calls = []
+        presign = storage.presign_get
+        storage.presign_get = lambda path, expires_in=3600: (
+            calls.append(path) or presign(path, expires_in)
+        )
+        cache = SignedUrlCache(safety_margin_seconds=300)
+        first_url, first_expiry = cache.presign_get(storage, "a.png")
+        self.assertEqual(
+            cache.presign_get(storage, "a.png"), (first_url, first_expiry)
+        )
+        self.assertGreater(first_expiry, time.time() + 3000)
+        self.assertEqual(calls, ["a.png"])
+
+        # URLs that would expire inside the safety margin are never reused.
+        cache.presign_get(storage, "b.png", expires_in=120)
+        cache.presign_get(storage, "b.png", expires_in=120)
+        self.assertEqual(calls, ["a.png", "b.png", "b.png"])
+
+
+if __name__ == "__main__":
+    unittest.main()
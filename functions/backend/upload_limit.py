@@ -0,0 +1,83 @@
+"""
+Request body size limits for upload routes.
+
+Starlette parses a multipart body in full (spooling it to disk) before the
+route runs, so a size check inside the route only fires after the whole
+upload has been received. This middleware enforces the limit while the
+body arrives: a declared Content-Length over the limit is rejected without
+reading anything, and a body that grows past it is cut off at that point.
+"""
+
+from __future__ import annotations
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Multipart framing and the small form fields sent next to the file.
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app: ASGIApp, *, limits: dict[str, int]):
+        """`limits` maps a request path to its largest accepted body."""
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        max_bytes = self.limits.get(scope.get("path", ""))
+        if scope["type"] != "http" or max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            await self._reject(scope, receive, send, max_bytes)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            # Whatever the app makes of the aborted body is replaced by 413.
+            if exceeded and not response_started:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # Parsers may re-raise _BodyTooLarge as their own error.
+            if not exceeded:
+                raise
+        if exceeded and not response_started:
+            await self._reject(scope, receive, send, max_bytes)
+
+    @staticmethod
+    async def _reject(
+        scope: Scope, receive: Receive, send: Send, max_bytes: int
+    ) -> None:
+        response = JSONResponse(
+            {"detail": f"Request body exceeds the {max_bytes} byte limit"},
+            status_code=413,
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
@@ -15,9 +15,13 @@ from dataclasses import asdict
 from typing import Optional
 
 from backend.db import DbClient, JobRecord
-from backend.dependencies import get_db_client, get_queue_client, get_storage_client
+from backend.dependencies import (
+    get_db_client,
+    get_queue_client,
+    get_uncached_storage_client,
+)
 from backend.storage import InMemoryStorageClient
-from backend.doc_chunks import build_doc_index, iter_section_chunks
+from backend.doc_chunks import publish_doc_chunks
 from backend.config import get_settings
 from import_pipeline import fetch_utils, import_pipeline, summaries
 from models import extract_concepts as extract_concepts_util
@@ -125,7 +129,7 @@ def process_job(job: JobRecord, db: DbClient) -> None:
     settings = get_settings()
 
     if _is_local_id(job.arxiv_id):
-        storage = get_storage_client()
+        storage = get_uncached_storage_client()
         metadata_payload = db.get_metadata(job.arxiv_id) or {}
         storage_path = metadata_payload.get("storage_pdf_path")
         if not storage_path:
@@ -147,6 +151,8 @@ def process_job(job: JobRecord, db: DbClient) -> None:
                 stage="FETCH_METADATA",
                 progress_percent=0.05,
             )
+            # The inline Gemini formatting call needs the whole PDF in memory,
+            # so this path reads it once and shares that copy.
             pdf_bytes = storage.get_bytes(storage_path)
             reader = PdfReader(io.BytesIO(pdf_bytes))
             info = reader.metadata or {}
@@ -224,19 +230,8 @@ def process_job(job: JobRecord, db: DbClient) -> None:
 
             base_path = f"papers/{job.arxiv_id}/v{metadata.version}"
             doc_path = f"{base_path}/lumi_doc.json"
-            doc_index_path = f"{base_path}/lumi_doc_index.json"
-            sections_path = f"{base_path}/sections"
             summaries_path = f"{base_path}/summaries.json"
-            storage.upload_json(doc_path, doc_json)
-            doc_index = build_doc_index(doc_json)
-            storage.upload_json(doc_index_path, doc_index)
-            for section in iter_section_chunks(doc_json):
-                section_id = section.get("id")
-                if not section_id:
-                    continue
-                storage.upload_json(
-                    f"{sections_path}/{section_id}.json", section
-                )
+            publish_doc_chunks(storage, job.arxiv_id, metadata.version, doc_json)
             storage.upload_json(summaries_path, summaries_json)
             logger.info(
                 f"[{job.job_id}] Uploaded lumi_doc to {doc_path} and summaries to {summaries_path}"
@@ -299,7 +294,7 @@ def process_job(job: JobRecord, db: DbClient) -> None:
             progress_percent=0.25,
         )
         logger.info(f"[{job.job_id}] Starting import pipeline")
-        storage = get_storage_client()
+        storage = get_uncached_storage_client()
         logger.info("Storage client: %s", storage.__class__.__name__)
         run_locally = isinstance(storage, InMemoryStorageClient)
 
@@ -344,20 +339,9 @@ def process_job(job: JobRecord, db: DbClient) -> None:
 
         base_path = f"papers/{job.arxiv_id}/v{metadata.version}"
         doc_path = f"{base_path}/lumi_doc.json"
-        doc_index_path = f"{base_path}/lumi_doc_index.json"
-        sections_path = f"{base_path}/sections"
         summaries_path = f"{base_path}/summaries.json"
         try:
-            storage.upload_json(doc_path, doc_json)
-            doc_index = build_doc_index(doc_json)
-            storage.upload_json(doc_index_path, doc_index)
-            for section in iter_section_chunks(doc_json):
-                section_id = section.get("id")
-                if not section_id:
-                    continue
-                storage.upload_json(
-                    f"{sections_path}/{section_id}.json", section
-                )
+            publish_doc_chunks(storage, job.arxiv_id, metadata.version, doc_json)
             storage.upload_json(summaries_path, summaries_json)
             logger.info(
                 f"[{job.job_id}] Uploaded lumi_doc to {doc_path} and summaries to {summaries_path}"
@@ -15,6 +15,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import re
 import shutil
@@ -23,7 +24,7 @@ import tempfile
 import io
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Protocol
+from typing import BinaryIO, List, Protocol, Union
 from typing import Tuple
 import logging
 from PIL import Image
@@ -34,12 +35,14 @@ from pdfminer.high_level import extract_text
 # Legacy GCS support removed; prefer COS/InMemory.
 gcs_storage = None
 
-import boto3
-
 logger = logging.getLogger(__name__)
 
 from shared.types import ImageMetadata
 from shared.lumi_doc import ImageContent
+from shared.s3_client import get_s3_client
+
+# PDFs may be passed as raw bytes or as a seekable binary stream.
+PdfSource = Union[bytes, BinaryIO]
 
 LOCAL_IMAGE_BUCKET_BASE = str(
     (Path(__file__).resolve().parents[2] / "local_image_bucket")
@@ -86,17 +89,11 @@ class CosStorageClient:
     secret_access_key: str
 
     def __post_init__(self):
-        config = boto3.session.Config(
-            s3={"addressing_style": "virtual"},
-            signature_version="s3v4",
-        )
-        self._client = boto3.client(
-            "s3",
-            endpoint_url=self.endpoint,
-            region_name=self.region,
-            aws_access_key_id=self.access_key_id,
-            aws_secret_access_key=self.secret_access_key,
-            config=config,
+        self._client = get_s3_client(
+            endpoint=self.endpoint,
+            region=self.region,
+            access_key_id=self.access_key_id,
+            secret_access_key=self.secret_access_key,
         )
 
     def download_bytes(self, path: str) -> bytes:
@@ -124,12 +121,26 @@ class GcsStorageClient:
         blob.upload_from_filename(src_path)
 
 
+@functools.lru_cache(maxsize=4)
+def _get_cos_storage_client(
+    bucket: str, region: str, endpoint: str, access_key: str, secret_key: str
+) -> CosStorageClient:
+    return CosStorageClient(
+        bucket=bucket,
+        region=region,
+        endpoint=endpoint,
+        access_key_id=access_key,
+        secret_access_key=secret_key,
+    )
+
+
 def get_cloud_storage_client() -> StorageClient:
     """
     Returns a storage client based on environment settings.
 
     Prefers COS/S3 (COS_BUCKET env), otherwise falls back to Firebase GCS
-    if available. Raises if neither is configured.
+    if available. Raises if neither is configured. The COS client is reused
+    across calls so per-image uploads share one connection pool.
     """
     cos_bucket = os.environ.get("COS_BUCKET")
     cos_region = os.environ.get("COS_REGION")
@@ -137,12 +148,8 @@ def get_cloud_storage_client() -> StorageClient:
     access_key = os.environ.get("AWS_ACCESS_KEY_ID")
     secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
     if cos_bucket and cos_region and cos_endpoint and access_key and secret_key:
-        return CosStorageClient(
-            bucket=cos_bucket,
-            region=cos_region,
-            endpoint=cos_endpoint,
-            access_key_id=access_key,
-            secret_access_key=secret_key,
+        return _get_cos_storage_client(
+            cos_bucket, cos_region, cos_endpoint, access_key, secret_key
         )
     if gcs_storage:
         return GcsStorageClient(storage_module=gcs_storage)
@@ -171,6 +178,26 @@ def download_image_from_storage(storage_path: str, storage_client: StorageClient
         warnings.warn(f"Could not download image from storage at {storage_path}: {e}")
         raise
 
+def open_pdf_source(pdf: PdfSource) -> BinaryIO:
+    """Returns a seekable stream positioned at the start of the PDF."""
+    if isinstance(pdf, (bytes, bytearray)):
+        return io.BytesIO(pdf)
+    pdf.seek(0)
+    return pdf
+
+
+def read_pdf_source(pdf: PdfSource) -> bytes:
+    """Returns the full PDF bytes, reading a stream from the start if needed."""
+    if isinstance(pdf, (bytes, bytearray)):
+        return bytes(pdf)
+    pdf.seek(0)
+    return pdf.read()
+
+
+def _is_empty_pdf_source(pdf: PdfSource | None) -> bool:
+    return pdf is None or (isinstance(pdf, (bytes, bytearray)) and not pdf)
+
+
 def check_target_in_path(full_path: str, target: str) -> bool:
     """
     Checks if the target path is at the end of the full path.
@@ -356,7 +383,7 @@ def extract_images_from_latex_source(
 
 
 def extract_images_from_pdf_bytes(
-    pdf_bytes: bytes,
+    pdf_bytes: PdfSource,
     image_contents: List[ImageContent],
     run_locally: bool = False,
     storage_client: StorageClient | None = None,
@@ -366,13 +393,13 @@ def extract_images_from_pdf_bytes(
     Fallback: renders PDF pages to images and maps them to missing ImageContent entries.
     """
     processed_image_metadata: List[ImageMetadata] = []
-    if not pdf_bytes or not image_contents:
+    if _is_empty_pdf_source(pdf_bytes) or not image_contents:
         return processed_image_metadata
 
     with tempfile.TemporaryDirectory() as temp_dir:
         pdf_path = os.path.join(temp_dir, "document.pdf")
         with open(pdf_path, "wb") as f:
-            f.write(pdf_bytes)
+            shutil.copyfileobj(open_pdf_source(pdf_bytes), f)
 
         pdf = pdfium.PdfDocument(pdf_path)
         num_pages = min(len(pdf), max_pages, len(image_contents))
@@ -427,9 +454,9 @@ def extract_images_from_pdf_bytes(
 
 
 def find_start_page_index(
-    pdf_bytes: bytes, headings: list[str] | None = None, max_pages: int = 5
+    pdf_bytes: PdfSource, headings: list[str] | None = None, max_pages: int = 5
 ) -> int:
-    if not pdf_bytes:
+    if _is_empty_pdf_source(pdf_bytes):
         return 0
 
     normalized_headings = []
@@ -441,7 +468,9 @@ def find_start_page_index(
 
     for i in range(max_pages):
         try:
-            page_text = extract_text(io.BytesIO(pdf_bytes), page_numbers=[i]) or ""
+            page_text = (
+                extract_text(open_pdf_source(pdf_bytes), page_numbers=[i]) or ""
+            )
         except Exception:
             continue
         if re.search(r"\babstract\b", page_text, flags=re.IGNORECASE):
@@ -453,7 +482,7 @@ def find_start_page_index(
 
 
 def extract_images_from_pdf_xobjects(
-    pdf_bytes: bytes,
+    pdf_bytes: PdfSource,
     image_contents: List[ImageContent],
     run_locally: bool = False,
     storage_client: StorageClient | None = None,
@@ -464,10 +493,10 @@ def extract_images_from_pdf_xobjects(
     Extracts embedded images (XObjects) from a PDF and maps them to ImageContent entries.
     """
     processed_image_metadata: List[ImageMetadata] = []
-    if not pdf_bytes or not image_contents:
+    if _is_empty_pdf_source(pdf_bytes) or not image_contents:
         return processed_image_metadata
 
-    reader = PdfReader(io.BytesIO(pdf_bytes))
+    reader = PdfReader(open_pdf_source(pdf_bytes))
     image_index = 0
 
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -213,7 +213,7 @@ def import_arxiv_latex_and_pdf(
 
 
 def import_pdf_bytes(
-    pdf_data: bytes,
+    pdf_data: image_utils.PdfSource,
     file_id: str,
     concepts: List[LumiConcept],
     metadata: ArxivMetadata,
@@ -226,7 +226,7 @@ def import_pdf_bytes(
     Imports and processes a local PDF into a LumiDoc.
 
     Args:
-        pdf_data (bytes): The PDF bytes to process.
+        pdf_data (bytes | BinaryIO): The PDF bytes, or a seekable stream over them.
         file_id (str): Storage file id prefix (e.g., "<paper_id>/v<version>").
         concepts (List[LumiConcept]): A list of concepts to identify in the text.
         metadata (ArxivMetadata): Metadata for the paper.
@@ -247,8 +247,11 @@ def import_pdf_bytes(
     else:
         start_time = time.time()
         logger.info("Import pipeline: calling Gemini format_pdf_with_latex for %s", file_id)
+        # Gemini takes the PDF inline, so a stream is read in full here.
         model_output = gemini.format_pdf_with_latex(
-            pdf_data=pdf_data, latex_string=latex_string, concepts=concepts
+            pdf_data=image_utils.read_pdf_source(pdf_data),
+            latex_string=latex_string,
+            concepts=concepts,
         )
         logger.info(
             "Import pipeline: Gemini format_pdf_with_latex completed in %.2fs for %s",
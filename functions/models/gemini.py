@@ -21,7 +21,7 @@ from models import api_config
 from models import prompts
 from shared.lumi_doc import LumiConcept
 from shared.import_tags import L_REFERENCES_START, L_REFERENCES_END
-from typing import List, Type, TypeVar
+from typing import Iterator, List, Type, TypeVar
 
 logger = logging.getLogger(__name__)
 
@@ -74,8 +74,10 @@ def call_predict_with_image(
     client = genai.Client(api_key=api_key)
 
     truncated_query = (prompt[:200] + "...") if len(prompt) > 200 else prompt
-    print(
-        f"  > Calling Gemini with image, prompt: '{truncated_query}' \nimage: {image_bytes[:50]}"
+    logger.info(
+        "Calling Gemini with image (%d bytes), prompt: '%s'",
+        len(image_bytes),
+        truncated_query,
     )
     response = client.models.generate_content(
         model=model,
@@ -93,6 +95,43 @@ def call_predict_with_image(
     return response.text
 
 
+def call_predict_stream(
+    query: str,
+    model="gemini-3-flash-preview",
+    api_key: str | None = None,
+    image_bytes: bytes | None = None,
+) -> Iterator[str]:
+    """Like call_predict (or call_predict_with_image), yielding text as it arrives."""
+    if not api_key:
+        api_key = api_config.DEFAULT_API_KEY
+    else:
+        logger.info(API_KEY_LOGGING_MESSAGE)
+
+    client = genai.Client(api_key=api_key)
+
+    contents = query
+    if image_bytes is not None:
+        # When imported, paper images are all saved in PNG format.
+        contents = [
+            query,
+            types.Part.from_bytes(data=image_bytes, mime_type="image/png"),
+        ]
+
+    received_text = False
+    for chunk in client.models.generate_content_stream(
+        model=model,
+        contents=contents,
+        config=types.GenerateContentConfig(
+            temperature=0, max_output_tokens=QUERY_RESPONSE_MAX_OUTPUT_TOKENS
+        ),
+    ):
+        if chunk.text:
+            received_text = True
+            yield chunk.text
+    if not received_text:
+        raise GeminiInvalidResponseException()
+
+
 def call_predict_with_schema(
     query: str,
     response_schema: Type[T],
@@ -108,7 +147,7 @@ def call_predict_with_schema(
     client = genai.Client(api_key=api_key)
     start_time = time.time()
     truncated_query = (query[:200] + "...") if len(query) > 200 else query
-    print(f"  > Calling Gemini with schema, prompt: '{truncated_query}'")
+    logger.info("Calling Gemini with schema, prompt: '%s'", truncated_query)
     try:
         response = client.models.generate_content(
             model=model,
@@ -119,12 +158,14 @@ def call_predict_with_schema(
                 "temperature": 0,
             },
         )
-        print(f"  > Gemini with schema call took: {time.time() - start_time:.2f}s")
+        logger.info(
+            "Gemini with schema call took: %.2fs", time.time() - start_time
+        )
         if not response.parsed:
             raise GeminiInvalidResponseException()
         return response.parsed
     except Exception as e:
-        print(f"An error occurred during predict with schema API call: {e}")
+        logger.exception("Predict with schema API call failed: %s", e)
         return None
 
 
@@ -149,7 +190,7 @@ def format_pdf_with_latex(
     start_time = time.time()
     prompt = prompts.make_import_pdf_prompt(concepts)
     truncated_prompt = (prompt[:200] + "...") if len(prompt) > 200 else prompt
-    print(f"  > Calling Gemini to format PDF, prompt: '{truncated_prompt}'")
+    logger.info("Calling Gemini to format PDF, prompt: '%s'", truncated_prompt)
 
     contents = [
         types.Part.from_bytes(
@@ -174,7 +215,7 @@ def format_pdf_with_latex(
         ),
     )
 
-    print(f"  > Gemini format PDF call took: {time.time() - start_time:.2f}s")
+    logger.info("Gemini format PDF call took: %.2fs", time.time() - start_time)
 
     response_text = response.text
     if not response_text:
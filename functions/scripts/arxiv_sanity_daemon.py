@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
 import random
 import sys
 import time
@@ -15,8 +16,14 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from backend.arxiv_sanity import ArxivSanityStore, DEFAULT_QUERY
+from backend.arxiv_sanity import (
+    DEFAULT_LOOKBACK_DAYS,
+    DEFAULT_QUERY,
+    RECOMMEND_WINDOW_DAYS,
+    ArxivSanityStore,
+)
 from backend.config import get_settings
+from backend.dependencies import get_db_client
 
 logger = logging.getLogger(__name__)
 
@@ -31,18 +38,10 @@ def main() -> int:
         help="Up to how many papers to fetch per loop",
     )
     parser.add_argument(
-        "-s",
-        "--start",
-        type=int,
-        default=0,
-        help="Start at what index",
-    )
-    parser.add_argument(
-        "-b",
-        "--break-after",
-        type=int,
-        default=3,
-        help="Stop ingest after N empty updates (0 to disable)",
+        "--lookback-days",
+        type=float,
+        default=DEFAULT_LOOKBACK_DAYS,
+        help="How far back the first run reaches (later runs resume)",
     )
     parser.add_argument(
         "-q",
@@ -63,6 +62,17 @@ def main() -> int:
         default=120,
         help="Max random jitter added to sleep",
     )
+    parser.add_argument(
+        "--skip-similarity",
+        action="store_true",
+        help="Do not rebuild the similar-papers index after ingest",
+    )
+    parser.add_argument(
+        "--recommend-window-days",
+        type=float,
+        default=RECOMMEND_WINDOW_DAYS,
+        help="Recommend from papers updated within this many days",
+    )
     parser.add_argument(
         "--once",
         action="store_true",
@@ -79,18 +89,37 @@ def main() -> int:
     settings = get_settings()
     store = ArxivSanityStore(settings.arxiv_sanity_data_dir)
     query = args.query or settings.arxiv_sanity_query or DEFAULT_QUERY
+    ranked_library: list[str] | None = None
 
     while True:
         try:
             updated = store.ingest(
-                query=query,
-                num=args.num,
-                start=args.start,
-                break_after=args.break_after,
+                query=query, num=args.num, lookback_days=args.lookback_days
             )
             logger.info("Ingest complete, updated %d papers", updated)
         except Exception as exc:
             logger.exception("Ingest failed: %s", exc)
+            updated = 0
+
+        missing_index = not os.path.exists(
+            os.path.join(store.similarity_dir, "CURRENT")
+        )
+        if not args.skip_similarity and (updated or missing_index):
+            try:
+                store.build_similarity_index()
+            except Exception as exc:
+                logger.exception("Similarity index build failed: %s", exc)
+
+        # Re-rank after new papers arrive or the Lumi library changes.
+        try:
+            library = get_db_client().list_doc_ids()
+            if updated or library != ranked_library:
+                store.build_recommendations(
+                    library, window_days=args.recommend_window_days
+                )
+                ranked_library = library
+        except Exception as exc:
+            logger.exception("Recommendations build failed: %s", exc)
 
         if args.once:
             return 0
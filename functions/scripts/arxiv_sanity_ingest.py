@@ -6,16 +6,25 @@ from __future__ import annotations
 
 import argparse
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from backend.arxiv_sanity import ArxivSanityStore, DEFAULT_QUERY
+from backend.arxiv_sanity import (
+    DEFAULT_LOOKBACK_DAYS,
+    DEFAULT_QUERY,
+    ArxivSanityStore,
+)
 from backend.config import get_settings
 
 
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Arxiv sanity-lite ingest")
     parser.add_argument(
@@ -26,18 +35,34 @@ def main() -> int:
         help="Up to how many papers to fetch",
     )
     parser.add_argument(
-        "-s",
-        "--start",
-        type=int,
-        default=0,
-        help="Start at what index",
+        "--lookback-days",
+        type=float,
+        default=DEFAULT_LOOKBACK_DAYS,
+        help="How far back the first run reaches (later runs resume)",
+    )
+    parser.add_argument(
+        "--backfill-since",
+        type=_parse_date,
+        default=None,
+        help="Backfill papers updated from this date (YYYY-MM-DD) instead",
     )
     parser.add_argument(
-        "-b",
-        "--break-after",
+        "--backfill-until",
+        type=_parse_date,
+        default=None,
+        help="End date for --backfill-since (default: now)",
+    )
+    parser.add_argument(
+        "--window-days",
+        type=float,
+        default=7,
+        help="Backfill date window per request sequence",
+    )
+    parser.add_argument(
+        "--workers",
         type=int,
-        default=3,
-        help="Stop after N empty updates (0 to disable)",
+        default=2,
+        help="Backfill windows fetched concurrently (rate limit is shared)",
     )
     parser.add_argument(
         "-q",
@@ -51,9 +76,18 @@ def main() -> int:
     settings = get_settings()
     store = ArxivSanityStore(settings.arxiv_sanity_data_dir)
     query = args.query or settings.arxiv_sanity_query or DEFAULT_QUERY
-    updated = store.ingest(
-        query=query, num=args.num, start=args.start, break_after=args.break_after
-    )
+    if args.backfill_since:
+        updated = store.backfill(
+            query=query,
+            since=args.backfill_since,
+            until=args.backfill_until or datetime.now(timezone.utc),
+            window_days=args.window_days,
+            workers=args.workers,
+        )
+    else:
+        updated = store.ingest(
+            query=query, num=args.num, lookback_days=args.lookback_days
+        )
     return 0 if updated > 0 else 1
 
 
@@ -19,10 +19,10 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from backend.dependencies import get_db_client, get_storage_client
+from backend.dependencies import get_db_client, get_uncached_storage_client
 from backend.db import InMemoryDbClient, PostgresDbClient, PaperVersionRow
 from backend.storage import InMemoryStorageClient
-from backend.doc_chunks import build_doc_index, iter_section_chunks
+from backend.doc_chunks import publish_doc_chunks
 from import_pipeline import image_utils
 from import_pipeline import import_pipeline as pipeline
 
@@ -128,18 +128,6 @@ def backfill_doc(
     skip_images: int,
     verbose: bool,
 ) -> int:
-    try:
-        pdf_bytes = storage.get_bytes(storage_pdf_path)
-    except Exception as exc:
-        if verbose:
-            logger.warning(
-                "Failed to fetch PDF for %s at %s: %s",
-                arxiv_id,
-                storage_pdf_path,
-                exc,
-            )
-        return 0
-
     image_contents = collect_section_image_contents(doc_json)
     if not image_contents:
         if verbose:
@@ -152,21 +140,36 @@ def backfill_doc(
         text = _get_dict_value(heading, "text")
         if text:
             headings.append(text)
-    abstract_page_index = image_utils.find_start_page_index(
-        pdf_bytes, headings=headings
-    )
-    run_locally = isinstance(storage, InMemoryStorageClient)
-    if dry_run:
-        return len(image_contents)
-
-    extracted_images = image_utils.extract_images_from_pdf_xobjects(
-        pdf_bytes,
-        image_contents=image_contents,
-        run_locally=run_locally,
-        storage_client=storage,
-        start_page=abstract_page_index,
-        skip_images=skip_images,
-    )
+
+    try:
+        pdf_stream = storage.open_stream(storage_pdf_path)
+    except Exception as exc:
+        if verbose:
+            logger.warning(
+                "Failed to fetch PDF for %s at %s: %s",
+                arxiv_id,
+                storage_pdf_path,
+                exc,
+            )
+        return 0
+
+    with pdf_stream:
+        abstract_page_index = image_utils.find_start_page_index(
+            pdf_stream, headings=headings
+        )
+        run_locally = isinstance(storage, InMemoryStorageClient)
+        if dry_run:
+            return len(image_contents)
+
+        extracted_images = image_utils.extract_images_from_pdf_xobjects(
+            pdf_stream,
+            image_contents=image_contents,
+            run_locally=run_locally,
+            storage_client=storage,
+            start_page=abstract_page_index,
+            skip_images=skip_images,
+        )
+
     if extracted_images:
         image_path = pipeline._pick_featured_image(extracted_images, image_contents)
         if image_path:
@@ -191,15 +194,7 @@ def backfill_doc(
 
     db.save_lumi_doc(arxiv_id, version, doc_json, summaries_json)
 
-    base_path = f"papers/{arxiv_id}/v{version}"
-    storage.upload_json(f"{base_path}/lumi_doc.json", doc_json)
-    doc_index = build_doc_index(doc_json)
-    storage.upload_json(f"{base_path}/lumi_doc_index.json", doc_index)
-    for section in iter_section_chunks(doc_json):
-        section_id = section.get("id")
-        if not section_id:
-            continue
-        storage.upload_json(f"{base_path}/sections/{section_id}.json", section)
+    publish_doc_chunks(storage, arxiv_id, version, doc_json)
 
     return len(extracted_images)
 
@@ -213,7 +208,7 @@ def backfill_in_memory(
     verbose: bool,
 ) -> int:
     updated = 0
-    storage = get_storage_client()
+    storage = get_uncached_storage_client()
     for (arxiv_id, version), (doc_json, summaries_json) in db.docs.items():
         if paper_id and arxiv_id != paper_id:
             continue
@@ -256,7 +251,7 @@ def backfill_postgres(
     verbose: bool,
 ) -> int:
     updated = 0
-    storage = get_storage_client()
+    storage = get_uncached_storage_client()
     remaining = limit
     with db.Session() as session:
         while True:
@@ -2,8 +2,10 @@
 Backfill Lumi doc index + section chunks to storage.
 
 This reads existing lumi_doc JSON from the database and writes:
+  - papers/{id}/v{version}/lumi_doc.json
   - papers/{id}/v{version}/lumi_doc_index.json
   - papers/{id}/v{version}/sections/{section_id}.json
+  - papers/{id}/v{version}/section_offsets.json
 """
 
 from __future__ import annotations
@@ -18,9 +20,9 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from backend.dependencies import get_db_client, get_storage_client
+from backend.dependencies import get_db_client, get_uncached_storage_client
 from backend.db import InMemoryDbClient, PostgresDbClient, PaperVersionRow
-from backend.doc_chunks import build_doc_index, iter_section_chunks
+from backend.doc_chunks import publish_doc_chunks
 
 logger = logging.getLogger(__name__)
 
@@ -32,24 +34,11 @@ def upload_chunks(
     doc_json: dict,
     dry_run: bool,
 ) -> int:
-    storage = get_storage_client()
-    base_path = f"papers/{arxiv_id}/v{version}"
-    doc_index_path = f"{base_path}/lumi_doc_index.json"
-    sections_path = f"{base_path}/sections"
-
-    section_count = 0
     if dry_run:
         return len(doc_json.get("sections") or [])
-
-    doc_index = build_doc_index(doc_json)
-    storage.upload_json(doc_index_path, doc_index)
-    for section in iter_section_chunks(doc_json):
-        section_id = section.get("id")
-        if not section_id:
-            continue
-        storage.upload_json(f"{sections_path}/{section_id}.json", section)
-        section_count += 1
-    return section_count
+    return publish_doc_chunks(
+        get_uncached_storage_client(), arxiv_id, version, doc_json
+    )
 
 
 def backfill_in_memory(db: InMemoryDbClient, *, dry_run: bool) -> int:
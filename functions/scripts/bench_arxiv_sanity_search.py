@@ -0,0 +1,143 @@
+"""
+Benchmark ArxivSanityStore.search: FTS5/bm25 vs the old full-table scan.
+
+Fills a throwaway store with synthetic papers for each --rows size and
+times a handful of queries through both paths:
+  - legacy: SELECT * FROM papers and score every row in Python (the
+    previous implementation, reproduced here)
+  - fts:    ArxivSanityStore.search (FTS5 MATCH + bm25, LIMIT in SQL)
+
+The legacy scan is skipped above --legacy-max-rows, where it takes seconds
+per query.
+
+Usage:
+  python scripts/bench_arxiv_sanity_search.py --rows 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.arxiv_sanity import ArxivPaper, ArxivSanityStore
+
+VOCABULARY = (
+    "attention transformer diffusion graph neural network reinforcement "
+    "learning policy gradient contrastive representation vision language "
+    "model retrieval augmented generation robustness adversarial sparse "
+    "mixture experts scaling laws benchmark dataset segmentation detection "
+    "tracking planning control optimization convergence stochastic kernel "
+    "bayesian inference variational autoencoder token embedding pretraining"
+).split()
+SURNAMES = "Smith Chen Wang Kumar Garcia Müller Rossi Tanaka Kim Novak".split()
+CATEGORIES = ["cs.CV", "cs.LG", "cs.CL", "cs.AI", "cs.NE", "cs.RO"]
+QUERIES = ["attention", "graph neural", "diffusion model", "kim", "sparse experts"]
+
+
+def synthetic_papers(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    # Filler words so the topical terms above are selective, as in real text.
+    filler = [
+        "".join(rng.choices("abcdefghiklmnoprstuvy", k=rng.randint(3, 9)))
+        for _ in range(20000)
+    ]
+    for idx in range(count):
+        title = " ".join(
+            rng.choices(filler, k=6) + rng.choices(VOCABULARY, k=2)
+        ).capitalize()
+        summary = " ".join(rng.choices(filler, k=140) + rng.choices(VOCABULARY, k=5))
+        authors = [
+            f"{rng.choice('ABCDEFGHJKLMNPRST')}. {rng.choice(SURNAMES)}"
+            for _ in range(rng.randint(1, 6))
+        ]
+        when = 1.6e9 + idx * 60.0
+        yield ArxivPaper(
+            paper_id=f"{2000 + idx // 100000}.{idx % 100000:05d}",
+            version="1",
+            title=title,
+            summary=summary,
+            authors=authors,
+            updated_timestamp="",
+            published_timestamp="",
+            updated_time=when,
+            published_time=when,
+            categories=rng.sample(CATEGORIES, k=rng.randint(1, 2)),
+        )
+
+
+def legacy_search(store: ArxivSanityStore, query: str, limit: int) -> list:
+    qs = query.lower().strip().split()
+    match = lambda s: sum(min(3, s.count(q)) for q in qs)
+    matchu = lambda s: sum(int(s.count(q) > 0) for q in qs)
+    with store._connect() as conn:
+        rows = conn.execute("SELECT * FROM papers").fetchall()
+    scored = []
+    for row in rows:
+        paper = store._row_to_paper(row)
+        authors = " ".join(json.loads(row["authors_json"])).lower()
+        score = (
+            10.0 * matchu(authors)
+            + 20.0 * matchu(row["title"].lower())
+            + 1.0 * match(row["summary"].lower())
+        )
+        if score > 0:
+            scored.append((score, paper))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return scored[:limit]
+
+
+def fill(store: ArxivSanityStore, rows: int, batch: int = 10000) -> None:
+    papers = synthetic_papers(rows)
+    while True:
+        chunk = [paper for _, paper in zip(range(batch), papers)]
+        if not chunk:
+            return
+        store.upsert_papers(chunk)
+
+
+def time_queries(fn, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        for query in QUERIES:
+            start = time.perf_counter()
+            fn(query)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--legacy-max-rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as data_dir:
+            store = ArxivSanityStore(data_dir)
+            start = time.perf_counter()
+            fill(store, rows)
+            print(f"{rows} rows: filled in {time.perf_counter() - start:.1f}s")
+            paths = {"fts": lambda q: store.search(q, limit=25)}
+            if rows <= args.legacy_max_rows:
+                paths["legacy"] = lambda q: legacy_search(store, q, 25)
+            for name, fn in paths.items():
+                timings = time_queries(fn, args.iterations)
+                print(
+                    f"  {name:<7} median {statistics.median(timings) * 1000:9.1f} ms"
+                    f"  max {max(timings) * 1000:9.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
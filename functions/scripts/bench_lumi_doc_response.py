@@ -0,0 +1,127 @@
+"""
+Benchmark lumi-doc response encoding: pydantic model vs raw JSON pass-through.
+
+Builds a synthetic document of roughly --target-mb megabytes and times a
+request through two minimal FastAPI routes:
+  - model: returns LumiDocResponse and lets FastAPI validate and re-encode it
+    (the previous behaviour of /api/lumi-doc)
+  - raw:   splices pre-serialized JSON into a RawJsonResponse
+
+Usage:
+  python scripts/bench_lumi_doc_response.py --target-mb 5 --iterations 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.responses import RawJsonResponse, dumps_json, json_object_from_parts
+from backend.schemas import LumiDocResponse
+
+
+def build_fixture_doc(target_bytes: int) -> dict:
+    sentence = {
+        "id": "",
+        "position": {"startIndex": 0, "endIndex": 120},
+        "text": "Transformers attend over every token pair; the cost is quadratic. ",
+    }
+    sections = []
+    doc = {"metadata": {"title": "Synthetic benchmark paper"}, "sections": sections}
+    section_idx = 0
+    while len(dumps_json(doc)) < target_bytes:
+        contents = []
+        for content_idx in range(50):
+            spans = [
+                dict(sentence, id=f"s{section_idx}-{content_idx}-{span_idx}")
+                for span_idx in range(10)
+            ]
+            contents.append(
+                {
+                    "id": f"c{section_idx}-{content_idx}",
+                    "textContent": {"tagName": "p", "spans": spans},
+                }
+            )
+        sections.append(
+            {
+                "id": f"sec{section_idx}",
+                "heading": {"headingLevel": 1, "text": f"Section {section_idx}"},
+                "contents": contents,
+            }
+        )
+        section_idx += 1
+    return doc
+
+
+def build_app(doc: dict, summaries: dict) -> FastAPI:
+    app = FastAPI()
+    doc_raw = dumps_json(doc)
+    summaries_raw = dumps_json(summaries)
+
+    @app.get("/model", response_model=LumiDocResponse)
+    def model_route():
+        return LumiDocResponse(
+            arxiv_id="bench", version="1", doc=doc, summaries=summaries
+        )
+
+    @app.get("/raw", response_model=LumiDocResponse)
+    def raw_route():
+        return RawJsonResponse(
+            json_object_from_parts(
+                [
+                    ("arxiv_id", "bench"),
+                    ("version", "1"),
+                    ("doc", doc_raw),
+                    ("summaries", summaries_raw),
+                    ("signed_urls", None),
+                    ("signed_urls_expire_at", None),
+                ]
+            )
+        )
+
+    return app
+
+
+def time_route(client: TestClient, path: str, iterations: int) -> list[float]:
+    client.get(path)  # Warm up.
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--target-mb", type=float, default=5.0)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    doc = build_fixture_doc(int(args.target_mb * 1024 * 1024))
+    summaries = {"sectionSummaries": [], "abstractExcerptSpanId": None}
+    client = TestClient(build_app(doc, summaries))
+
+    size = len(client.get("/raw").content)
+    print(f"fixture: {len(doc['sections'])} sections, {size / 1e6:.2f} MB response")
+    for path in ("/model", "/raw"):
+        timings = time_route(client, path, args.iterations)
+        print(
+            f"{path:<7} median {statistics.median(timings) * 1000:8.1f} ms"
+            f"  min {min(timings) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
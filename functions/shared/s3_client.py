@@ -0,0 +1,77 @@
+"""
+Process-wide boto3 S3 clients shared by the backend and the import pipeline.
+
+boto3 low-level clients are thread-safe, so one client per credential set is
+reused everywhere. This keeps a single tuned connection pool per process
+instead of paying client construction and TLS handshakes per upload.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+import boto3
+from botocore.config import Config
+
+DEFAULT_MAX_POOL_CONNECTIONS = 32
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5
+DEFAULT_READ_TIMEOUT_SECONDS = 60
+
+_clients: dict[tuple[str, str, str, str], object] = {}
+_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def build_s3_config() -> Config:
+    """Return the botocore config used for all COS/S3 clients."""
+    return Config(
+        # Use virtual-hosted style addressing to satisfy COS requirements.
+        s3={"addressing_style": "virtual"},
+        signature_version="s3v4",
+        max_pool_connections=_env_int(
+            "S3_MAX_POOL_CONNECTIONS", DEFAULT_MAX_POOL_CONNECTIONS
+        ),
+        retries={
+            "max_attempts": _env_int("S3_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS),
+            "mode": "standard",
+        },
+        tcp_keepalive=True,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=DEFAULT_READ_TIMEOUT_SECONDS,
+    )
+
+
+def get_s3_client(
+    *,
+    endpoint: str,
+    region: str,
+    access_key_id: str,
+    secret_access_key: str,
+):
+    """Return the shared client for these credentials, creating it once."""
+    key = (endpoint, region, access_key_id, secret_access_key)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            # Client creation on the default session is not thread-safe.
+            client = boto3.session.Session().client(
+                "s3",
+                endpoint_url=endpoint or None,
+                region_name=region or None,
+                aws_access_key_id=access_key_id,
+                aws_secret_access_key=secret_access_key,
+                config=build_s3_config(),
+            )
+            _clients[key] = client
+    return client
@@ -0,0 +1,27 @@
+import unittest
+
+from shared.s3_client import build_s3_config, get_s3_client
+
+
+class S3ClientTest(unittest.TestCase):
+    def _client(self, access_key_id: str = "ak"):
+        return get_s3_client(
+            endpoint="https://cos.ap-test.myqcloud.com",
+            region="ap-test",
+            access_key_id=access_key_id,
+            secret_access_key="sk",
+        )
+
+    def test_client_is_shared_per_credentials(self):
+        self.assertIs(self._client(), self._client())
+        self.assertIsNot(self._client("ak"), self._client("other"))
+
+    def test_config_is_tuned(self):
+        config = build_s3_config()
+        self.assertGreater(config.max_pool_connections, 10)
+        self.assertTrue(config.tcp_keepalive)
+        self.assertEqual(config.retries["mode"], "standard")
+
+
+if __name__ == "__main__":
+    unittest.main()